@@ -2,95 +2,45 @@
 """
 Comprehensive analysis of Claude Code GitHub issues.
 Data-driven approach to build L1/L2 taxonomy.
+
+Usage:
+    python analyze_issues.py raw_issues.csv -o analysis/
 """
 
 import pandas as pd
 import numpy as np
+import argparse
 import json
-import re
+import os
+import sys
 from collections import Counter, defaultdict
-from datetime import datetime
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# Load the data
-print("=" * 80)
-print("LOADING DATA")
-print("=" * 80)
-
-df = pd.read_csv('/mnt/user-data/uploads/raw_issues_1000.csv')
-
-print(f"\nTotal issues loaded: {len(df)}")
-print(f"Columns: {df.columns.tolist()}")
-print(f"\nFirst few rows:")
-print(df.head(2))
-
-# Basic stats
-print("\n" + "=" * 80)
-print("BASIC STATISTICS")
-print("=" * 80)
-
-print(f"\nIssue state distribution:")
-print(df['state'].value_counts())
-
-print(f"\nIssues with labels: {df['labels'].notna().sum()}")
-print(f"Issues without labels: {df['labels'].isna().sum()}")
-
-print(f"\nAverage comments per issue: {df['comments_count'].mean():.2f}")
-print(f"Median comments per issue: {df['comments_count'].median():.0f}")
-
-# Parse labels
-print("\n" + "=" * 80)
-print("LABEL ANALYSIS")
-print("=" * 80)
-
-def parse_labels(label_str):
-    """Parse comma-separated labels."""
-    if pd.isna(label_str):
-        return []
-    return [l.strip() for l in str(label_str).split(',') if l.strip()]
-
-df['parsed_labels'] = df['labels'].apply(parse_labels)
-
-# Count all labels
-all_labels = []
-for labels in df['parsed_labels']:
-    all_labels.extend(labels)
-
-label_counts = Counter(all_labels)
-
-print(f"\nTotal unique labels: {len(label_counts)}")
-print(f"\nTop 30 most common labels:")
-for label, count in label_counts.most_common(30):
-    pct = (count / len(df)) * 100
-    print(f"  {label:40} {count:5} ({pct:5.1f}%)")
-
-# Analyze label patterns
-print("\n" + "=" * 80)
-print("LABEL PATTERN ANALYSIS")
-print("=" * 80)
-
-# Group labels by prefix
-label_prefixes = defaultdict(list)
-for label, count in label_counts.items():
-    if ':' in label:
-        prefix = label.split(':')[0]
-        label_prefixes[prefix].append((label, count))
-    else:
-        label_prefixes['_no_prefix'].append((label, count))
+from pathlib import Path
+
+# Shared label parsing, pattern scanning and stage caching live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from issue_schema import COLUMN_TYPES, header_row, label_sets
+from pattern_scanner import PatternScanner
+from label_cooccurrence import IncidenceBuilder, frequent_itemsets, pair_scores, top_partners
+from processed_issues import PROCESSED_FILE, ProcessedWriter
+from stage_cache import CACHE_DIR, StageCache
+from term_stats import CHUNK_SIZE, TermStats
 
-print("\nLabel categories (by prefix):")
-for prefix in sorted(label_prefixes.keys()):
-    labels = label_prefixes[prefix]
-    total_issues = sum(count for _, count in labels)
-    print(f"\n{prefix}:")
-    for label, count in sorted(labels, key=lambda x: -x[1])[:10]:
-        print(f"  {label:40} {count:5}")
+RESULTS_FILE = 'analysis_results.json'
+MIN_PAIR_COUNT = 5
+
+ERROR_PATTERNS = {
+    'API Error': r'api error|anthropic api|error.*400|error.*401|error.*403|error.*429|error.*500',
+    'Connection': r'connection|timeout|network|dns|proxy|egress',
+    'Crash/Exit': r'crash|exit code|process exited|terminated|killed',
+    'Memory': r'memory|out of memory|oom|heap',
+    'Performance': r'slow|lag|delay|hang|freeze|unresponsive',
+    'File/Path': r'file not found|path|directory|cannot read|cannot write',
+    'Install/Setup': r'install|setup|configuration|config|settings',
+    'MCP': r'mcp|model context protocol|server',
+    'Model': r'model|sonnet|opus|haiku',
+    'Context': r'context|token|window|compact',
+}
 
-# Analyze titles
-print("\n" + "=" * 80)
-print("TITLE ANALYSIS")
-print("=" * 80)
 
 def extract_issue_type(title):
     """Extract issue type from title."""
@@ -108,158 +58,345 @@ def extract_issue_type(title):
     else:
         return 'other'
 
-df['issue_type_from_title'] = df['title'].apply(extract_issue_type)
-
-print("\nIssue types from title:")
-print(df['issue_type_from_title'].value_counts())
-
-# Analyze common keywords in titles
-print("\n" + "=" * 80)
-print("KEYWORD ANALYSIS IN TITLES")
-print("=" * 80)
-
-def extract_keywords(title):
-    """Extract meaningful keywords from title."""
-    # Remove issue type tags
-    title = re.sub(r'\[.*?\]', '', title)
-    # Convert to lowercase
-    title = title.lower()
-    # Remove special characters but keep spaces
-    title = re.sub(r'[^\w\s-]', ' ', title)
-    # Split into words
-    words = title.split()
-    # Filter out common words
-    stopwords = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
-                 'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'been', 'be',
-                 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'should',
-                 'can', 'could', 'may', 'might', 'must', 'not', 'when', 'after', 'before',
-                 'claude', 'code', 'issue', 'bug', 'feature', 'request'}
-    return [w for w in words if w not in stopwords and len(w) > 2]
-
-all_keywords = []
-for title in df['title']:
-    all_keywords.extend(extract_keywords(str(title)))
-
-keyword_counts = Counter(all_keywords)
-
-print("\nTop 50 keywords in titles:")
-for keyword, count in keyword_counts.most_common(50):
-    pct = (count / len(df)) * 100
-    print(f"  {keyword:30} {count:5} ({pct:5.1f}%)")
-
-# Analyze body text length
-print("\n" + "=" * 80)
-print("BODY TEXT ANALYSIS")
-print("=" * 80)
-
-df['body_length'] = df['body'].fillna('').str.len()
-print(f"\nBody length statistics:")
-print(f"  Mean: {df['body_length'].mean():.0f} characters")
-print(f"  Median: {df['body_length'].median():.0f} characters")
-print(f"  Min: {df['body_length'].min():.0f} characters")
-print(f"  Max: {df['body_length'].max():.0f} characters")
-
-# Check for common error patterns
-print("\n" + "=" * 80)
-print("COMMON ERROR PATTERNS")
-print("=" * 80)
-
-error_patterns = {
-    'API Error': r'api error|anthropic api|error.*400|error.*401|error.*403|error.*429|error.*500',
-    'Connection': r'connection|timeout|network|dns|proxy|egress',
-    'Crash/Exit': r'crash|exit code|process exited|terminated|killed',
-    'Memory': r'memory|out of memory|oom|heap',
-    'Performance': r'slow|lag|delay|hang|freeze|unresponsive',
-    'File/Path': r'file not found|path|directory|cannot read|cannot write',
-    'Install/Setup': r'install|setup|configuration|config|settings',
-    'MCP': r'mcp|model context protocol|server',
-    'Model': r'model|sonnet|opus|haiku',
-    'Context': r'context|token|window|compact',
-}
 
-print("\nError pattern frequency in body text:")
-for pattern_name, pattern in error_patterns.items():
-    matches = df['body'].fillna('').str.contains(pattern, case=False, regex=True).sum()
-    pct = (matches / len(df)) * 100
-    print(f"  {pattern_name:20} {matches:5} ({pct:5.1f}%)")
-
-# Platform distribution
-print("\n" + "=" * 80)
-print("PLATFORM DISTRIBUTION")
-print("=" * 80)
-
-platform_labels = []
-for labels in df['parsed_labels']:
-    for label in labels:
-        if label.startswith('platform:'):
-            platform_labels.append(label)
-
-platform_counts = Counter(platform_labels)
-print("\nPlatform-specific issues:")
-for platform, count in platform_counts.most_common():
-    pct = (count / len(df)) * 100
-    print(f"  {platform:30} {count:5} ({pct:5.1f}%)")
-
-# Area distribution
-print("\n" + "=" * 80)
-print("AREA DISTRIBUTION")
-print("=" * 80)
-
-area_labels = []
-for labels in df['parsed_labels']:
-    for label in labels:
-        if label.startswith('area:'):
-            area_labels.append(label)
-
-area_counts = Counter(area_labels)
-print("\nArea-specific issues:")
-for area, count in area_counts.most_common():
-    pct = (count / len(df)) * 100
-    print(f"  {area:30} {count:5} ({pct:5.1f}%)")
-
-# Co-occurrence analysis
-print("\n" + "=" * 80)
-print("LABEL CO-OCCURRENCE ANALYSIS")
-print("=" * 80)
-
-# Find which labels appear together
-label_pairs = Counter()
-for labels in df['parsed_labels']:
-    if len(labels) >= 2:
-        for i, label1 in enumerate(labels):
-            for label2 in labels[i+1:]:
-                pair = tuple(sorted([label1, label2]))
-                label_pairs[pair] += 1
-
-print("\nTop 20 label pairs that appear together:")
-for (label1, label2), count in label_pairs.most_common(20):
-    print(f"  {label1:30} + {label2:30} = {count:4}")
-
-# Save processed data
-print("\n" + "=" * 80)
-print("SAVING PROCESSED DATA")
-print("=" * 80)
-
-# Save analysis results
-analysis_results = {
-    'total_issues': len(df),
-    'label_distribution': dict(label_counts.most_common(50)),
-    'issue_types': df['issue_type_from_title'].value_counts().to_dict(),
-    'top_keywords': dict(keyword_counts.most_common(50)),
-    'platform_distribution': dict(platform_counts),
-    'area_distribution': dict(area_counts),
-    'label_categories': {k: dict(v) for k, v in label_prefixes.items()},
-}
+class _Histogram:
+    """Counts of non-negative integers; memory grows with the largest value, not the row count."""
+
+    def __init__(self):
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def add(self, values):
+        counts = np.bincount(np.asarray(values, dtype=np.int64))
+        if len(counts) > len(self.counts):
+            self.counts = np.pad(self.counts, (0, len(counts) - len(self.counts)))
+        self.counts[:len(counts)] += counts
+
+    def __len__(self):
+        return int(self.counts.sum())
+
+    def mean(self):
+        return (self.counts * np.arange(len(self.counts))).sum() / len(self)
+
+    def median(self):
+        """Same as np.median of the values (mean of the two middle ones for an even count)."""
+        cumulative = np.cumsum(self.counts)
+        n = cumulative[-1]
+        return (np.searchsorted(cumulative, (n - 1) // 2, side='right')
+                + np.searchsorted(cumulative, n // 2, side='right')) / 2
+
+    def min(self):
+        return int(np.flatnonzero(self.counts)[0])
+
+    def max(self):
+        return int(np.flatnonzero(self.counts)[-1])
+
 
-with open('/home/claude/analysis_results.json', 'w') as f:
-    json.dump(analysis_results, f, indent=2)
+def _counts(counter, name):
+    """Counter as a value_counts()-style Series (descending, first seen first on ties)."""
+    return pd.Series(counter, name='count', dtype='int64').rename_axis(name).sort_values(ascending=False, kind='stable')
 
-print("Saved analysis results to analysis_results.json")
 
-# Save DataFrame with parsed labels
-df.to_csv('/home/claude/issues_processed.csv', index=False)
-print("Saved processed DataFrame to issues_processed.csv")
+# ============================================================================
+# STAGE
+# ============================================================================
 
-print("\n" + "=" * 80)
-print("ANALYSIS COMPLETE")
-print("=" * 80)
+def analyze(input_file, results_file=RESULTS_FILE, processed_file=PROCESSED_FILE):
+    """
+    Print the label/title/body analysis of a raw issues CSV and save
+    analysis_results.json and the processed issues (Parquet)
+
+    Returns:
+        Dict of run info ({'rows': issues analyzed})
+    """
+    # Stream the CSV once: every statistic below is accumulated chunk by
+    # chunk and the processed issues are written to Parquet as we go
+    print("=" * 80)
+    print("LOADING DATA")
+    print("=" * 80)
+
+    header = header_row(input_file)
+    columns = pd.read_csv(input_file, header=header, nrows=0).columns
+    # Text columns read as strings so an all-empty chunk keeps their type
+    dtypes = {col: str for col in columns if COLUMN_TYPES.get(col) not in ('int', 'bool')}
+
+    term_stats = TermStats(ngram_sizes=(1, 2))
+    scanner = PatternScanner(ERROR_PATTERNS)
+    state_counts = Counter()
+    type_counts = Counter()
+    error_counts = pd.Series(0, index=list(ERROR_PATTERNS))
+    with_labels = 0
+    comments = _Histogram()
+    body_lengths = _Histogram()
+    incidence = IncidenceBuilder()
+    first_rows = None
+
+    with ProcessedWriter(processed_file) as writer:
+        for chunk in pd.read_csv(input_file, header=header, dtype=dtypes, chunksize=CHUNK_SIZE):
+            if first_rows is None:
+                first_rows = chunk.head(2)
+
+            state_counts.update(chunk['state'].dropna())
+            with_labels += int(chunk['labels'].notna().sum())
+            comments.add(chunk['comments_count'].dropna())
+
+            # Label, title keyword and keyword bigram counts (exact here; a
+            # bounded sketch once the vocabulary gets very large)
+            term_stats.consume(chunk)
+
+            # Normalized (lowercased, de-duplicated) label tuples, parsed once per distinct string
+            chunk['parsed_labels'] = label_sets(chunk['labels'])
+            incidence.add(chunk['parsed_labels'])
+
+            chunk['issue_type_from_title'] = chunk['title'].apply(extract_issue_type)
+            type_counts.update(chunk['issue_type_from_title'])
+
+            chunk['body_length'] = chunk['body'].fillna('').str.len()
+            body_lengths.add(chunk['body_length'])
+
+            # One scanner for all patterns -> boolean issue x pattern matrix
+            error_counts += scanner.scan(chunk['body']).sum()
+
+            # Save DataFrame with parsed labels (Parquet keeps them as list<string>)
+            writer.write(chunk)
+
+    total = writer.rows
+
+    print(f"\nTotal issues loaded: {total}")
+    print(f"Columns: {columns.tolist()}")
+    print(f"\nFirst few rows:")
+    print(first_rows)
+
+    # Basic stats
+    print("\n" + "=" * 80)
+    print("BASIC STATISTICS")
+    print("=" * 80)
+
+    print(f"\nIssue state distribution:")
+    print(_counts(state_counts, 'state'))
+
+    print(f"\nIssues with labels: {with_labels}")
+    print(f"Issues without labels: {total - with_labels}")
+
+    if len(comments):
+        print(f"\nAverage comments per issue: {comments.mean():.2f}")
+        print(f"Median comments per issue: {comments.median():.0f}")
+
+    # Parse labels
+    print("\n" + "=" * 80)
+    print("LABEL ANALYSIS")
+    print("=" * 80)
+
+    label_counts = term_stats.labels
+
+    print(f"\nTotal unique labels: {len(label_counts)}")
+    print(f"\nTop 30 most common labels:")
+    for label, count in label_counts.most_common(30):
+        pct = (count / total) * 100
+        print(f"  {label:40} {count:5} ({pct:5.1f}%)")
+
+    # Analyze label patterns
+    print("\n" + "=" * 80)
+    print("LABEL PATTERN ANALYSIS")
+    print("=" * 80)
+
+    # Group labels by prefix
+    label_prefixes = defaultdict(list)
+    for label, count in label_counts.items():
+        if ':' in label:
+            prefix = label.split(':')[0]
+            label_prefixes[prefix].append((label, count))
+        else:
+            label_prefixes['_no_prefix'].append((label, count))
+
+    print("\nLabel categories (by prefix):")
+    for prefix in sorted(label_prefixes.keys()):
+        labels = label_prefixes[prefix]
+        total_issues = sum(count for _, count in labels)
+        print(f"\n{prefix}:")
+        for label, count in sorted(labels, key=lambda x: -x[1])[:10]:
+            print(f"  {label:40} {count:5}")
+
+    # Analyze titles
+    print("\n" + "=" * 80)
+    print("TITLE ANALYSIS")
+    print("=" * 80)
+
+    issue_types = _counts(type_counts, 'issue_type_from_title')
+
+    print("\nIssue types from title:")
+    print(issue_types)
+
+    # Analyze common keywords in titles
+    print("\n" + "=" * 80)
+    print("KEYWORD ANALYSIS IN TITLES")
+    print("=" * 80)
+
+    # Keywords: title words minus [tags], stopwords and words of <= 2 characters
+    keyword_counts = term_stats.keywords[1]
+    keyword_bigrams = term_stats.keywords[2]
+
+    print("\nTop 50 keywords in titles:")
+    for keyword, count in keyword_counts.most_common(50):
+        pct = (count / total) * 100
+        print(f"  {keyword:30} {count:5} ({pct:5.1f}%)")
+
+    print("\nTop 20 keyword bigrams in titles:")
+    for bigram, count in keyword_bigrams.most_common(20):
+        pct = (count / total) * 100
+        print(f"  {bigram:30} {count:5} ({pct:5.1f}%)")
+
+    # Analyze body text length
+    print("\n" + "=" * 80)
+    print("BODY TEXT ANALYSIS")
+    print("=" * 80)
+
+    if len(body_lengths):
+        print(f"\nBody length statistics:")
+        print(f"  Mean: {body_lengths.mean():.0f} characters")
+        print(f"  Median: {body_lengths.median():.0f} characters")
+        print(f"  Min: {body_lengths.min():.0f} characters")
+        print(f"  Max: {body_lengths.max():.0f} characters")
+
+    # Check for common error patterns
+    print("\n" + "=" * 80)
+    print("COMMON ERROR PATTERNS")
+    print("=" * 80)
+
+    print("\nError pattern frequency in body text:")
+    for pattern_name, matches in error_counts.items():
+        pct = (matches / total) * 100 if total else 0.0
+        print(f"  {pattern_name:20} {matches:5} ({pct:5.1f}%)")
+
+    # Platform distribution
+    print("\n" + "=" * 80)
+    print("PLATFORM DISTRIBUTION")
+    print("=" * 80)
+
+    platform_counts = Counter({label: count for label, count in label_counts.items() if label.startswith('platform:')})
+    print("\nPlatform-specific issues:")
+    for platform, count in platform_counts.most_common():
+        pct = (count / total) * 100
+        print(f"  {platform:30} {count:5} ({pct:5.1f}%)")
+
+    # Area distribution
+    print("\n" + "=" * 80)
+    print("AREA DISTRIBUTION")
+    print("=" * 80)
+
+    area_counts = Counter({label: count for label, count in label_counts.items() if label.startswith('area:')})
+    print("\nArea-specific issues:")
+    for area, count in area_counts.most_common():
+        pct = (count / total) * 100
+        print(f"  {area:30} {count:5} ({pct:5.1f}%)")
+
+    # Co-occurrence analysis
+    print("\n" + "=" * 80)
+    print("LABEL CO-OCCURRENCE ANALYSIS")
+    print("=" * 80)
+
+    # Find which labels appear together: one sparse issue x label matrix, X^T X
+    incidence, label_names = incidence.matrix()
+    label_pairs = pair_scores(incidence, label_names)
+
+    print("\nTop 20 label pairs that appear together:")
+    for pair in label_pairs.head(20).itertuples():
+        print(f"  {pair.label_a:30} + {pair.label_b:30} = {pair.count:4}")
+
+    # Lift > 1: labels seen together more often than chance (ignore rare pairs)
+    associated = label_pairs[label_pairs['count'] >= MIN_PAIR_COUNT].sort_values('lift', ascending=False)
+    print(f"\nTop 20 label pairs by lift (seen together in >= {MIN_PAIR_COUNT} issues):")
+    for pair in associated.head(20).itertuples():
+        print(f"  {pair.label_a:30} + {pair.label_b:30} lift={pair.lift:5.2f}  pmi={pair.pmi:5.2f}  ({pair.count})")
+
+    # Strongest partners of the most common labels
+    partners = top_partners(label_pairs[label_pairs['count'] >= MIN_PAIR_COUNT], k=3, by='lift')
+    print("\nTop 3 partners (by lift) of the 10 most common labels:")
+    for label, _ in label_counts.most_common(10):
+        rows = partners[partners['label'] == label]
+        if len(rows):
+            print(f"  {label:30} -> " + ", ".join(f"{r.partner} ({r.lift:.2f})" for r in rows.itertuples()))
+
+    # Label triples that recur (candidate L2 themes spanning several labels)
+    itemsets = frequent_itemsets(incidence, label_names, max_size=3, min_count=MIN_PAIR_COUNT)
+    print("\nTop 10 label triples:")
+    for row in itemsets[itemsets['size'] == 3].head(10).itertuples():
+        print(f"  {' + '.join(row.itemset):70} = {row.count:4}")
+
+    # Save results (the processed data was written while streaming)
+    print("\n" + "=" * 80)
+    print("SAVING PROCESSED DATA")
+    print("=" * 80)
+
+    # Save analysis results
+    analysis_results = {
+        'total_issues': total,
+        'label_distribution': dict(label_counts.most_common(50)),
+        'issue_types': issue_types.to_dict(),
+        'top_keywords': dict(keyword_counts.most_common(50)),
+        'top_keyword_bigrams': dict(keyword_bigrams.most_common(30)),
+        'platform_distribution': dict(platform_counts),
+        'area_distribution': dict(area_counts),
+        'label_categories': {k: dict(v) for k, v in label_prefixes.items()},
+        'label_pairs': [
+            {'labels': [p.label_a, p.label_b], 'count': int(p.count), 'lift': round(p.lift, 3), 'pmi': round(p.pmi, 3)}
+            for p in label_pairs.head(50).itertuples()
+        ],
+        'label_triples': [
+            {'labels': list(r.itemset), 'count': int(r.count)}
+            for r in itemsets[itemsets['size'] == 3].head(20).itertuples()
+        ],
+    }
+
+    with open(results_file, 'w') as f:
+        json.dump(analysis_results, f, indent=2)
+
+    print(f"Saved analysis results to {results_file}")
+
+    print(f"Saved processed DataFrame to {processed_file}")
+
+    print("\n" + "=" * 80)
+    print("ANALYSIS COMPLETE")
+    print("=" * 80)
+
+    return {'rows': total}
+
+
+def run(input_file, output_dir='.', rebuild=False, cache_dir=CACHE_DIR):
+    """
+    Analysis stage: skipped when the input CSV and this code are unchanged
+    since the last run into output_dir
+
+    Returns:
+        The analysis results (dict as saved to analysis_results.json)
+    """
+    results_file = os.path.join(output_dir, RESULTS_FILE)
+    processed_file = os.path.join(output_dir, PROCESSED_FILE)
+    os.makedirs(output_dir, exist_ok=True)
+
+    entry, skipped = StageCache(cache_dir).run(
+        'analyze_issues',
+        lambda: analyze(input_file, results_file, processed_file),
+        inputs=[input_file],
+        outputs=[results_file, processed_file],
+        code=[analyze, _Histogram, label_sets, PatternScanner, IncidenceBuilder, ProcessedWriter, TermStats],
+        rebuild=rebuild
+    )
+    if skipped:
+        print(f"✓ {input_file} unchanged since {entry['finished']}: reusing {results_file} and {processed_file} (--rebuild to rerun)")
+
+    with open(results_file) as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Analyze raw issues for L1/L2 taxonomy building')
+    parser.add_argument('input_file', help='Raw issues CSV (from extract_github_issues.py)')
+    parser.add_argument('-o', '--output-dir', default='.', help=f'Directory for {RESULTS_FILE} / {PROCESSED_FILE}')
+    parser.add_argument('--rebuild', action='store_true', help='Rerun even if the input is unchanged')
+    args = parser.parse_args()
+
+    try:
+        run(args.input_file, args.output_dir, args.rebuild)
+    except FileNotFoundError:
+        print(f"✗ Error: File '{args.input_file}' not found")
+        sys.exit(1)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Offline clustering of issues for taxonomy discovery.
+TF-IDF on title + body -> truncated SVD (LSA) -> mini-batch k-means, run
+twice to propose candidate L1 clusters and L2 sub-clusters, each with top
+terms and representative issues. Results are cached per input hash.
+
+Usage:
+    python cluster_issues.py raw_issues.csv -o clusters/ --l1 12 --l2 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Shared schema, issue text and vectorizing helpers live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from issue_schema import read_issues
+from near_duplicates import issue_text
+from text_vectors import (MAX_CHARS, MAX_DF, MAX_FEATURES, MIN_DF, N_COMPONENTS, SEED,
+                          minibatch_kmeans, normalize, randomized_svd, tfidf_matrix)
+
+CACHE_DIR = '.cache'
+CACHE_VERSION = 2
+
+L1_CLUSTERS = 12
+L2_CLUSTERS = 4
+TOP_TERMS = 10
+REPRESENTATIVES = 5
+
+
+# ============================================================================
+# CLUSTERING
+# ============================================================================
+
+def _top_terms(matrix, rows, baseline, terms, n=TOP_TERMS):
+    """Terms whose mean TF-IDF in the cluster most exceeds the corpus mean"""
+    weights = np.asarray(matrix[rows].mean(axis=0)).ravel() - baseline
+    top = np.argsort(-weights, kind='stable')[:n]
+    return [str(terms[i]) for i in top if weights[i] > 0]
+
+
+def _describe(rows, vectors, matrix, baseline, terms, issues, existing):
+    """Size, top terms, representatives and dominant existing L1 of one cluster"""
+    centroid = normalize(vectors[rows].mean(axis=0, keepdims=True))[0]
+    closest = rows[np.argsort(-(vectors[rows] @ centroid), kind='stable')[:REPRESENTATIVES]]
+    entry = {
+        'size': int(len(rows)),
+        'share': round(len(rows) / len(vectors), 4),
+        'top_terms': _top_terms(matrix, rows, baseline, terms),
+        'representatives': [
+            {'issue_number': int(issues['issue_number'].iloc[i]), 'title': str(issues['title'].iloc[i])}
+            for i in closest
+        ],
+    }
+    if existing is not None:
+        counts = existing.iloc[rows].value_counts()
+        if len(counts):
+            entry['dominant_L1_Tag'] = str(counts.index[0])
+            entry['dominant_L1_share'] = round(counts.iloc[0] / len(rows), 3)
+    return entry
+
+
+def cluster_issues(issues, l1_clusters=L1_CLUSTERS, l2_clusters=L2_CLUSTERS, vectors=None,
+                   matrix=None, terms=None, seed=SEED):
+    """
+    Propose L1 clusters and L2 sub-clusters
+
+    Args:
+        issues: Issues DataFrame (issue_number, title; L1_Tag is compared if present)
+        l1_clusters: Number of top-level clusters
+        l2_clusters: Sub-clusters per L1 cluster (fewer for small clusters)
+        vectors: Normalized LSA vectors per issue
+        matrix: TF-IDF matrix (for top terms)
+        terms: Vocabulary
+        seed: Random seed
+
+    Returns:
+        Tuple of (assignments DataFrame: issue_number, L1_Cluster, L2_Cluster;
+        candidate list: one dict per L1 cluster with nested 'l2' list)
+    """
+    existing = issues['L1_Tag'].astype(str) if 'L1_Tag' in issues.columns else None
+    baseline = np.asarray(matrix.mean(axis=0)).ravel()
+    l1_labels, _ = minibatch_kmeans(vectors, l1_clusters, seed=seed)
+
+    # Largest cluster first: C01, C02, ...
+    order = np.argsort(-np.bincount(l1_labels, minlength=l1_labels.max() + 1), kind='stable')
+    l1_ids = np.empty(len(issues), dtype=object)
+    l2_ids = np.empty(len(issues), dtype=object)
+    candidates = []
+
+    for position, label in enumerate(order, start=1):
+        rows = np.flatnonzero(l1_labels == label)
+        if not len(rows):
+            continue
+        l1_id = f"C{position:02d}"
+        l1_ids[rows] = l1_id
+        entry = {'cluster': l1_id, **_describe(rows, vectors, matrix, baseline, terms, issues, existing), 'l2': []}
+
+        k = min(l2_clusters, max(1, len(rows) // 20))
+        sub_labels, _ = minibatch_kmeans(vectors[rows], k, seed=seed) if k > 1 else (np.zeros(len(rows), dtype=int), None)
+        sub_order = np.argsort(-np.bincount(sub_labels), kind='stable')
+        for sub_position, sub_label in enumerate(sub_order, start=1):
+            sub_rows = rows[sub_labels == sub_label]
+            if not len(sub_rows):
+                continue
+            l2_id = f"{l1_id}.{sub_position}"
+            l2_ids[sub_rows] = l2_id
+            entry['l2'].append({'cluster': l2_id, **_describe(sub_rows, vectors, matrix, baseline, terms, issues, existing)})
+        candidates.append(entry)
+
+    assignments = pd.DataFrame({
+        'issue_number': issues['issue_number'].to_numpy(),
+        'L1_Cluster': l1_ids,
+        'L2_Cluster': l2_ids,
+    })
+    return assignments, candidates
+
+
+# ============================================================================
+# CACHING
+# ============================================================================
+
+def input_hash(issue_numbers, texts):
+    """Hash of the issue numbers and the (truncated) text that gets vectorized (or any other per-issue column)"""
+    digest = hashlib.sha256()
+    for series in (issue_numbers.astype(str), texts):
+        digest.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _cached(kind, key, build, cache_dir=CACHE_DIR, rebuild=False):
+    """Load .cache/cluster-<kind>-<key>.pkl, or build and store it"""
+    path = os.path.join(cache_dir, f"cluster-{kind}-{key[:16]}.pkl")
+    if not rebuild and os.path.exists(path):
+        with open(path, 'rb') as f:
+            return pickle.load(f), True
+    value = build()
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(path + '.tmp', 'wb') as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + '.tmp', path)
+    return value, False
+
+
+def run(input_file, output_dir='.', l1_clusters=L1_CLUSTERS, l2_clusters=L2_CLUSTERS,
+        n_components=N_COMPONENTS, max_chars=MAX_CHARS, rebuild=False):
+    """
+    Cluster an issues CSV and write cluster_candidates.json and
+    cluster_assignments.csv to output_dir
+
+    Returns:
+        Tuple of (assignments, candidates)
+    """
+    print("=" * 80)
+    print("ISSUE CLUSTERING FOR TAXONOMY DISCOVERY")
+    print("=" * 80)
+
+    started = time.perf_counter()
+    issues = read_issues(input_file).reset_index(drop=True)
+    texts = issue_text(issues).str.slice(0, max_chars)
+    source = input_hash(issues['issue_number'], texts)
+    # Only these are reported back; dropping the bodies roughly halves peak memory
+    issues = issues[[col for col in ('issue_number', 'title', 'L1_Tag') if col in issues.columns]]
+    print(f"\n  ✓ Loaded {len(issues)} issues ({time.perf_counter() - started:.1f}s)")
+
+    vector_params = [CACHE_VERSION, source, max_chars, MIN_DF, MAX_DF, MAX_FEATURES, n_components, SEED]
+    vector_key = hashlib.sha256(json.dumps(vector_params).encode('utf-8')).hexdigest()
+
+    def vectorize():
+        matrix, terms, _ = tfidf_matrix(texts, max_chars=max_chars)
+        coordinates, _ = randomized_svd(matrix, n_components)
+        return matrix, terms, normalize(coordinates)
+
+    step = time.perf_counter()
+    (matrix, terms, vectors), hit = _cached('vectors', vector_key, vectorize, rebuild=rebuild)
+    print(f"  ✓ TF-IDF {matrix.shape[0]} x {matrix.shape[1]} -> SVD {vectors.shape[1]} dims "
+          f"({'cached' if hit else f'{time.perf_counter() - step:.1f}s'})")
+
+    # dominant_L1_Tag comes from the current tags, so a reclassification is a new result
+    tags = input_hash(issues['issue_number'], issues['L1_Tag'].astype(str)) if 'L1_Tag' in issues.columns else None
+    result_key = hashlib.sha256(json.dumps([vector_key, tags, l1_clusters, l2_clusters]).encode('utf-8')).hexdigest()
+    step = time.perf_counter()
+    (assignments, candidates), hit = _cached(
+        'result', result_key,
+        lambda: cluster_issues(issues, l1_clusters, l2_clusters, vectors, matrix, terms),
+        rebuild=rebuild
+    )
+    print(f"  ✓ {len(candidates)} L1 clusters, {sum(len(c['l2']) for c in candidates)} L2 clusters "
+          f"({'cached' if hit else f'{time.perf_counter() - step:.1f}s'})")
+
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, 'cluster_candidates.json'), 'w') as f:
+        json.dump({
+            'input': os.path.basename(input_file),
+            'input_hash': source,
+            'issues': len(issues),
+            'params': {'l1_clusters': l1_clusters, 'l2_clusters': l2_clusters,
+                       'n_components': n_components, 'max_chars': max_chars},
+            'clusters': candidates,
+        }, f, indent=2)
+    assignments.to_csv(os.path.join(output_dir, 'cluster_assignments.csv'), index=False)
+
+    print("\nCandidate clusters:")
+    for entry in candidates:
+        print(f"\n  {entry['cluster']}  {entry['size']:6} issues ({entry['share']:6.1%})  "
+              f"{', '.join(entry['top_terms'][:6])}")
+        for sub in entry['l2']:
+            print(f"    {sub['cluster']:7} {sub['size']:6}  {', '.join(sub['top_terms'][:5])}")
+
+    print(f"\n  ✓ Saved cluster_candidates.json and cluster_assignments.csv to {output_dir}")
+    print(f"  Total: {time.perf_counter() - started:.1f}s")
+    return assignments, candidates
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Propose L1/L2 taxonomy clusters from issue text')
+    parser.add_argument('input_file', help='Issues CSV (raw, classified or tracker)')
+    parser.add_argument('-o', '--output-dir', default='.', help='Directory for cluster_candidates.json / cluster_assignments.csv')
+    parser.add_argument('--l1', type=int, default=L1_CLUSTERS, help='Number of L1 clusters (default: %(default)s)')
+    parser.add_argument('--l2', type=int, default=L2_CLUSTERS, help='Sub-clusters per L1 cluster (default: %(default)s)')
+    parser.add_argument('--components', type=int, default=N_COMPONENTS, help='SVD dimensions (default: %(default)s)')
+    parser.add_argument('--max-chars', type=int, default=MAX_CHARS, help='Characters per issue to vectorize (default: %(default)s)')
+    parser.add_argument('--rebuild', action='store_true', help=f'Ignore cached vectors/results in {CACHE_DIR}/')
+    args = parser.parse_args()
+
+    try:
+        run(args.input_file, args.output_dir, args.l1, args.l2, args.components, args.max_chars, args.rebuild)
+    except FileNotFoundError:
+        print(f"✗ Error: File '{args.input_file}' not found")
+        sys.exit(1)
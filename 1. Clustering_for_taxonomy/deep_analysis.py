@@ -1,274 +1,317 @@
 #!/usr/bin/env python3
 """
 Deep dive into issue themes through clustering and sampling.
+Themes and their subcategory keywords are declared once (THEMES) and
+evaluated as vectorized column operations.
+
+Usage:
+    python deep_analysis.py -o analysis/   (after analyze_issues.py -o analysis/)
 """
 
-import pandas as pd
+import numpy as np
+import argparse
 import json
-from collections import defaultdict, Counter
-import random
-
-# Load processed data
-df = pd.read_csv('/home/claude/issues_processed.csv')
-
-print("=" * 80)
-print("DEEP THEME ANALYSIS")
-print("=" * 80)
+import os
+import sys
+import time
+from pathlib import Path
+
+# Shared label filters, pattern scanning and stage caching live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from issue_schema import has_label
+from pattern_scanner import PatternScanner
+from processed_issues import PROCESSED_FILE, read_processed
+from stage_cache import CACHE_DIR, StageCache
+
+CATEGORIZATION_FILE = 'categorization_results.json'
+
+# ============================================================================
+# THEMES
+# ============================================================================
+
+# A theme is every issue carrying one of `labels` (or a label starting with
+# one of `prefixes`). Its subcategories are keyword lists, matched as
+# case-insensitive substrings of `fields`; an issue can fall into several.
+# Themes without subcategories only show a sample.
+THEMES = [
+    {
+        'key': 'core_functionality',
+        'heading': '1. CORE FUNCTIONALITY ISSUES (area:core)',
+        'labels': ['area:core'],
+        'fields': ['title', 'body'],
+        'subcategory_heading': 'Core subcategories:',
+        'subcategories': {
+            'session_management': ['session', 'conversation', 'history'],
+            'context_management': ['context', 'token', 'compact', 'window'],
+            'agent_behavior': ['agent', 'loop', 'agentic', 'autonomous'],
+            'hooks_lifecycle': ['hook', 'lifecycle', 'trigger'],
+            'stability': ['crash', 'exit', 'hang', 'freeze'],
+        },
+    },
+    {
+        'key': 'api_integration',
+        'heading': '2. API & INTEGRATION ISSUES',
+        'labels': ['area:api'],
+        'total_label': 'Total area:api',
+        'fields': ['body'],
+        'subcategory_heading': 'API subcategories:',
+        'subcategories': {
+            'rate_limits': ['rate limit', '429', 'quota', 'throttle'],
+            'authentication': ['401', '403', 'unauthorized', 'authentication', 'api key'],
+            'bedrock': ['bedrock', 'aws'],
+            'vertex': ['vertex', 'gcp', 'google cloud'],
+            'network_proxy': ['proxy', 'network', 'egress', 'dns'],
+        },
+    },
+    {
+        'key': 'user_interface',
+        'heading': '3. USER INTERFACE ISSUES (area:tui)',
+        'labels': ['area:tui'],
+        'fields': ['title', 'body'],
+        'subcategory_heading': 'TUI subcategories:',
+        'subcategories': {
+            'rendering_display': ['render', 'display', 'visual', 'layout', 'ui'],
+            'input_handling': ['input', 'keyboard', 'paste', 'copy', 'shortcut'],
+            'commands': ['command', '/command', 'slash'],
+            'feedback_status': ['notification', 'alert', 'status', 'progress'],
+        },
+    },
+    {
+        'key': 'tools_execution',
+        'heading': '4. TOOLS & EXECUTION (area:tools)',
+        'labels': ['area:tools'],
+        'fields': ['title', 'body'],
+        'subcategory_heading': 'Tools subcategories:',
+        'subcategories': {
+            'bash_execution': ['bash', 'shell', 'command execution'],
+            'file_operations': ['file', 'read', 'write', 'edit'],
+            'git_operations': ['git'],
+            'permissions_sandbox': ['sandbox', 'permission', 'deny', 'allow'],
+        },
+    },
+    {
+        'key': 'mcp_integration',
+        'heading': '5. MCP INTEGRATION (area:mcp)',
+        'labels': ['area:mcp'],
+    },
+    {
+        'key': 'ide_integration',
+        'heading': '6. IDE INTEGRATION (area:ide)',
+        'labels': ['area:ide'],
+        'fields': ['title', 'body'],
+        'subcategory_heading': 'IDE subcategories:',
+        'subcategories': {
+            'vscode': ['vscode'],
+            'cursor': ['cursor'],
+        },
+    },
+    {
+        'key': 'model_behavior',
+        'heading': '7. MODEL BEHAVIOR (area:model)',
+        'labels': ['area:model'],
+    },
+    {
+        'key': 'security',
+        'heading': '8. SECURITY (area:security)',
+        'labels': ['area:security'],
+    },
+    {
+        'key': 'memory_performance',
+        'heading': '9. MEMORY & PERFORMANCE',
+        'labels': ['memory'],
+        'prefixes': ['perf:'],
+    },
+    {
+        'key': 'feature_requests',
+        'heading': '10. FEATURE REQUESTS (enhancement)',
+        'labels': ['enhancement'],
+        'fields': ['title'],
+        'subcategory_heading': 'Feature request categories:',
+        'subcategories': {
+            'workflow_improvements': ['workflow', 'improve', 'better', 'easier'],
+            'new_capabilities': ['add', 'support', 'new'],
+            'configuration': ['config', 'setting', 'option', 'customize'],
+            'integrations': ['integration', 'connect', 'mcp'],
+        },
+    },
+]
+
+# ============================================================================
+# THEME ENGINE
+# ============================================================================
+
+def theme_text(df, fields):
+    """
+    Text a theme's keywords are searched in.
+
+    Fields are joined with newlines; no keyword contains one, so a match
+    never spans two fields (same as checking each field separately).
+    """
+    text = df[fields[0]].fillna('').astype(str)
+    for field in fields[1:]:
+        text = text + '\n' + df[field].fillna('').astype(str)
+    return text
+
+
+def evaluate_themes(df, themes=THEMES):
+    """
+    Evaluate every theme and subcategory as boolean masks over df.
+
+    Label masks come from the parsed label tuples; each theme's keywords are
+    scanned once, and only over that theme's issues.
+
+    Args:
+        df: Issues with parsed_labels (label tuples) and text fields
+        themes: Theme declarations (see THEMES)
+
+    Returns:
+        Dict of theme key -> {'mask': bool array, 'subcategories': {name: bool
+        array}}; subcategories that matched nothing are left out, the rest
+        are ordered by the first issue they matched (the original
+        iterrows order)
+    """
+    results = {}
+    for theme in themes:
+        mask = has_label(df['parsed_labels'], *theme['labels'], prefixes=theme.get('prefixes', ()))
+        subcategories = {}
+
+        if theme.get('subcategories'):
+            rows = np.flatnonzero(mask)
+            hits = PatternScanner.from_keywords(theme['subcategories']).scan(
+                theme_text(df.iloc[rows], theme['fields'])
+            ).to_numpy()
+
+            first_seen = []
+            for position, name in enumerate(theme['subcategories']):
+                column = hits[:, position]
+                if column.any():
+                    first_seen.append((int(np.argmax(column)), position, name))
+            for _, position, name in sorted(first_seen):
+                full = np.zeros(len(df), dtype=bool)
+                full[rows] = hits[:, position]
+                subcategories[name] = full
+
+        results[theme['key']] = {'mask': mask, 'subcategories': subcategories}
+    return results
+
+
+def categorization_summary(results, themes=THEMES):
+    """Counts per theme/subcategory in the categorization_results.json layout."""
+    summary = {}
+    for theme in themes:
+        result = results[theme['key']]
+        entry = {'total': int(result['mask'].sum())}
+        if 'subcategories' in theme:
+            entry['subcategories'] = {name: int(hit.sum()) for name, hit in result['subcategories'].items()}
+        summary[theme['key']] = entry
+    return summary
+
+# ============================================================================
+# REPORT
+# ============================================================================
 
-# Function to sample and display issues
 def sample_issues(df_subset, n=5):
     """Sample n issues and show their key info."""
     sample = df_subset.sample(min(n, len(df_subset)))
     for idx, row in sample.iterrows():
         print(f"\n  #{row['issue_number']}: {row['title'][:80]}")
         # Show labels
-        labels = eval(row['parsed_labels']) if pd.notna(row['parsed_labels']) else []
+        labels = row['parsed_labels']
         if labels:
             print(f"    Labels: {', '.join(labels[:5])}")
 
-# 1. CORE FUNCTIONALITY ISSUES
-print("\n" + "=" * 80)
-print("1. CORE FUNCTIONALITY ISSUES (area:core)")
-print("=" * 80)
-
-core_issues = df[df['labels'].str.contains('area:core', na=False)]
-print(f"Total: {len(core_issues)} issues")
-
-# Subcategories within core
-core_keywords = defaultdict(list)
-for idx, row in core_issues.iterrows():
-    title_lower = str(row['title']).lower()
-    body_lower = str(row['body']).lower()
-    
-    if any(kw in title_lower or kw in body_lower for kw in ['session', 'conversation', 'history']):
-        core_keywords['session_management'].append(idx)
-    if any(kw in title_lower or kw in body_lower for kw in ['context', 'token', 'compact', 'window']):
-        core_keywords['context_management'].append(idx)
-    if any(kw in title_lower or kw in body_lower for kw in ['agent', 'loop', 'agentic', 'autonomous']):
-        core_keywords['agent_behavior'].append(idx)
-    if any(kw in title_lower or kw in body_lower for kw in ['hook', 'lifecycle', 'trigger']):
-        core_keywords['hooks_lifecycle'].append(idx)
-    if any(kw in title_lower or kw in body_lower for kw in ['crash', 'exit', 'hang', 'freeze']):
-        core_keywords['stability'].append(idx)
-
-print("\nCore subcategories:")
-for subcat, indices in sorted(core_keywords.items(), key=lambda x: -len(x[1])):
-    print(f"  {subcat:30} {len(indices):4} issues")
-    sample_issues(df.loc[indices], n=2)
-
-# 2. API & INTEGRATION ISSUES
-print("\n" + "=" * 80)
-print("2. API & INTEGRATION ISSUES")
-print("=" * 80)
-
-api_issues = df[df['labels'].str.contains('area:api', na=False)]
-print(f"Total area:api: {len(api_issues)} issues")
-
-# API subcategories
-api_keywords = defaultdict(list)
-for idx, row in api_issues.iterrows():
-    title_lower = str(row['title']).lower()
-    body_lower = str(row['body']).lower()
-    
-    if any(kw in body_lower for kw in ['rate limit', '429', 'quota', 'throttle']):
-        api_keywords['rate_limits'].append(idx)
-    if any(kw in body_lower for kw in ['401', '403', 'unauthorized', 'authentication', 'api key']):
-        api_keywords['authentication'].append(idx)
-    if any(kw in body_lower for kw in ['bedrock', 'aws']):
-        api_keywords['bedrock'].append(idx)
-    if any(kw in body_lower for kw in ['vertex', 'gcp', 'google cloud']):
-        api_keywords['vertex'].append(idx)
-    if any(kw in body_lower for kw in ['proxy', 'network', 'egress', 'dns']):
-        api_keywords['network_proxy'].append(idx)
-
-print("\nAPI subcategories:")
-for subcat, indices in sorted(api_keywords.items(), key=lambda x: -len(x[1])):
-    print(f"  {subcat:30} {len(indices):4} issues")
-    sample_issues(df.loc[indices], n=2)
-
-# 3. USER INTERFACE ISSUES (TUI)
-print("\n" + "=" * 80)
-print("3. USER INTERFACE ISSUES (area:tui)")
-print("=" * 80)
-
-tui_issues = df[df['labels'].str.contains('area:tui', na=False)]
-print(f"Total: {len(tui_issues)} issues")
-
-tui_keywords = defaultdict(list)
-for idx, row in tui_issues.iterrows():
-    title_lower = str(row['title']).lower()
-    body_lower = str(row['body']).lower()
-    
-    if any(kw in title_lower or kw in body_lower for kw in ['render', 'display', 'visual', 'layout', 'ui']):
-        tui_keywords['rendering_display'].append(idx)
-    if any(kw in title_lower or kw in body_lower for kw in ['input', 'keyboard', 'paste', 'copy', 'shortcut']):
-        tui_keywords['input_handling'].append(idx)
-    if any(kw in title_lower or kw in body_lower for kw in ['command', '/command', 'slash']):
-        tui_keywords['commands'].append(idx)
-    if any(kw in title_lower or kw in body_lower for kw in ['notification', 'alert', 'status', 'progress']):
-        tui_keywords['feedback_status'].append(idx)
-
-print("\nTUI subcategories:")
-for subcat, indices in sorted(tui_keywords.items(), key=lambda x: -len(x[1])):
-    print(f"  {subcat:30} {len(indices):4} issues")
-    sample_issues(df.loc[indices], n=2)
-
-# 4. TOOLS & EXECUTION
-print("\n" + "=" * 80)
-print("4. TOOLS & EXECUTION (area:tools)")
-print("=" * 80)
-
-tools_issues = df[df['labels'].str.contains('area:tools', na=False)]
-print(f"Total: {len(tools_issues)} issues")
-
-tools_keywords = defaultdict(list)
-for idx, row in tools_issues.iterrows():
-    title_lower = str(row['title']).lower()
-    body_lower = str(row['body']).lower()
-    
-    if any(kw in title_lower or kw in body_lower for kw in ['bash', 'shell', 'command execution']):
-        tools_keywords['bash_execution'].append(idx)
-    if any(kw in title_lower or kw in body_lower for kw in ['file', 'read', 'write', 'edit']):
-        tools_keywords['file_operations'].append(idx)
-    if any(kw in title_lower or kw in body_lower for kw in ['git']):
-        tools_keywords['git_operations'].append(idx)
-    if any(kw in title_lower or kw in body_lower for kw in ['sandbox', 'permission', 'deny', 'allow']):
-        tools_keywords['permissions_sandbox'].append(idx)
-
-print("\nTools subcategories:")
-for subcat, indices in sorted(tools_keywords.items(), key=lambda x: -len(x[1])):
-    print(f"  {subcat:30} {len(indices):4} issues")
-    sample_issues(df.loc[indices], n=2)
-
-# 5. MCP INTEGRATION
-print("\n" + "=" * 80)
-print("5. MCP INTEGRATION (area:mcp)")
-print("=" * 80)
-
-mcp_issues = df[df['labels'].str.contains('area:mcp', na=False)]
-print(f"Total: {len(mcp_issues)} issues")
-sample_issues(mcp_issues, n=5)
-
-# 6. IDE INTEGRATION
-print("\n" + "=" * 80)
-print("6. IDE INTEGRATION (area:ide)")
-print("=" * 80)
-
-ide_issues = df[df['labels'].str.contains('area:ide', na=False)]
-print(f"Total: {len(ide_issues)} issues")
-
-ide_keywords = defaultdict(list)
-for idx, row in ide_issues.iterrows():
-    title_lower = str(row['title']).lower()
-    body_lower = str(row['body']).lower()
-    
-    if 'vscode' in title_lower or 'vscode' in body_lower:
-        ide_keywords['vscode'].append(idx)
-    if 'cursor' in title_lower or 'cursor' in body_lower:
-        ide_keywords['cursor'].append(idx)
-
-print("\nIDE subcategories:")
-for subcat, indices in sorted(ide_keywords.items(), key=lambda x: -len(x[1])):
-    print(f"  {subcat:30} {len(indices):4} issues")
-    sample_issues(df.loc[indices], n=2)
-
-# 7. MODEL BEHAVIOR
-print("\n" + "=" * 80)
-print("7. MODEL BEHAVIOR (area:model)")
-print("=" * 80)
-
-model_issues = df[df['labels'].str.contains('area:model', na=False)]
-print(f"Total: {len(model_issues)} issues")
-sample_issues(model_issues, n=5)
-
-# 8. SECURITY
-print("\n" + "=" * 80)
-print("8. SECURITY (area:security)")
-print("=" * 80)
-
-security_issues = df[df['labels'].str.contains('area:security', na=False)]
-print(f"Total: {len(security_issues)} issues")
-sample_issues(security_issues, n=5)
-
-# 9. MEMORY & PERFORMANCE
-print("\n" + "=" * 80)
-print("9. MEMORY & PERFORMANCE")
-print("=" * 80)
-
-memory_issues = df[df['labels'].str.contains('memory|perf:', na=False)]
-print(f"Total: {len(memory_issues)} issues")
-sample_issues(memory_issues, n=5)
-
-# 10. FEATURE REQUESTS
-print("\n" + "=" * 80)
-print("10. FEATURE REQUESTS (enhancement)")
-print("=" * 80)
-
-feature_issues = df[df['labels'].str.contains('enhancement', na=False)]
-print(f"Total: {len(feature_issues)} issues")
-
-# Categorize feature requests
-feature_keywords = defaultdict(list)
-for idx, row in feature_issues.iterrows():
-    title_lower = str(row['title']).lower()
-    
-    if any(kw in title_lower for kw in ['workflow', 'improve', 'better', 'easier']):
-        feature_keywords['workflow_improvements'].append(idx)
-    if any(kw in title_lower for kw in ['add', 'support', 'new']):
-        feature_keywords['new_capabilities'].append(idx)
-    if any(kw in title_lower for kw in ['config', 'setting', 'option', 'customize']):
-        feature_keywords['configuration'].append(idx)
-    if any(kw in title_lower for kw in ['integration', 'connect', 'mcp']):
-        feature_keywords['integrations'].append(idx)
-
-print("\nFeature request categories:")
-for subcat, indices in sorted(feature_keywords.items(), key=lambda x: -len(x[1])):
-    print(f"  {subcat:30} {len(indices):4} issues")
-    sample_issues(df.loc[indices], n=2)
-
-# Save categorization results
-categorization = {
-    'core_functionality': {
-        'total': len(core_issues),
-        'subcategories': {k: len(v) for k, v in core_keywords.items()}
-    },
-    'api_integration': {
-        'total': len(api_issues),
-        'subcategories': {k: len(v) for k, v in api_keywords.items()}
-    },
-    'user_interface': {
-        'total': len(tui_issues),
-        'subcategories': {k: len(v) for k, v in tui_keywords.items()}
-    },
-    'tools_execution': {
-        'total': len(tools_issues),
-        'subcategories': {k: len(v) for k, v in tools_keywords.items()}
-    },
-    'mcp_integration': {
-        'total': len(mcp_issues)
-    },
-    'ide_integration': {
-        'total': len(ide_issues),
-        'subcategories': {k: len(v) for k, v in ide_keywords.items()}
-    },
-    'model_behavior': {
-        'total': len(model_issues)
-    },
-    'security': {
-        'total': len(security_issues)
-    },
-    'memory_performance': {
-        'total': len(memory_issues)
-    },
-    'feature_requests': {
-        'total': len(feature_issues),
-        'subcategories': {k: len(v) for k, v in feature_keywords.items()}
-    }
-}
-
-with open('/home/claude/categorization_results.json', 'w') as f:
-    json.dump(categorization, f, indent=2)
-
-print("\n" + "=" * 80)
-print("Saved categorization results to categorization_results.json")
-print("=" * 80)
+
+def deep_analysis(processed_file=PROCESSED_FILE, categorization_file=CATEGORIZATION_FILE):
+    """
+    Print every theme with subcategory counts and sample issues, and save
+    the counts as categorization_results.json
+
+    Returns:
+        Dict of run info ({'rows': issues analyzed})
+    """
+    # Load processed data (parsed_labels arrive as label tuples, no per-row parsing)
+    df = read_processed(processed_file)
+
+    print("=" * 80)
+    print("DEEP THEME ANALYSIS")
+    print("=" * 80)
+
+    start_time = time.time()
+    results = evaluate_themes(df)
+    print(f"Evaluated {len(THEMES)} themes over {len(df)} issues in {time.time() - start_time:.2f} seconds")
+
+    for theme in THEMES:
+        result = results[theme['key']]
+        print("\n" + "=" * 80)
+        print(theme['heading'])
+        print("=" * 80)
+
+        print(f"{theme.get('total_label', 'Total')}: {int(result['mask'].sum())} issues")
+
+        if 'subcategories' not in theme:
+            sample_issues(df[result['mask']], n=5)
+            continue
+
+        print(f"\n{theme['subcategory_heading']}")
+        for subcat, hit in sorted(result['subcategories'].items(), key=lambda x: -x[1].sum()):
+            print(f"  {subcat:30} {int(hit.sum()):4} issues")
+            sample_issues(df[hit], n=2)
+
+    # Save categorization results
+    categorization = categorization_summary(results)
+
+    with open(categorization_file, 'w') as f:
+        json.dump(categorization, f, indent=2)
+
+    print("\n" + "=" * 80)
+    print(f"Saved categorization results to {categorization_file}")
+    print("=" * 80)
+
+    return {'rows': len(df)}
+
+
+def run(output_dir='.', processed_file=None, rebuild=False, cache_dir=CACHE_DIR):
+    """
+    Deep analysis stage: skipped when the processed issues and the themes
+    are unchanged since the last run into output_dir
+
+    Args:
+        output_dir: Directory for categorization_results.json
+        processed_file: Processed issues (default: issues_processed.parquet in output_dir)
+        rebuild: Rerun even if unchanged
+        cache_dir: Stage manifest directory
+
+    Returns:
+        The categorization summary (dict as saved to categorization_results.json)
+    """
+    processed_file = processed_file or os.path.join(output_dir, PROCESSED_FILE)
+    categorization_file = os.path.join(output_dir, CATEGORIZATION_FILE)
+    os.makedirs(output_dir, exist_ok=True)
+
+    entry, skipped = StageCache(cache_dir).run(
+        'deep_analysis',
+        lambda: deep_analysis(processed_file, categorization_file),
+        inputs=[processed_file],
+        outputs=[categorization_file],
+        code=[deep_analysis, has_label, PatternScanner, read_processed],
+        rebuild=rebuild
+    )
+    if skipped:
+        print(f"✓ {processed_file} unchanged since {entry['finished']}: reusing {categorization_file} (--rebuild to rerun)")
+
+    with open(categorization_file) as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Theme and subcategory deep dive over the processed issues')
+    parser.add_argument('-o', '--output-dir', default='.', help=f'Directory for {CATEGORIZATION_FILE}')
+    parser.add_argument('--processed', help=f'Processed issues from analyze_issues.py (default: <output-dir>/{PROCESSED_FILE})')
+    parser.add_argument('--rebuild', action='store_true', help='Rerun even if the input is unchanged')
+    args = parser.parse_args()
+
+    try:
+        run(args.output_dir, args.processed, args.rebuild)
+    except FileNotFoundError as e:
+        print(f"✗ Error: File '{e.filename}' not found (run analyze_issues.py first)")
+        sys.exit(1)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Label co-occurrence engine.
+Builds a sparse issue x label incidence matrix once and derives pair counts,
+lift/PMI scores, top-K partners per label and frequent itemsets from it.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _require_scipy():
+    try:
+        import scipy.sparse  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Label co-occurrence requires scipy: pip install scipy") from e
+
+
+class IncidenceBuilder:
+    """
+    Build the issue x label incidence matrix chunk by chunk.
+
+    Each add() keeps only the chunk's CSR index arrays (one int32 per issue
+    label), so the label tuples themselves can be dropped as the input is
+    streamed.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self._column = {}   # label -> column, in first-seen order
+        self._blocks = []   # (row lengths, column indices) per chunk
+
+    def add(self, label_sets):
+        """Append one chunk of label collections (one per issue)."""
+        lengths, indices = [], []
+        for issue_labels in label_sets:
+            issue_columns = {self._column.setdefault(label, len(self._column)) for label in issue_labels}
+            lengths.append(len(issue_columns))
+            indices.extend(issue_columns)
+        self._blocks.append((np.asarray(lengths, dtype=np.int64), np.asarray(indices, dtype=np.int32)))
+        self.rows += len(lengths)
+
+    def matrix(self):
+        """
+        Stack the chunks into one matrix.
+
+        Returns:
+            Tuple of (CSC matrix n_issues x n_labels of int32, label names in
+            column order, sorted alphabetically)
+        """
+        _require_scipy()
+        from scipy import sparse
+
+        labels = sorted(self._column)
+        # First-seen column -> alphabetical column
+        order = np.empty(len(labels), dtype=np.int32)
+        order[[self._column[label] for label in labels]] = np.arange(len(labels), dtype=np.int32)
+
+        lengths = np.concatenate([b[0] for b in self._blocks]) if self._blocks else np.zeros(0, dtype=np.int64)
+        indices = np.concatenate([b[1] for b in self._blocks]) if self._blocks else np.zeros(0, dtype=np.int32)
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        data = np.ones(len(indices), dtype=np.int32)
+        matrix = sparse.csr_matrix((data, order[indices], indptr), shape=(self.rows, len(labels)))
+        return matrix.tocsc(), labels
+
+
+def incidence_matrix(label_sets):
+    """
+    Build the binary issue x label incidence matrix.
+
+    Args:
+        label_sets: One label collection per issue (e.g. issue_schema.label_sets)
+
+    Returns:
+        Tuple of (CSC matrix n_issues x n_labels of int32, label names in
+        column order, sorted alphabetically)
+    """
+    builder = IncidenceBuilder()
+    builder.add(label_sets)
+    return builder.matrix()
+
+
+def pair_scores(matrix, labels, min_count=1):
+    """
+    Score every co-occurring label pair from one sparse product (X^T X).
+
+    lift = P(a, b) / (P(a) P(b)); pmi = log2(lift); npmi scales PMI to
+    [-1, 1] so rare and common pairs are comparable.
+
+    Args:
+        matrix: Incidence matrix from incidence_matrix
+        labels: Label names in column order
+        min_count: Drop pairs seen in fewer issues
+
+    Returns:
+        DataFrame with label_a < label_b, count, count_a, count_b, support,
+        confidence (P(b | a)), lift, pmi, npmi; sorted by count (desc)
+    """
+    from scipy import sparse
+
+    n_issues = matrix.shape[0]
+    counts = np.asarray(matrix.sum(axis=0)).ravel()
+    pairs = sparse.triu(matrix.T @ matrix, k=1).tocoo()
+    keep = pairs.data >= min_count
+    a, b, together = pairs.row[keep], pairs.col[keep], pairs.data[keep].astype(np.int64)
+
+    names = np.asarray(labels, dtype=object)
+    support = together / n_issues if n_issues else together.astype(float)
+    lift = together * n_issues / (counts[a] * counts[b])
+    pmi = np.log2(lift)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        npmi = np.where(support < 1, pmi / -np.log2(support), 1.0)
+
+    scores = pd.DataFrame({
+        'label_a': names[a],
+        'label_b': names[b],
+        'count': together,
+        'count_a': counts[a],
+        'count_b': counts[b],
+        'support': support,
+        'confidence': together / counts[a],
+        'lift': lift,
+        'pmi': pmi,
+        'npmi': npmi,
+    })
+    return scores.sort_values(['count', 'label_a', 'label_b'], ascending=[False, True, True], ignore_index=True)
+
+
+def top_partners(scores, k=5, by='lift'):
+    """
+    Top-K co-occurring labels for every label.
+
+    Args:
+        scores: Output of pair_scores
+        k: Partners per label
+        by: Ranking column (lift, pmi, npmi, count, ...); ties go to the
+            higher count
+
+    Returns:
+        DataFrame of label, partner, count, lift, pmi, npmi, sorted by label
+    """
+    columns = ['count', 'lift', 'pmi', 'npmi']
+    both = pd.concat([
+        scores.rename(columns={'label_a': 'label', 'label_b': 'partner'})[['label', 'partner'] + columns],
+        scores.rename(columns={'label_b': 'label', 'label_a': 'partner'})[['label', 'partner'] + columns],
+    ], ignore_index=True)
+    ranking = [by] if by == 'count' else [by, 'count']
+    both = both.sort_values(['label'] + ranking + ['partner'],
+                            ascending=[True] + [False] * len(ranking) + [True], kind='stable')
+    return both.groupby('label', sort=False).head(k).reset_index(drop=True)
+
+
+def frequent_itemsets(matrix, labels, max_size=3, min_count=2):
+    """
+    Frequent label itemsets up to max_size (Apriori over sparse products).
+
+    Each level keeps an indicator column per frequent itemset (the product
+    of its labels' columns); one sparse product with the incidence matrix
+    then counts every extension by a later label at once. Only frequent
+    itemsets are extended, so the work tracks the output size.
+
+    Args:
+        matrix: Incidence matrix from incidence_matrix
+        labels: Label names in column order
+        max_size: Largest itemset size
+        min_count: Minimum number of issues containing the whole itemset
+
+    Returns:
+        DataFrame of itemset (tuple of labels), size, count, support;
+        sorted by size, then count (desc)
+    """
+    from scipy import sparse
+
+    n_issues = matrix.shape[0]
+    matrix = sparse.csc_matrix(matrix)
+    counts = np.asarray(matrix.sum(axis=0)).ravel()
+
+    level = [(int(col),) for col in np.flatnonzero(counts >= min_count)]
+    indicators = matrix[:, [items[0] for items in level]] if level else None
+    found = [(items, int(counts[items[0]])) for items in level]
+
+    for _ in range(2, max_size + 1):
+        if not level:
+            break
+        extended = (indicators.T @ matrix).tocoo()
+        next_level = sorted(
+            (level[row] + (int(col),), int(count))
+            for row, col, count in zip(extended.row, extended.col, extended.data)
+            if col > level[row][-1] and count >= min_count
+        )
+        found.extend(next_level)
+
+        position = {items: idx for idx, items in enumerate(level)}
+        level = [items for items, _ in next_level]
+        if level:
+            parents = indicators[:, [position[items[:-1]] for items in level]]
+            indicators = sparse.csc_matrix(parents.multiply(matrix[:, [items[-1] for items in level]]))
+
+    names = list(labels)
+    result = pd.DataFrame({
+        'itemset': [tuple(names[i] for i in items) for items, _ in found],
+        'size': [len(items) for items, _ in found],
+        'count': [count for _, count in found],
+    })
+    result['support'] = result['count'] / n_issues if n_issues else 0.0
+    return result.sort_values(['size', 'count'], ascending=[True, False], kind='stable', ignore_index=True)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Processed issues hand-off between analyze_issues.py and deep_analysis.py.
+Stored as Parquet so parsed_labels stays a native list<string> column.
+"""
+
+import pandas as pd
+
+PROCESSED_FILE = 'issues_processed.parquet'
+LIST_COLUMNS = ['parsed_labels']
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Processed issues are stored as Parquet, which requires pyarrow: pip install pyarrow") from e
+
+
+def _to_table(df):
+    import pyarrow as pa
+
+    lists = [col for col in LIST_COLUMNS if col in df.columns]
+    table = pa.Table.from_pandas(df.drop(columns=lists), preserve_index=False)
+    for col in lists:
+        # Explicit type: an all-empty column would otherwise be list<null>
+        table = table.append_column(col, pa.array([list(v) for v in df[col]], type=pa.list_(pa.string())))
+    return table
+
+
+def write_processed(df, path=PROCESSED_FILE):
+    """
+    Save the processed issues, keeping list columns typed.
+
+    Args:
+        df: Issues with parsed_labels (tuples or lists of label strings)
+        path: Parquet file to write
+    """
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    pq.write_table(_to_table(df), path)
+
+
+class ProcessedWriter:
+    """
+    Write the processed issues chunk by chunk (one Parquet row group each).
+
+    The first chunk fixes the schema; later chunks are cast to it, so a
+    column that is all-null in one chunk doesn't change type. Use as a
+    context manager:
+
+        with ProcessedWriter(path) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+    """
+
+    def __init__(self, path=PROCESSED_FILE):
+        _require_pyarrow()
+        self.path = path
+        self.rows = 0
+        self._writer = None
+
+    def write(self, df):
+        """Append one chunk of processed issues."""
+        import pyarrow.parquet as pq
+
+        table = _to_table(df)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = table.cast(self._writer.schema)
+        self._writer.write_table(table)
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_processed(path=PROCESSED_FILE, columns=None):
+    """
+    Load the processed issues written by write_processed.
+
+    List columns come back as tuples of strings, ready for
+    issue_schema.has_label; nothing is parsed per row.
+
+    Args:
+        path: Parquet file to read
+        columns: Columns to load (default: all)
+
+    Returns:
+        DataFrame
+    """
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path, columns=columns)
+    lists = [col for col in LIST_COLUMNS if col in table.column_names]
+    df = table.drop_columns(lists).to_pandas()
+    for col in lists:
+        df[col] = pd.Series([tuple(v) for v in table.column(col).to_pylist()], index=df.index, dtype=object)
+    return df[table.column_names]
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Streaming term statistics for issue CSVs.
+Reads the file in chunks and counts title keywords, keyword n-grams and
+labels. Counts are exact until the vocabulary outgrows a memory budget,
+then continue in a Count-Min Sketch with heavy-hitter tracking for the top terms.
+"""
+
+import re
+import sys
+import zlib
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Shared schema and label parsing live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from issue_schema import header_row, label_sets
+
+CHUNK_SIZE = 5000
+SEED = 42
+
+MAX_EXACT_TERMS = 200_000   # Distinct terms counted exactly before switching to the sketch
+SKETCH_WIDTH = 1 << 18      # Counters per sketch row, a power of two (overestimate <= e/width * total, w.p. 1 - e^-depth)
+SKETCH_DEPTH = 4
+HEAVY_HITTERS = 5000        # Terms tracked for most_common() once sketched
+
+TITLE_STOPWORDS = {
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'been', 'be',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'should',
+    'can', 'could', 'may', 'might', 'must', 'not', 'when', 'after', 'before',
+    'claude', 'code', 'issue', 'bug', 'feature', 'request'
+}
+
+
+def extract_keywords(title):
+    """Extract meaningful keywords from title."""
+    # Remove issue type tags
+    title = re.sub(r'\[.*?\]', '', title)
+    # Convert to lowercase
+    title = title.lower()
+    # Remove special characters but keep spaces
+    title = re.sub(r'[^\w\s-]', ' ', title)
+    # Split into words, filter out common words
+    return [w for w in title.split() if w not in TITLE_STOPWORDS and len(w) > 2]
+
+
+def ngrams(words, n):
+    """Space-joined runs of n consecutive words."""
+    if n == 1:
+        return list(words)
+    return [' '.join(words[i:i + n]) for i in range(len(words) - n + 1)]
+
+
+# ============================================================================
+# COUNTERS
+# ============================================================================
+
+class CountMinSketch:
+    """
+    Count-Min Sketch over string terms.
+
+    depth rows of width counters; a term adds its count to one counter per
+    row (multiply-shift hashes of its CRC32) and is estimated by the
+    smallest of them, which never undercounts.
+    """
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH, seed=SEED):
+        if width & (width - 1):
+            raise ValueError("Sketch width must be a power of two")
+        rng = np.random.RandomState(seed)
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self._a = rng.randint(1, np.iinfo(np.int64).max, size=depth, dtype=np.int64).astype(np.uint64) | np.uint64(1)
+        self._b = rng.randint(0, np.iinfo(np.int64).max, size=depth, dtype=np.int64).astype(np.uint64)
+        self._shift = np.uint64(64 - (width.bit_length() - 1))
+
+    def _buckets(self, terms):
+        """(depth x len(terms)) counter index per row."""
+        keys = np.fromiter((zlib.crc32(t.encode('utf-8')) for t in terms), dtype=np.uint64, count=len(terms))
+        return ((self._a[:, None] * keys + self._b[:, None]) >> self._shift).astype(np.int64)
+
+    def add(self, terms, counts):
+        """Add counts (array aligned with terms)."""
+        buckets = self._buckets(terms)
+        for row in range(self.depth):
+            np.add.at(self.table[row], buckets[row], counts)
+
+    def estimate(self, terms):
+        """Upper-bound count per term."""
+        if not len(terms):
+            return np.empty(0, dtype=np.int64)
+        buckets = self._buckets(terms)
+        return self.table[np.arange(self.depth)[:, None], buckets].min(axis=0)
+
+
+class TermCounter:
+    """
+    Counter that stays exact while it fits and degrades to a sketch.
+
+    Up to max_exact distinct terms it is a plain Counter (same results and
+    tie order as Counter over the full term list). Beyond that every count
+    moves into a CountMinSketch and only the heavy_hitters terms with the
+    largest estimates are kept by name, so memory no longer grows with the
+    input.
+    """
+
+    def __init__(self, max_exact=MAX_EXACT_TERMS, width=SKETCH_WIDTH, depth=SKETCH_DEPTH,
+                 heavy_hitters=HEAVY_HITTERS, seed=SEED):
+        self.max_exact = max_exact
+        self.heavy_hitters = heavy_hitters
+        self._sketch_options = {'width': width, 'depth': depth, 'seed': seed}
+        self.counts = Counter()
+        self.sketch = None
+        self.total = 0
+
+    @property
+    def exact(self):
+        return self.sketch is None
+
+    def update(self, counts):
+        """Add a mapping of term -> count (e.g. one chunk's Counter)."""
+        self.total += sum(counts.values())
+        if self.exact:
+            self.counts.update(counts)
+            if len(self.counts) > self.max_exact:
+                self._to_sketch()
+            return
+
+        terms = list(counts)
+        self.sketch.add(terms, np.fromiter(counts.values(), dtype=np.int64, count=len(terms)))
+        for term, estimate in zip(terms, self.sketch.estimate(terms).tolist()):
+            self.counts[term] = estimate
+        if len(self.counts) > 2 * self.heavy_hitters:
+            self.counts = Counter(dict(self.counts.most_common(self.heavy_hitters)))
+
+    def _to_sketch(self):
+        self.sketch = CountMinSketch(**self._sketch_options)
+        terms = list(self.counts)
+        self.sketch.add(terms, np.fromiter(self.counts.values(), dtype=np.int64, count=len(terms)))
+        self.counts = Counter(dict(self.counts.most_common(self.heavy_hitters)))
+
+    def most_common(self, n=None):
+        return self.counts.most_common(n)
+
+    def items(self):
+        """(term, count) pairs kept by name: all terms when exact, the heavy hitters otherwise."""
+        return self.counts.items()
+
+    def __getitem__(self, term):
+        if term in self.counts or self.exact:
+            return self.counts[term]
+        return int(self.sketch.estimate([term])[0])
+
+    def __len__(self):
+        return len(self.counts)
+
+
+# ============================================================================
+# STREAMING
+# ============================================================================
+
+class TermStats:
+    """Title keyword, keyword n-gram and label counts, fed chunk by chunk."""
+
+    def __init__(self, ngram_sizes=(1, 2), **counter_options):
+        """
+        Args:
+            ngram_sizes: Keyword n-gram lengths to count (1 = single keywords)
+            **counter_options: Passed to every TermCounter (max_exact, width, ...)
+        """
+        self.ngram_sizes = tuple(ngram_sizes)
+        self.keywords = {n: TermCounter(**counter_options) for n in self.ngram_sizes}
+        self.labels = TermCounter(**counter_options)
+        self.issues = 0
+
+    def consume(self, chunk):
+        """Count one chunk of issues (title and labels columns)."""
+        self.issues += len(chunk)
+        chunk_counts = {n: Counter() for n in self.ngram_sizes}
+        for title in chunk['title']:
+            words = extract_keywords(str(title))
+            for n in self.ngram_sizes:
+                chunk_counts[n].update(ngrams(words, n))
+        for n, counts in chunk_counts.items():
+            self.keywords[n].update(counts)
+
+        label_counts = Counter()
+        for labels in label_sets(chunk['labels']):
+            label_counts.update(labels)
+        self.labels.update(label_counts)
+
+    @classmethod
+    def from_csv(cls, path, chunksize=CHUNK_SIZE, ngram_sizes=(1, 2), **counter_options):
+        """
+        Stream an issues CSV (raw, classified or tracker) in chunks.
+
+        Only the title and labels columns are read, chunksize rows at a time.
+        """
+        stats = cls(ngram_sizes, **counter_options)
+        for chunk in pd.read_csv(path, header=header_row(path), usecols=['title', 'labels'], chunksize=chunksize):
+            stats.consume(chunk)
+        return stats
+
+
+if __name__ == "__main__":
+    # python term_stats.py <issues.csv> [max n-gram]
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python term_stats.py <issues.csv> [max n-gram]")
+        sys.exit(1)
+
+    stats = TermStats.from_csv(sys.argv[1], ngram_sizes=range(1, int(sys.argv[2]) + 1) if len(sys.argv) == 3 else (1, 2))
+    print(f"Issues: {stats.issues}")
+    for n, counter in stats.keywords.items():
+        print(f"\nTop 20 title {n}-grams ({'exact' if counter.exact else 'sketch'}):")
+        for term, count in counter.most_common(20):
+            print(f"  {term:40} {count:6}")
+    print(f"\nTop 20 labels ({'exact' if stats.labels.exact else 'sketch'}):")
+    for label, count in stats.labels.most_common(20):
+        print(f"  {label:40} {count:6}")
@@ -73,6 +73,7 @@ if [ $? -eq 0 ]; then
         echo "   - Classified issues: output/classified_issues.csv"
         echo "   - Summary report: output/reports/summary_report.md"
         echo "   - Edge cases: output/reports/edge_cases.csv"
+        echo "   - Issues by L1/week: output/reports/issues_by_l1/"
         echo ""
     fi
 fi
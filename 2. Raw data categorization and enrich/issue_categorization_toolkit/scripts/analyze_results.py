@@ -6,63 +6,121 @@ Generate detailed analysis and reports from classified issues.
 
 Usage:
     python analyze_results.py --input output/classified_issues.csv --output-dir reports/
+    python analyze_results.py --input new_batch.csv --output-dir reports/ --partition-mode append
 """
 
-import pandas as pd
+import sys
+import time
 import argparse
-from collections import Counter
+from pathlib import Path
 
-def generate_summary_report(df, output_file):
+# Shared issue schema lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from issue_schema import DATETIME_FORMAT, read_issues
+from partitioned_dataset import MODES, write_partitions
+
+# Partitioned Parquet dataset (L1_Tag / week) under the output dir
+PARTITIONED_DIR = 'issues_by_l1'
+
+# Columns every count in the reports is derived from
+DIMENSIONS = ['Category', 'Sentiment', 'Confidence', 'L1_Tag', 'L1_Category', 'L2_Tag', 'L2_Category']
+
+EDGE_CASE_COLUMNS = [
+    'issue_number', 'title', 'labels',
+    'Category', 'Sentiment',
+    'L1_Tag', 'L1_Category',
+    'L2_Tag', 'L2_Category',
+    'Confidence', 'Tagging_Notes'
+]
+
+
+def build_report_context(df):
+    """
+    Compute everything the reports need in one pass over the issues
+
+    A single groupby over all report dimensions yields a small count cube
+    that every distribution in the summary is summed from; the edge-case
+    mask and the row positions of each L1 group are computed once here
+    instead of once per report (or once per L1).
+
+    Args:
+        df: Classified issues DataFrame
+
+    Returns:
+        Dict with df, total, cube (DIMENSIONS + count), edge_mask and
+        l1_groups ({L1_Tag: row positions})
+    """
+    cube = df.groupby(DIMENSIONS, observed=True, dropna=False).size().reset_index(name='count')
+    edge_mask = (df['Confidence'] == 'Low') | (df['L1_Tag'] == 'Other') | (df['L2_Tag'] == 'Other')
+
+    return {
+        'df': df,
+        'total': len(df),
+        'cube': cube,
+        'edge_mask': edge_mask.to_numpy(),
+        'l1_groups': df.groupby('L1_Tag', observed=True, sort=False).indices,
+    }
+
+
+def _counts(cube, columns):
+    """Sum the count cube down to the given columns (NaN keys dropped, like value_counts)"""
+    return cube.groupby(columns, observed=True)['count'].sum()
+
+
+def generate_summary_report(ctx, output_file):
     """Generate summary statistics report."""
     
+    total = ctx['total']
+    cube = ctx['cube']
+
     report = []
     report.append("# CLASSIFICATION SUMMARY REPORT")
-    report.append(f"## Total Issues: {len(df)}\n")
+    report.append(f"## Total Issues: {total}\n")
     report.append("=" * 80 + "\n")
     
     # By Category
     report.append("## By Issue Type\n")
-    for cat, count in df['Category'].value_counts().items():
-        pct = (count / len(df)) * 100
+    for cat, count in _counts(cube, 'Category').sort_values(ascending=False).items():
+        pct = (count / total) * 100
         report.append(f"- **{cat}**: {count} ({pct:.1f}%)")
     report.append("")
     
     # By Sentiment
     report.append("## By Sentiment\n")
-    for sent, count in df['Sentiment'].value_counts().items():
-        pct = (count / len(df)) * 100
+    for sent, count in _counts(cube, 'Sentiment').sort_values(ascending=False).items():
+        pct = (count / total) * 100
         report.append(f"- **{sent}**: {count} ({pct:.1f}%)")
     report.append("")
     
     # By L1 Category
     report.append("## By L1 Category\n")
-    l1_counts = df.groupby(['L1_Tag', 'L1_Category']).size().reset_index(name='count')
+    l1_counts = _counts(cube, ['L1_Tag', 'L1_Category']).reset_index(name='count')
     l1_counts = l1_counts.sort_values('count', ascending=False)
     for _, row in l1_counts.head(10).iterrows():
-        pct = (row['count'] / len(df)) * 100
+        pct = (row['count'] / total) * 100
         report.append(f"- **{row['L1_Tag']}** ({row['L1_Category']}): {row['count']} ({pct:.1f}%)")
     report.append("")
     
     # Top L2 Categories
     report.append("## Top 10 L2 Categories\n")
-    l2_counts = df[df['L2_Tag'] != 'Other'].groupby(['L2_Tag', 'L2_Category']).size().reset_index(name='count')
+    l2_counts = _counts(cube[cube['L2_Tag'] != 'Other'], ['L2_Tag', 'L2_Category']).reset_index(name='count')
     l2_counts = l2_counts.sort_values('count', ascending=False)
     for idx, row in l2_counts.head(10).iterrows():
-        pct = (row['count'] / len(df)) * 100
+        pct = (row['count'] / total) * 100
         report.append(f"{idx+1}. **{row['L2_Tag']}** - {row['L2_Category']}: {row['count']} ({pct:.1f}%)")
     report.append("")
     
     # By Confidence
     report.append("## By Confidence Level\n")
-    for conf, count in df['Confidence'].value_counts().items():
-        pct = (count / len(df)) * 100
+    for conf, count in _counts(cube, 'Confidence').sort_values(ascending=False).items():
+        pct = (count / total) * 100
         report.append(f"- **{conf}**: {count} ({pct:.1f}%)")
     report.append("")
     
     # Edge cases
-    edge_cases = df[(df['Confidence'] == 'Low') | (df['L1_Tag'] == 'Other') | (df['L2_Tag'] == 'Other')]
+    edge_count = int(ctx['edge_mask'].sum())
     report.append(f"## Edge Cases (Low Confidence or 'Other')\n")
-    report.append(f"Total: {len(edge_cases)} issues ({len(edge_cases)/len(df)*100:.1f}%)\n")
+    report.append(f"Total: {edge_count} issues ({edge_count/total*100:.1f}%)\n")
     
     # Write report
     with open(output_file, 'w') as f:
@@ -70,43 +128,86 @@ def generate_summary_report(df, output_file):
     
     print(f"  ✓ Summary report saved to: {output_file}")
 
-def generate_edge_cases_report(df, output_file):
+def generate_edge_cases_report(ctx, output_file):
     """Extract edge cases for manual review."""
     
-    edge_cases = df[(df['Confidence'] == 'Low') | 
-                    (df['L1_Tag'] == 'Other') | 
-                    (df['L2_Tag'] == 'Other')]
-    
-    edge_cases_report = edge_cases[[
-        'issue_number', 'title', 'labels',
-        'Category', 'Sentiment',
-        'L1_Tag', 'L1_Category',
-        'L2_Tag', 'L2_Category',
-        'Confidence', 'Tagging_Notes'
-    ]]
-    
-    edge_cases_report.to_csv(output_file, index=False)
+    edge_cases = ctx['df'].loc[ctx['edge_mask'], EDGE_CASE_COLUMNS]
+    edge_cases.to_csv(output_file, index=False)
     print(f"  ✓ Edge cases report ({len(edge_cases)} issues) saved to: {output_file}")
 
-def generate_l1_breakdown(df, output_dir):
-    """Generate breakdown by L1 category."""
-    
-    for l1_code in df['L1_Tag'].unique():
+def generate_l1_breakdown(ctx, output_dir):
+    """Generate breakdown by L1 category (partitioned Parquet, CSV per L1 without pyarrow)."""
+    
+    dataset_dir = f"{output_dir}/{PARTITIONED_DIR}"
+    try:
+        result = write_partitions(ctx['df'], dataset_dir, mode=ctx['partition_mode'], prune=ctx['prune'])
+    except ImportError as e:
+        print(f"  ⚠ {e}; writing one CSV per L1 category instead")
+    else:
+        print(f"  ✓ L1 x week partitions saved to: {dataset_dir}/ "
+              f"({len(result['written'])} written, {len(result['appended'])} appended, "
+              f"{len(result['unchanged'])} unchanged, {len(result['pruned'])} pruned)")
+        return
+
+    df = ctx['df']
+    for l1_code, positions in ctx['l1_groups'].items():
         if l1_code == 'Other':
             continue
         
-        l1_issues = df[df['L1_Tag'] == l1_code]
+        l1_issues = df.iloc[positions]
         l1_name = l1_issues['L1_Category'].iloc[0]
         
         filename = f"{output_dir}/L1_{l1_code}_{l1_name.replace(' ', '_')}.csv"
-        l1_issues.to_csv(filename, index=False)
+        l1_issues.to_csv(filename, index=False, date_format=DATETIME_FORMAT)
     
     print(f"  ✓ L1 breakdown files saved to: {output_dir}/")
 
+# (label, writer, output path relative to the output dir, or None for the dir itself)
+REPORTS = [
+    ('summary report', generate_summary_report, 'summary_report.md'),
+    ('edge cases report', generate_edge_cases_report, 'edge_cases.csv'),
+    ('L1 category breakdowns', generate_l1_breakdown, None),
+]
+
+def run_reports(df, output_dir, partition_mode='overwrite', prune=False):
+    """
+    Build the shared context once, then write every report from it
+
+    Args:
+        df: Classified issues DataFrame
+        output_dir: Report directory
+        partition_mode: 'overwrite' (changed partitions only) or 'append'
+        prune: Remove partitions with no rows in df (overwrite mode)
+
+    Returns:
+        Dict of {step: seconds}, including the shared aggregation pass
+    """
+    timings = {}
+    total_steps = len(REPORTS) + 2
+
+    print(f"\n[2/{total_steps}] Aggregating (single pass)...")
+    started = time.perf_counter()
+    ctx = build_report_context(df)
+    ctx.update(partition_mode=partition_mode, prune=prune)
+    timings['aggregation pass'] = time.perf_counter() - started
+    print(f"  ✓ {len(ctx['cube'])} dimension combinations, {len(ctx['l1_groups'])} L1 groups")
+
+    for step, (label, writer, filename) in enumerate(REPORTS, start=3):
+        print(f"\n[{step}/{total_steps}] Generating {label}...")
+        started = time.perf_counter()
+        writer(ctx, f"{output_dir}/{filename}" if filename else output_dir)
+        timings[label] = time.perf_counter() - started
+
+    return timings
+
 def main():
     parser = argparse.ArgumentParser(description='Analyze classified issues')
     parser.add_argument('--input', required=True, help='Input CSV with classified issues')
     parser.add_argument('--output-dir', required=True, help='Output directory for reports')
+    parser.add_argument('--partition-mode', choices=MODES, default='overwrite',
+                        help='overwrite: rewrite partitions whose rows changed; append: add the input as new rows')
+    parser.add_argument('--prune', action='store_true',
+                        help='Delete partitions with no rows in the input (input is a full snapshot)')
     
     args = parser.parse_args()
     
@@ -115,23 +216,22 @@ def main():
     print("=" * 80)
     
     # Load data
-    print(f"\n[1/4] Loading classified issues...")
-    df = pd.read_csv(args.input)
+    print(f"\n[1/{len(REPORTS) + 2}] Loading classified issues...")
+    started = time.perf_counter()
+    df = read_issues(args.input, stage='classified')
+    load_seconds = time.perf_counter() - started
     print(f"  ✓ Loaded {len(df)} classified issues")
     
     # Generate reports
-    print(f"\n[2/4] Generating summary report...")
-    generate_summary_report(df, f"{args.output_dir}/summary_report.md")
-    
-    print(f"\n[3/4] Generating edge cases report...")
-    generate_edge_cases_report(df, f"{args.output_dir}/edge_cases.csv")
-    
-    print(f"\n[4/4] Generating L1 category breakdowns...")
-    generate_l1_breakdown(df, args.output_dir)
+    timings = {'load': load_seconds, **run_reports(df, args.output_dir, args.partition_mode, args.prune)}
     
     print("\n" + "=" * 80)
     print("✓ Analysis complete!")
     print("=" * 80)
+    print("\nTiming:")
+    for label, seconds in timings.items():
+        print(f"  {label:<24} {seconds * 1000:8.1f} ms")
+    print(f"  {'total':<24} {sum(timings.values()) * 1000:8.1f} ms")
 
 if __name__ == "__main__":
     main()
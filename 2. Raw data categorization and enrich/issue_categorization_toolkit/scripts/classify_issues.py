@@ -6,105 +6,153 @@ Main script to classify GitHub issues using L1/L2 taxonomy.
 
 Usage:
     python classify_issues.py --input data/raw_issues.csv --taxonomy data/taxonomy_l1_l2.csv --output output/classified_issues.csv
+
+Results are kept in a classification store next to the output; later runs
+only classify issues whose content or relevant taxonomy entries changed.
 """
 
 import pandas as pd
 import re
+import sys
 import argparse
+import hashlib
+import json
+import os
 import time
-from collections import defaultdict, Counter
+from collections import Counter
+from pathlib import Path
+
+# Shared issue schema lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from issue_schema import DATETIME_FORMAT, SchemaError, check_enums, label_sets, read_issues
+from pattern_scanner import PatternScanner
+from taxonomy_matcher import LABEL_TO_L1, L2_SPECIFIC_PATTERNS, load_matcher
 
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
-LABEL_TO_L1 = {
-    'area:core': 'L1.1',
-    'area:api': 'L1.2',
-    'area:tui': 'L1.3',
-    'area:tools': 'L1.4',
-    'area:mcp': 'L1.5',
-    'area:ide': 'L1.6',
-    'area:model': 'L1.7',
-    'platform:macos': 'L1.8',
-    'platform:windows': 'L1.8',
-    'platform:linux': 'L1.8',
-    'perf:memory': 'L1.9',
-    'memory': 'L1.9',
-    'area:security': 'L1.10',
-}
-
-L2_SPECIFIC_PATTERNS = {
-    'L2.1.1': ['context', 'compact', 'token', 'window'],
-    'L2.1.2': ['session', 'conversation', 'history', 'resume'],
-    'L2.1.3': ['agent', 'loop', 'agentic', 'autonomous'],
-    'L2.1.4': ['crash', 'exit', 'hang', 'freeze', 'terminated'],
-    'L2.1.5': ['hook', 'sessionstart', 'precompact', 'userpromptsubmit', 'trigger', 'lifecycle'],
-    'L2.5.1': ['plugin', 'install', 'update', 'marketplace'],
-    'L2.5.2': ['mcp server', 'oauth', 'connection', 'discovery'],
-    'L2.5.3': ['mcp tool', 'tool call', 'tool result'],
-}
+# Label routing and L2 patterns live in taxonomy_matcher.py
+# Bump when classification logic changes so stored results are recomputed
+CLASSIFIER_VERSION = 2
 
 # ============================================================================
-# TAXONOMY LOADING
+# CLASSIFICATION STORE
 # ============================================================================
 
-def load_taxonomy(taxonomy_path):
-    """Load and parse taxonomy CSV."""
-    taxonomy_df = pd.read_csv(taxonomy_path)
-    
-    taxonomy_lookup = {}
-    l1_code_to_name = {}
-    l2_code_to_name = {}
-    
-    for _, row in taxonomy_df.iterrows():
-        l1_code = row['L1_Code']
-        l2_code = row['L2_Code']
-        
-        l1_code_to_name[l1_code] = row['L1_Category']
-        l2_code_to_name[l2_code] = row['L2_Subcategory']
-        
-        if l1_code not in taxonomy_lookup:
-            taxonomy_lookup[l1_code] = {
-                'category': row['L1_Category'],
-                'description': row['L1_Description'],
-                'l2_options': []
-            }
-        taxonomy_lookup[l1_code]['l2_options'].append({
-            'code': l2_code,
-            'subcategory': row['L2_Subcategory'],
-            'description': row['L2_Description'],
-            'keywords': [k.strip() for k in str(row['Example_Keywords']).lower().split(',') if k.strip()]
-        })
-    
-    return taxonomy_lookup, l1_code_to_name, l2_code_to_name
+RESULT_COLUMNS = ['Category', 'Summary', 'Sentiment', 'L1_Tag', 'L1_Category', 'L2_Tag', 'L2_Category', 'Confidence', 'Tagging_Notes']
+STORE_KEY_COLUMNS = ['issue_number', 'content_hash', 'rules_hash', 'route', 'taxonomy_key']
+STORE_FILE = 'classification_store.csv'
+
+def _digest(*parts):
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+def rules_hash():
+    """Version of the hard-coded rules (label routing, L2 patterns, classifier logic)."""
+    return _digest(CLASSIFIER_VERSION, LABEL_TO_L1, L2_SPECIFIC_PATTERNS)
+
+def content_hashes(issues_df):
+    """Hash of title/body/labels per issue (the only inputs classification reads)."""
+    fields = issues_df[['title', 'body', 'labels']].astype(object).where(issues_df[['title', 'body', 'labels']].notna(), '')
+    return [_digest(*row) for row in fields.itertuples(index=False, name=None)]
+
+def taxonomy_fingerprints(taxonomy_lookup):
+    """
+    Hash the parts of the taxonomy a classification can depend on.
+
+    Returns:
+        (section hash per L1 code, hash of all L1 keyword sets). Descriptions
+        are not used for matching, so editing them invalidates nothing.
+    """
+    sections = {
+        l1_code: _digest(l1_code, info['category'],
+                         [(o['code'], o['subcategory'], o['keywords']) for o in info['l2_options']])
+        for l1_code, info in taxonomy_lookup.items()
+    }
+    # L1 order matters: it breaks ties between equal keyword scores
+    keyword_index = _digest([
+        (l1_code, sorted({k for o in info['l2_options'] for k in o['keywords']}))
+        for l1_code, info in taxonomy_lookup.items()
+    ])
+    return sections, keyword_index
+
+def taxonomy_key(route, l1_code, fingerprints):
+    """
+    Key of the taxonomy entries one result depended on.
+
+    Label-routed issues only read their L1's section; keyword-routed issues
+    were scored against every L1's keywords, then matched within the winner.
+    """
+    sections, keyword_index = fingerprints
+    if route == 'label':
+        return sections.get(l1_code, 'missing')
+    return _digest(keyword_index, sections.get(l1_code, ''))
+
+def load_store(store_path):
+    """Load the classification store (empty if missing), indexed by issue_number."""
+    if not os.path.exists(store_path):
+        return pd.DataFrame(columns=STORE_KEY_COLUMNS + RESULT_COLUMNS).set_index('issue_number')
+    store = pd.read_csv(store_path, dtype=str, keep_default_na=False)
+    store['issue_number'] = store['issue_number'].astype('int64')
+    return store.set_index('issue_number')
+
+def save_store(store, store_path):
+    os.makedirs(os.path.dirname(store_path) or '.', exist_ok=True)
+    store.reset_index().to_csv(store_path + '.tmp', index=False)
+    os.replace(store_path + '.tmp', store_path)
+
+def stale_reason(store, issue_number, content_hash, current_rules, fingerprints):
+    """Return why the stored result for an issue can't be reused, or None if it can."""
+    if issue_number not in store.index:
+        return 'new'
+    entry = store.loc[issue_number]
+    if entry['rules_hash'] != current_rules:
+        return 'rules changed'
+    if entry['content_hash'] != content_hash:
+        return 'content changed'
+    if entry['taxonomy_key'] != taxonomy_key(entry['route'], entry['L1_Tag'], fingerprints):
+        return 'taxonomy changed'
+    return None
 
 # ============================================================================
 # CLASSIFICATION FUNCTIONS
 # ============================================================================
 
+# Keyword groups for issue type and sentiment (plain substrings, case-insensitive)
+ISSUE_TYPE_KEYWORDS = PatternScanner.from_keywords({
+    'bug_tag': ['[bug]', '[bug', 'bug:'],
+    'feature_tag': ['[feature]', '[enhancement]', 'feature request'],
+    'docs_tag': ['[docs]', '[documentation]'],
+    'docs': ['documentation', 'docs', 'unclear instructions'],
+    'bug': ['error', 'crash', 'fail', 'broke', 'broken', 'not working', 'issue'],
+    'feature': ['add', 'support', 'want', 'request', 'would like', 'improvement'],
+}, engine='python')
+
+SENTIMENT_KEYWORDS = PatternScanner.from_keywords({
+    'positive': ['great', 'love', 'been great', 'fantastic', 'excellent', 'appreciate'],
+    'negative': ['frustrated', 'annoying', 'terrible', 'wasted', 'completely', 'useless',
+                 'hours', 'realllly', 'lazy', 'poor', 'non-functional', 'spent several hours'],
+}, engine='python')
+
 def classify_issue_type(title, body):
     """Classify as Bug, Feature Request, or Documentation."""
-    title_lower = str(title).lower()
     body_lower = str(body).lower() if pd.notna(body) else ""
+    title_hits = ISSUE_TYPE_KEYWORDS.search(str(title))
     
-    if any(tag in title_lower for tag in ['[bug]', '[bug', 'bug:']):
+    if 'bug_tag' in title_hits:
         return 'Bug'
-    if any(tag in title_lower for tag in ['[feature]', '[enhancement]', 'feature request']):
+    if 'feature_tag' in title_hits:
         return 'Feature Request'
-    if any(tag in title_lower for tag in ['[docs]', '[documentation]']):
+    if 'docs_tag' in title_hits:
         return 'Documentation'
     
-    doc_keywords = ['documentation', 'docs', 'unclear instructions']
-    if any(kw in title_lower or kw in body_lower[:200] for kw in doc_keywords):
+    if 'docs' in title_hits or 'docs' in ISSUE_TYPE_KEYWORDS.search(body_lower[:200]):
         return 'Documentation'
     
-    bug_keywords = ['error', 'crash', 'fail', 'broke', 'broken', 'not working', 'issue']
-    if any(kw in title_lower or kw in body_lower[:300] for kw in bug_keywords):
+    if 'bug' in title_hits or 'bug' in ISSUE_TYPE_KEYWORDS.search(body_lower[:300]):
         return 'Bug'
     
-    feature_keywords = ['add', 'support', 'want', 'request', 'would like', 'improvement']
-    if any(kw in title_lower for kw in feature_keywords):
+    if 'feature' in title_hits:
         return 'Feature Request'
     
     return 'Bug'
@@ -122,96 +170,24 @@ def create_summary(title):
 def classify_sentiment(title, body):
     """Classify sentiment: Positive, Neutral, or Negative."""
     text = (str(title) + " " + str(body)[:500]).lower()
+    hits = SENTIMENT_KEYWORDS.search(text)
     
-    positive_keywords = ['great', 'love', 'been great', 'fantastic', 'excellent', 'appreciate']
-    if any(kw in text for kw in positive_keywords):
+    if 'positive' in hits:
         return 'Positive'
     
-    negative_keywords = ['frustrated', 'annoying', 'terrible', 'wasted', 'completely', 'useless',
-                        'hours', 'realllly', 'lazy', 'poor', 'non-functional', 'spent several hours']
     caps = sum(1 for c in str(title) if c.isupper())
     
-    if any(kw in text for kw in negative_keywords) or caps > 15 or text.count('!') > 3:
+    if 'negative' in hits or caps > 15 or text.count('!') > 3:
         return 'Negative'
     
     return 'Neutral'
 
-def find_best_l2(l1_code, text, labels_str, taxonomy_lookup, l2_code_to_name):
-    """Find best L2 subcategory. Returns 'Other' if no good match."""
-    text_lower = text.lower()
-    l2_matches = defaultdict(int)
-    
-    # Check specific L2 patterns
-    for l2_code, patterns in L2_SPECIFIC_PATTERNS.items():
-        if not l2_code.startswith(l1_code.replace('L1', 'L2')):
-            continue
-        for pattern in patterns:
-            if pattern in text_lower:
-                l2_matches[l2_code] += 3 if pattern in text[:200].lower() else 1
-    
-    # Check taxonomy keywords
-    for l2_option in taxonomy_lookup[l1_code]['l2_options']:
-        for keyword in l2_option['keywords']:
-            if keyword and keyword in text_lower:
-                l2_matches[l2_option['code']] += 1
-    
-    if l2_matches:
-        best_l2 = max(l2_matches, key=l2_matches.get)
-        score = l2_matches[best_l2]
-        
-        if score < 2:
-            return 'Other', 'Low', f'Weak L2 match (score={score})'
-        
-        confidence = 'High' if score >= 4 else 'Medium'
-        return best_l2, confidence, ''
-    
-    return 'Other', 'Low', 'No L2 match found'
-
-def match_l1_l2(title, body, labels, taxonomy_lookup, l1_code_to_name, l2_code_to_name):
-    """Match issue to L1 and L2 categories."""
-    text = str(title) + " " + str(body)
-    labels_str = str(labels).lower()
-    
-    # PRIORITY 1: Use GitHub labels
-    for label, l1_code in LABEL_TO_L1.items():
-        if label in labels_str:
-            best_l2, confidence, notes = find_best_l2(l1_code, text, labels_str, taxonomy_lookup, l2_code_to_name)
-            l1_category = l1_code_to_name.get(l1_code, 'Other')
-            l2_category = l2_code_to_name.get(best_l2, 'Other') if best_l2 != 'Other' else 'Other'
-            return l1_code, l1_category, best_l2, l2_category, confidence, notes
-    
-    # PRIORITY 2: Keyword matching
-    l1_scores = defaultdict(int)
-    for l1_code, l1_info in taxonomy_lookup.items():
-        for l2_option in l1_info['l2_options']:
-            for keyword in l2_option['keywords']:
-                if keyword and keyword in text.lower():
-                    l1_scores[l1_code] += 2 if keyword in title.lower() else 1
-    
-    if l1_scores:
-        best_l1 = max(l1_scores, key=l1_scores.get)
-        score = l1_scores[best_l1]
-        
-        if score < 2:
-            return 'Other', 'Other', 'Other', 'Other', 'Low', f'Weak L1 match (score={score})'
-        
-        best_l2, confidence, notes = find_best_l2(best_l1, text, labels_str, taxonomy_lookup, l2_code_to_name)
-        l1_category = l1_code_to_name.get(best_l1, 'Other')
-        l2_category = l2_code_to_name.get(best_l2, 'Other') if best_l2 != 'Other' else 'Other'
-        return best_l1, l1_category, best_l2, l2_category, confidence, notes
-    
-    # PRIORITY 3: No match
-    return 'Other', 'Other', 'Other', 'Other', 'Low', 'No clear L1/L2 match'
-
-def classify_row(row, taxonomy_lookup, l1_code_to_name, l2_code_to_name):
-    """Classify a single issue row."""
+def classify_row(row, matcher, labels):
+    """Classify a single issue row (labels: parsed label tuple for the row)."""
     title = row['title']
     body = row['body'] if pd.notna(row['body']) else ''
-    labels = row['labels'] if pd.notna(row['labels']) else ''
     
-    l1_code, l1_category, l2_code, l2_category, confidence, notes = match_l1_l2(
-        title, body, labels, taxonomy_lookup, l1_code_to_name, l2_code_to_name
-    )
+    l1_code, l1_category, l2_code, l2_category, confidence, notes = matcher.match(title, body, labels)
     
     return {
         'Category': classify_issue_type(title, body),
@@ -235,6 +211,8 @@ def main():
     parser.add_argument('--taxonomy', required=True, help='Taxonomy CSV file')
     parser.add_argument('--output', required=True, help='Output CSV file for classified issues')
     parser.add_argument('--progress', action='store_true', help='Show progress during classification')
+    parser.add_argument('--store', help=f'Classification store CSV (default: {STORE_FILE} next to --output)')
+    parser.add_argument('--full', action='store_true', help='Ignore stored results and classify every issue')
     
     args = parser.parse_args()
     
@@ -244,10 +222,27 @@ def main():
     
     # Load data
     print(f"\n[1/4] Loading data...")
-    issues_df = pd.read_csv(args.input)
-    taxonomy_lookup, l1_code_to_name, l2_code_to_name = load_taxonomy(args.taxonomy)
+    try:
+        issues_df = read_issues(args.input, stage='raw')
+    except SchemaError as e:
+        print(f"  ✗ {e}")
+        return
+    matcher = load_matcher(args.taxonomy)
     print(f"  ✓ Loaded {len(issues_df)} issues")
-    print(f"  ✓ Loaded taxonomy with {len(taxonomy_lookup)} L1 categories")
+    print(f"  ✓ Loaded taxonomy with {len(matcher.taxonomy_lookup)} L1 categories")
+    
+    # Decide which issues need (re)classification
+    store_path = args.store or os.path.join(os.path.dirname(args.output), STORE_FILE)
+    store = load_store(store_path) if not args.full else load_store('')
+    fingerprints = taxonomy_fingerprints(matcher.taxonomy_lookup)
+    current_rules = rules_hash()
+    hashes = content_hashes(issues_df)
+    labels = label_sets(issues_df['labels'])
+    reasons = [stale_reason(store, number, content_hash, current_rules, fingerprints)
+               for number, content_hash in zip(issues_df['issue_number'], hashes)]
+    todo = [idx for idx, reason in enumerate(reasons) if reason is not None]
+    print(f"  ✓ Store: {store_path} ({len(issues_df) - len(todo)} reusable, {len(todo)} to classify"
+          + (f": {', '.join(f'{n} {r}' for r, n in Counter(r for r in reasons if r).items())})" if todo else ")"))
     
     # Classify
     print(f"\n[2/4] Classifying issues...")
@@ -255,14 +250,22 @@ def main():
         print("  Progress: ", end='', flush=True)
     
     start_time = time.time()
-    results = []
-    
-    for idx in range(len(issues_df)):
-        result = classify_row(issues_df.iloc[idx], taxonomy_lookup, l1_code_to_name, l2_code_to_name)
-        results.append(result)
+    results = {}
+    
+    for count, idx in enumerate(todo, start=1):
+        row = issues_df.iloc[idx]
+        result = classify_row(row, matcher, labels[idx])
+        route = 'label' if matcher.label_l1(labels[idx]) else 'keywords'
+        results[idx] = {
+            **result,
+            'content_hash': hashes[idx],
+            'rules_hash': current_rules,
+            'route': route,
+            'taxonomy_key': taxonomy_key(route, result['L1_Tag'], fingerprints),
+        }
         
-        if args.progress and (idx + 1) % 100 == 0:
-            print(f"{idx + 1}...", end='', flush=True)
+        if args.progress and count % 100 == 0:
+            print(f"{count}...", end='', flush=True)
     
     if args.progress:
         print(" Done!")
@@ -270,27 +273,40 @@ def main():
     elapsed = time.time() - start_time
     print(f"  ✓ Classified {len(results)} issues in {elapsed:.1f} seconds")
     
-    # Add results to DataFrame
+    # Merge new results with reused ones
     print(f"\n[3/4] Adding classification columns...")
-    new_columns = ['Category', 'Summary', 'Sentiment', 'L1_Tag', 'L1_Category', 'L2_Tag', 'L2_Category', 'Confidence', 'Tagging_Notes']
-    for col in new_columns:
-        issues_df[col] = [r[col] for r in results]
+    rows = [results[idx] if idx in results else store.loc[number]
+            for idx, number in enumerate(issues_df['issue_number'])]
+    for col in RESULT_COLUMNS:
+        issues_df[col] = [r[col] for r in rows]
+
+    # Outputs must use the shared enums (Category, Sentiment, Confidence)
+    check_enums(issues_df)
     
     # Save
     print(f"\n[4/4] Saving results...")
-    issues_df.to_csv(args.output, index=False)
+    issues_df.to_csv(args.output, index=False, date_format=DATETIME_FORMAT)
     print(f"  ✓ Saved to: {args.output}")
     
+    if results:
+        fresh = pd.DataFrame(
+            [{'issue_number': int(issues_df['issue_number'].iloc[idx]), **r} for idx, r in results.items()]
+        ).set_index('issue_number')[STORE_KEY_COLUMNS[1:] + RESULT_COLUMNS]
+        store = pd.concat([store[~store.index.isin(fresh.index)], fresh])
+        store = store[~store.index.duplicated(keep='last')]
+        save_store(store, store_path)
+        print(f"  ✓ Updated store: {store_path} ({len(store)} issues)")
+    
     # Summary
     print("\n" + "=" * 80)
     print("SUMMARY")
     print("=" * 80)
     print(f"\nBy Category:")
-    for cat, count in issues_df['Category'].value_counts().items():
+    for cat, count in issues_df['Category'].value_counts().loc[lambda c: c > 0].items():
         print(f"  {cat:20} {count:4} ({count/len(issues_df)*100:5.1f}%)")
     
     print(f"\nBy Confidence:")
-    for conf, count in issues_df['Confidence'].value_counts().items():
+    for conf, count in issues_df['Confidence'].value_counts().loc[lambda c: c > 0].items():
         print(f"  {conf:20} {count:4} ({count/len(issues_df)*100:5.1f}%)")
     
     print(f"\n✓ Classification complete!")
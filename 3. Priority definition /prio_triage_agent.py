@@ -1,9 +1,15 @@
 import os
+import sys
 import csv
 import time
 from dotenv import load_dotenv
 import anthropic
 
+# Shared issue schema lives at the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from issue_schema import PRIORITIES
+from similar_issues import load_index
+
 # Load API key from .env file
 load_dotenv()
 
@@ -16,6 +22,9 @@ client = anthropic.Anthropic(
 INPUT_FILE = 'issues_to_triage.csv'
 OUTPUT_FILE = 'prioritized_issues.csv'
 MODEL_NAME = "claude-sonnet-4-5-20250929" 
+# Already-triaged issues; the most similar ones are shown in each prompt
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Claude_Code_Github_Categorized_ Issue_Tracker.csv')
+SIMILAR_ISSUES_K = 3
 
 # The System Prompt / Persona
 SYSTEM_PROMPT = """
@@ -42,7 +51,9 @@ Evaluate each issue based on the following Priority Logic:
 
 5. P4: Won't Do / Icebox
    - Definition: Items below the value line or not worth the setup time.
-   - Triggers: Vague requests, duplicates, or issues likely resolved implicitly by future architecture changes.
+   - Triggers: Vague requests, duplicates (an issue with "Near-Duplicate Of" set repeats an older report), or issues likely resolved implicitly by future architecture changes.
+
+Similar past issues are listed with the priority they were given. Stay consistent with them unless this issue clearly differs in impact.
 
 Task: Analyze the issue data provided and return the result in CSV format with three columns: issue_number, priority, and reasoning.
 
@@ -51,7 +62,37 @@ Constraint: Enclose the reasoning in double quotes. Do not output a header row.
 """
 
 
-def get_issue_analysis(row, max_retries=3):
+def load_history_index():
+    """Similar-issue index over HISTORY_FILE (None when there is no triage history yet)."""
+    if not os.path.exists(HISTORY_FILE):
+        print(f"Note: {HISTORY_FILE} not found; prompts will not include similar past issues.")
+        return None
+    return load_index(HISTORY_FILE)
+
+
+def similar_issues_context(index, row, k=SIMILAR_ISSUES_K):
+    """Prompt lines for the k most similar past issues: number, priority, category and title."""
+    if index is None:
+        return 'None available'
+
+    number = str(row.get('issue_number', ''))
+    if number.isdigit() and int(number) in index:
+        similar = index.similar(int(number), k)
+    else:
+        similar = index.similar_to_text(row.get('title', ''), row.get('body', ''), k)
+
+    def text(value):
+        return value if isinstance(value, str) and value else '-'
+
+    lines = [
+        f"- #{issue['issue_number']} (similarity {issue['similarity']:.2f}) "
+        f"{text(issue.get('Priority'))}, {text(issue.get('Category'))}: {text(issue.get('title'))[:100]}"
+        for issue in similar.to_dict('records')
+    ]
+    return '\n    '.join(lines) or 'None found'
+
+
+def get_issue_analysis(row, max_retries=3, similar='None available'):
     """Sends a single issue row to Claude for analysis with retry logic."""
 
     # Construct the user message based on the CSV row data
@@ -64,7 +105,10 @@ def get_issue_analysis(row, max_retries=3):
     Sentiment: {row.get('Sentiment', '')}
     Reactions: {row.get('reactions_total', 0)}
     Comments: {row.get('comments_count', 0)}
+    Near-Duplicate Of: {('#' + row['Duplicate_Of']) if row.get('Duplicate_Of') else 'None detected'}
     Description Snippet: {row.get('body', '')[:300]}
+    Similar Past Issues:
+    {similar}
     """
 
     for attempt in range(max_retries):
@@ -104,6 +148,7 @@ def main():
         return
 
     print(f"Starting triage process using {MODEL_NAME}...")
+    history_index = load_history_index()
     
     # Prepare output file
     with open(OUTPUT_FILE, mode='w', newline='', encoding='utf-8') as outfile:
@@ -121,7 +166,7 @@ def main():
                 print(f"Processing Issue #{row.get('issue_number')}...")
                 
                 # Get analysis from Claude
-                raw_response = get_issue_analysis(row)
+                raw_response = get_issue_analysis(row, similar=similar_issues_context(history_index, row))
                 
                 if raw_response:
                     # Parse the CSV string returned by Claude
@@ -133,7 +178,7 @@ def main():
                         if len(parsed_line) != 3:
                             print(f"Invalid response format for issue {row.get('issue_number')}: Expected 3 fields, got {len(parsed_line)}")
                             writer.writerow([row.get('issue_number'), "ERROR", f"Invalid format: {raw_response}"])
-                        elif parsed_line[1] not in ['P0', 'P1', 'P2', 'P3', 'P4']:
+                        elif parsed_line[1] not in PRIORITIES:
                             print(f"Invalid priority '{parsed_line[1]}' for issue {row.get('issue_number')}")
                             writer.writerow([row.get('issue_number'), "ERROR", f"Invalid priority: {raw_response}"])
                         else:
@@ -7,8 +7,35 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import os
 from datetime import datetime
 
+from chart_buckets import DEFAULT_TOP_SERIES, choose_bucket, fold_top_series
+from compact_loader import load_compact_tracker
+from issue_schema import HIGH_PRIORITIES, PRIORITIES
+from render_profiler import DEFAULT_LOG_FILE, RenderProfiler
+from query_backend import TRACKER_FILE, IssueFilters, PandasBackend, DuckDBBackend
+from shared_cache import DEFAULT_BUDGET_MB, CachedBackend, SharedQueryCache, dataset_version
+from similar_issues import load_index
+from taxonomy_matcher import load_matcher
+from trend_engine import TrendEngine
+
+# Query backend: "pandas" (in-memory CSV) or "duckdb" (Parquet/DuckDB file)
+DASHBOARD_BACKEND = os.environ.get('DASHBOARD_BACKEND', 'pandas')
+DASHBOARD_DATA = os.environ.get('DASHBOARD_DATA', 'issues.parquet')
+# Memory budget for the process-wide query cache shared by all sessions
+DASHBOARD_CACHE_MB = int(os.environ.get('DASHBOARD_CACHE_MB', DEFAULT_BUDGET_MB))
+# Render profiler: DASHBOARD_PROFILE=1 (or ?debug=1) shows timings and appends to the log
+DASHBOARD_PROFILE = os.environ.get('DASHBOARD_PROFILE', '0') == '1'
+DASHBOARD_PROFILE_LOG = os.environ.get('DASHBOARD_PROFILE_LOG', DEFAULT_LOG_FILE)
+# Taxonomy shown in the reference panel (compiled matcher artifact, rebuilt when the CSV changes)
+DASHBOARD_TAXONOMY = os.environ.get(
+    'DASHBOARD_TAXONOMY',
+    os.path.join('2. Raw data categorization and enrich', 'issue_categorization_toolkit', 'data', 'taxonomy_l1_l2_EXAMPLE.csv')
+)
+# Issue Explorer rows fetched per page (the full filtered set is only loaded for the CSV export)
+EXPLORER_PAGE_SIZE = 500
+
 # Page config
 st.set_page_config(
     page_title="Claude Code Issues Analysis",
@@ -16,35 +43,96 @@ st.set_page_config(
     layout="wide"
 )
 
+profiler = RenderProfiler(
+    enabled=DASHBOARD_PROFILE or st.query_params.get('debug') == '1',
+    log_file=DASHBOARD_PROFILE_LOG
+)
+
 # Title
 st.title("📊 Claude Code Issues Analysis")
 st.markdown("**Product Operations Dashboard** | GitHub Issues Backlog Analysis")
 st.markdown("---")
 
 # Load data
-@st.cache_data
-def load_data():
-    """Load the enriched issues CSV"""
+# One version at a time: a refresh drops the old one (and its open files)
+@st.cache_resource(max_entries=1)
+def load_data(version):
+    """Load the enriched issues CSV in compact form (bodies memory-mapped); reloads when version changes"""
     try:
-        df = pd.read_csv('Claude_Code_Github_Categorized_ Issue_Tracker.csv', header=1)
-        # Convert date columns
-        df['created_at'] = pd.to_datetime(df['created_at'])
-        df['updated_at'] = pd.to_datetime(df['updated_at'])
-        return df
+        return load_compact_tracker(TRACKER_FILE)
     except FileNotFoundError:
         st.error("❌ Claude_Code_Github_Categorized_ Issue_Tracker.csv not found. Please run the extraction and enrichment process first.")
         return None
 
-df = load_data()
+@st.cache_resource
+def load_duckdb_backend(source):
+    """Open the DuckDB backend once per process (shared by all sessions)"""
+    try:
+        return DuckDBBackend(source)
+    except (ImportError, FileNotFoundError) as e:
+        st.error(f"❌ DuckDB backend unavailable ({e}). Export the tracker first: `python query_backend.py {source}`")
+        return None
+
+@st.cache_resource(max_entries=1)
+def load_taxonomy(version):
+    """Load the compiled taxonomy matcher once per taxonomy version (None if the CSV is missing)"""
+    if version is None:
+        return None
+    return load_matcher(DASHBOARD_TAXONOMY)
+
+@st.cache_resource(max_entries=1)
+def load_similar_index(version):
+    """Load the similar-issue index over the tracker once per tracker version (built/updated on first use)"""
+    if version is None:
+        return None
+    try:
+        return load_index(TRACKER_FILE)
+    except ImportError as e:
+        st.info(f"Similar-issue lookup unavailable ({e})")
+        return None
 
-if df is not None:
+@st.cache_resource
+def get_trend_engine():
+    """One incremental trend engine for the whole process (fed new issues as the data changes)"""
+    return TrendEngine()
+
+@st.cache_resource
+def get_query_cache():
+    """One filter -> aggregate cache for the whole process (all sessions)"""
+    return SharedQueryCache(max_bytes=DASHBOARD_CACHE_MB * 1024 * 1024)
+
+def get_backend():
+    """
+    Pick the query backend from DASHBOARD_BACKEND (pandas | duckdb),
+    wrapped in the shared query cache
+
+    Returns:
+        Tuple of (backend or None, body store or None)
+    """
+    if DASHBOARD_BACKEND == 'duckdb':
+        version = dataset_version(DASHBOARD_DATA)
+        backend, body_store = load_duckdb_backend(DASHBOARD_DATA), None
+    else:
+        version = dataset_version(TRACKER_FILE)
+        loaded = load_data(version)
+        if loaded is None:
+            return None, None
+        df, body_store = loaded
+        backend = PandasBackend(df)
+    if backend is None:
+        return None, None
+    return CachedBackend(backend, get_query_cache(), version), body_store
+
+backend, body_store = get_backend()
+profiler.lap('load', 'data')
+
+if backend is not None:
 
     # Date Range and Filters Section
     st.subheader("📅 Data Overview & Filters")
 
     # Show date range
-    min_date = df['created_at'].min()
-    max_date = df['created_at'].max()
+    min_date, max_date = backend.date_bounds()
     col_date1, col_date2, col_date3 = st.columns(3)
 
     with col_date1:
@@ -82,99 +170,108 @@ if df is not None:
     with filter_col1:
         category_filter = st.multiselect(
             "Category",
-            options=sorted(df['Category'].unique()),
+            options=backend.distinct('Category'),
             default=[]
         )
 
     with filter_col2:
         priority_filter = st.multiselect(
             "Priority",
-            options=['P0', 'P1', 'P2', 'P3', 'P4'],
+            options=PRIORITIES,
             default=[]
         )
 
     with filter_col3:
         l1_filter = st.multiselect(
             "L1 Category",
-            options=sorted(df['L1_Category'].dropna().unique()),
+            options=backend.distinct('L1_Category'),
             default=[]
         )
 
     with filter_col4:
         l2_filter = st.multiselect(
             "L2 Category",
-            options=sorted(df['L2_Category'].dropna().unique()),
+            options=backend.distinct('L2_Category'),
             default=[]
         )
 
     # Apply all filters
-    filtered_df = df[
-        (df['created_at'].dt.date >= start_date) &
-        (df['created_at'].dt.date <= end_date)
-    ].copy()
-
-    if category_filter:
-        filtered_df = filtered_df[filtered_df['Category'].isin(category_filter)]
-    if priority_filter:
-        filtered_df = filtered_df[filtered_df['Priority'].isin(priority_filter)]
-    if l1_filter:
-        filtered_df = filtered_df[filtered_df['L1_Category'].isin(l1_filter)]
-    if l2_filter:
-        filtered_df = filtered_df[filtered_df['L2_Category'].isin(l2_filter)]
+    filters = IssueFilters(
+        start_date=start_date,
+        end_date=end_date,
+        categories=tuple(category_filter),
+        priorities=tuple(priority_filter),
+        l1_categories=tuple(l1_filter),
+        l2_categories=tuple(l2_filter),
+    )
+    profiler.lap('filters', 'render')
 
     st.markdown("---")
 
     # Key Metrics Row
     col1, col2, col3, col4 = st.columns(4)
 
+    metrics = backend.metrics(filters)
+    profiler.lap('metrics', 'data')
+
     with col1:
-        st.metric("Total Issues", len(filtered_df))
+        st.metric("Total Issues", metrics['total'])
 
     with col2:
-        high_priority = len(filtered_df[filtered_df['Priority'].isin(['P0', 'P1'])])
-        st.metric("P0/P1 Priority", high_priority)
+        st.metric("/".join(HIGH_PRIORITIES) + " Priority", metrics['high_priority'])
 
     with col3:
-        negative = len(filtered_df[filtered_df['Sentiment'] == 'Negative'])
-        st.metric("Negative Sentiment", negative)
+        st.metric("Negative Sentiment", metrics['negative'])
 
     with col4:
-        avg_comments = filtered_df['comments_count'].mean()
-        st.metric("Avg Comments", f"{avg_comments:.1f}")
+        st.metric("Avg Comments", f"{metrics['avg_comments']:.1f}")
+    profiler.lap('metrics', 'render')
 
     st.markdown("---")
 
+    # Timeline bucket: finest of day/week/month/... that keeps every figure
+    # within the point budget (series beyond the top N fold into "Other")
+    bucket, bucket_label = choose_bucket(start_date, end_date, n_series=DEFAULT_TOP_SERIES + 1)
+    st.caption(f"Timelines bucketed by {bucket_label.lower()}")
+
     # Main Charts: Issues by Category Over Time & Priority Distribution Over Time
     col_left, col_right = st.columns(2)
 
     with col_left:
         st.subheader("📂 Issues by Category Over Time")
 
-        # Group by week and category
-        filtered_df['week'] = filtered_df['created_at'].dt.to_period('W').dt.start_time
-        category_timeline = filtered_df.groupby(['week', 'Category']).size().reset_index(name='count')
+        # Group by time bucket and category
+        category_timeline = fold_top_series(backend.timeline_counts(filters, 'Category', bucket), 'Category')
+        profiler.lap('category_timeline', 'data')
 
         fig1 = px.area(
             category_timeline,
-            x='week',
+            x='period',
             y='count',
             color='Category',
-            labels={'week': 'Week', 'count': 'Number of Issues'},
+            labels={'period': bucket_label, 'count': 'Number of Issues'},
             title='Issue Volume by Category'
         )
         fig1.update_layout(height=400, hovermode='x unified')
+        profiler.lap('category_timeline', 'chart')
+        profiler.payload('category_timeline', fig1)
         st.plotly_chart(fig1, use_container_width=True)
+        profiler.lap('category_timeline', 'render')
 
         # Show total count by category
-        category_totals = filtered_df['Category'].value_counts().reset_index()
+        category_totals = backend.value_counts(filters, 'Category').reset_index()
         category_totals.columns = ['Category', 'Total Issues']
+        profiler.lap('category_timeline', 'data')
+        profiler.payload('category_timeline', category_totals)
         st.dataframe(category_totals, use_container_width=True, hide_index=True)
+        profiler.lap('category_timeline', 'render')
 
     with col_right:
         st.subheader("🎯 Priority Distribution Over Time")
 
-        # Group by week and priority
-        priority_timeline = filtered_df.groupby(['week', 'Priority']).size().reset_index(name='count')
+        # Group by time bucket and priority
+        priority_timeline = backend.timeline_counts(filters, 'Priority', bucket)
+        profiler.lap('priority_timeline', 'data')
 
         # Custom color mapping
         priority_colors = {
@@ -187,21 +284,27 @@ if df is not None:
 
         fig2 = px.area(
             priority_timeline,
-            x='week',
+            x='period',
             y='count',
             color='Priority',
             color_discrete_map=priority_colors,
-            labels={'week': 'Week', 'count': 'Number of Issues'},
+            labels={'period': bucket_label, 'count': 'Number of Issues'},
             title='Priority Distribution',
-            category_orders={'Priority': ['P0', 'P1', 'P2', 'P3', 'P4']}
+            category_orders={'Priority': PRIORITIES}
         )
         fig2.update_layout(height=400, hovermode='x unified')
+        profiler.lap('priority_timeline', 'chart')
+        profiler.payload('priority_timeline', fig2)
         st.plotly_chart(fig2, use_container_width=True)
+        profiler.lap('priority_timeline', 'render')
 
         # Show total count by priority
-        priority_totals = filtered_df['Priority'].value_counts().reindex(['P0', 'P1', 'P2', 'P3', 'P4'], fill_value=0).reset_index()
+        priority_totals = backend.value_counts(filters, 'Priority').reindex(PRIORITIES, fill_value=0).reset_index()
         priority_totals.columns = ['Priority', 'Total Issues']
+        profiler.lap('priority_timeline', 'data')
+        profiler.payload('priority_timeline', priority_totals)
         st.dataframe(priority_totals, use_container_width=True, hide_index=True)
+        profiler.lap('priority_timeline', 'render')
 
     st.markdown("---")
 
@@ -210,8 +313,9 @@ if df is not None:
 
     with col_l1:
         st.subheader("🏷️ Top 10 L1 Categories")
-        l1_counts = filtered_df['L1_Category'].value_counts().head(10).reset_index()
+        l1_counts = backend.value_counts(filters, 'L1_Category', limit=10).reset_index()
         l1_counts.columns = ['L1 Category', 'Count']
+        profiler.lap('l1_l2_bars', 'data')
 
         fig3 = px.bar(
             l1_counts,
@@ -224,14 +328,17 @@ if df is not None:
         )
         fig3.update_traces(textposition='outside')
         fig3.update_layout(showlegend=False, height=400, yaxis={'categoryorder':'total ascending'})
+        profiler.lap('l1_l2_bars', 'chart')
+        profiler.payload('l1_l2_bars', fig3)
         st.plotly_chart(fig3, use_container_width=True)
+        profiler.lap('l1_l2_bars', 'render')
 
     with col_l2:
         st.subheader("🏷️ Top 10 L2 Categories")
         # Filter out "Other" and get top 10
-        l2_filtered = filtered_df[filtered_df['L2_Category'] != 'Other']
-        l2_counts = l2_filtered['L2_Category'].value_counts().head(10).reset_index()
+        l2_counts = backend.value_counts(filters, 'L2_Category', limit=10, exclude='Other').reset_index()
         l2_counts.columns = ['L2 Category', 'Count']
+        profiler.lap('l1_l2_bars', 'data')
 
         fig4 = px.bar(
             l2_counts,
@@ -244,15 +351,64 @@ if df is not None:
         )
         fig4.update_traces(textposition='outside')
         fig4.update_layout(showlegend=False, height=400, yaxis={'categoryorder':'total ascending'})
+        profiler.lap('l1_l2_bars', 'chart')
+        profiler.payload('l1_l2_bars', fig4)
         st.plotly_chart(fig4, use_container_width=True)
+        profiler.lap('l1_l2_bars', 'render')
+
+    # Taxonomy reference: L1/L2 codes, names and descriptions from the compiled matcher
+    taxonomy = load_taxonomy(dataset_version(DASHBOARD_TAXONOMY))
+    if taxonomy is not None:
+        with st.expander("📚 Taxonomy Reference"):
+            taxonomy_rows = [
+                {
+                    'L1 Tag': l1_code,
+                    'L1 Category': l1_info['category'],
+                    'L2 Tag': option['code'],
+                    'L2 Category': option['subcategory'],
+                    'Description': option['description'],
+                    'Keywords': ', '.join(option['keywords']),
+                }
+                for l1_code, l1_info in taxonomy.taxonomy_lookup.items()
+                for option in l1_info['l2_options']
+            ]
+            st.dataframe(pd.DataFrame(taxonomy_rows), use_container_width=True, hide_index=True)
+
+    # Emerging themes: EWMA burst scores per L2 category and label (whole dataset, newest week)
+    st.subheader("🚀 Emerging Themes")
+    trend_engine = get_trend_engine()
+    # New issues only, unless rows already counted were edited or deleted (then a full recount)
+    trend_engine.sync(backend)
+    emerging_df = trend_engine.emerging(10)
+    profiler.lap('trends', 'data')
+    if len(emerging_df) > 0:
+        st.dataframe(
+            emerging_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "dimension": "Theme Type",
+                "theme": "Theme",
+                "period": st.column_config.DateColumn("Week Of"),
+                "count": "Issues",
+                "expected": st.column_config.NumberColumn("Expected", format="%.1f"),
+                "z": st.column_config.NumberColumn("Burst Score", format="%.1f"),
+                "trend": st.column_config.LineChartColumn("Weekly Trend")
+            }
+        )
+        st.caption("Scored over all issues (not the filters above): issues in the newest week vs. the weighted average of earlier weeks.")
+    else:
+        st.caption("No theme has enough issues in the newest week yet.")
+    profiler.lap('trends', 'render')
 
     st.markdown("---")
 
     # Sentiment Analysis Over Time
     st.subheader("😊 User Sentiment Over Time")
 
-    # Group by week and sentiment
-    sentiment_timeline = filtered_df.groupby(['week', 'Sentiment']).size().reset_index(name='count')
+    # Group by time bucket and sentiment
+    sentiment_timeline = backend.timeline_counts(filters, 'Sentiment', bucket)
+    profiler.lap('sentiment', 'data')
 
     sentiment_colors = {
         'Positive': '#4CAF50',
@@ -262,56 +418,74 @@ if df is not None:
 
     fig5 = px.line(
         sentiment_timeline,
-        x='week',
+        x='period',
         y='count',
         color='Sentiment',
         color_discrete_map=sentiment_colors,
         markers=True,
-        labels={'week': 'Week', 'count': 'Number of Issues'},
+        labels={'period': bucket_label, 'count': 'Number of Issues'},
         title='Sentiment Trends'
     )
     fig5.update_layout(height=350, hovermode='x unified')
+    profiler.lap('sentiment', 'chart')
+    profiler.payload('sentiment', fig5)
     st.plotly_chart(fig5, use_container_width=True)
+    profiler.lap('sentiment', 'render')
 
     # Sentiment breakdown stats
     col_sent1, col_sent2, col_sent3 = st.columns(3)
-    sentiment_counts = filtered_df['Sentiment'].value_counts()
+    sentiment_counts = backend.value_counts(filters, 'Sentiment')
+    profiler.lap('sentiment', 'data')
 
     with col_sent1:
         if 'Negative' in sentiment_counts.index:
             count = sentiment_counts['Negative']
-            pct = (count / len(filtered_df)) * 100
+            pct = (count / metrics['total']) * 100
             st.metric("😤 Negative", f"{count} ({pct:.1f}%)")
 
     with col_sent2:
         if 'Neutral' in sentiment_counts.index:
             count = sentiment_counts['Neutral']
-            pct = (count / len(filtered_df)) * 100
+            pct = (count / metrics['total']) * 100
             st.metric("😐 Neutral", f"{count} ({pct:.1f}%)")
 
     with col_sent3:
         if 'Positive' in sentiment_counts.index:
             count = sentiment_counts['Positive']
-            pct = (count / len(filtered_df)) * 100
+            pct = (count / metrics['total']) * 100
             st.metric("😊 Positive", f"{count} ({pct:.1f}%)")
+    profiler.lap('sentiment', 'render')
 
     st.markdown("---")
 
     # Issue Explorer Section
     st.subheader("🔍 Issue Explorer")
 
-    st.markdown(f"**Showing {len(filtered_df)} issues** (filtered by criteria above)")
-
-    # Display filtered issues
+    # Display filtered issues, one page at a time
     display_cols = [
         'issue_number', 'title', 'Category', 'Priority',
         'Sentiment', 'Summary', 'L1_Tag', 'L1_Category',
         'L2_Tag', 'L2_Category', 'Confidence', 'Tagging_Notes',
         'Prio Reasoning', 'comments_count', 'created_at', 'html_url'
     ]
-
+    page_count = max(1, -(-metrics['total'] // EXPLORER_PAGE_SIZE))
+    page_number = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1) if page_count > 1 else 1
+    offset = (page_number - 1) * EXPLORER_PAGE_SIZE
+    # Duplicate_Of is present once near_duplicates.py has been run on the tracker
+    page_df = backend.page(filters, display_cols + ['Duplicate_Of'], EXPLORER_PAGE_SIZE, offset)
+    profiler.lap('explorer', 'data')
+    st.markdown(f"**Showing {offset + 1 if len(page_df) else 0}–{offset + len(page_df)} of {metrics['total']} issues** "
+                f"(filtered by criteria above, newest first)")
+
+    if 'Duplicate_Of' in page_df.columns:
+        display_cols.insert(display_cols.index('Priority') + 1, 'Duplicate_Of')
+        duplicate_count = int(page_df['Duplicate_Of'].notna().sum())
+        if duplicate_count:
+            st.caption(f"♊ {duplicate_count} issues on this page are near-duplicates of an older issue (see Duplicate Of)")
+
+    profiler.payload('explorer', page_df[display_cols])
     st.dataframe(
-        filtered_df[display_cols],
+        page_df[display_cols],
         use_container_width=True,
         height=400,
         column_config={
@@ -320,6 +494,7 @@ if df is not None:
             "title": "Title",
             "Category": "Category",
             "Priority": "Priority",
+            "Duplicate_Of": st.column_config.NumberColumn("Duplicate Of", format="%d"),
             "Sentiment": "Sentiment",
             "Summary": "Summary",
             "L1_Tag": "L1 Tag",
@@ -334,21 +509,70 @@ if df is not None:
         }
     )
 
-    # Export filtered data
-    if len(filtered_df) > 0:
+    profiler.lap('explorer', 'render')
+
+    # Export filtered data: every matching row with bodies, built only when the button is clicked
+    def export_csv():
+        export_df = backend.filtered(filters)
+        if body_store is not None:
+            export_df = body_store.attach(export_df)
+        return export_df.to_csv(index=False).encode('utf-8')
+
+    if metrics['total'] > 0:
         st.download_button(
             label="📥 Download Filtered Data (CSV)",
-            data=filtered_df.to_csv(index=False).encode('utf-8'),
+            data=export_csv,
             file_name=f"filtered_issues_{datetime.now().strftime('%Y%m%d')}.csv",
             mime="text/csv"
         )
+        profiler.lap('explorer', 'render')
+
+    # Similar issues: nearest neighbours by title + body, with the priority and category they were given
+    # Expander bodies run on every rerun, collapsed or not, so the index is loaded (and built
+    # or synced if the tracker changed) only once the lookup is switched on
+    with st.expander("🧭 Similar Issues"):
+        lookup = st.toggle("Find similar issues", key='similar_lookup')
+        if lookup:
+            with st.spinner("Loading similar-issue index..."):
+                similar_index = load_similar_index(dataset_version(TRACKER_FILE))
+            profiler.lap('similar', 'data')
+        if not lookup:
+            st.caption("Switch on to load the similar-issue index (prebuilt by the pipeline's dashboard_index stage).")
+        elif similar_index is None:
+            st.caption(f"Needs {TRACKER_FILE} (the index is built from its titles and bodies).")
+        elif len(page_df) > 0:
+            selected_issue = st.number_input(
+                "Issue #", value=int(page_df['issue_number'].iloc[0]), step=1, format="%d"
+            )
+            if selected_issue in similar_index:
+                similar_df = similar_index.similar(selected_issue, k=10)
+                profiler.lap('similar', 'data')
+                st.dataframe(
+                    similar_df,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "html_url": st.column_config.LinkColumn("GitHub Link"),
+                        "issue_number": "Issue #",
+                        "similarity": st.column_config.ProgressColumn("Similarity", min_value=0.0, max_value=1.0, format="%.2f"),
+                        "title": "Title",
+                        "L1_Tag": "L1 Tag",
+                        "L2_Tag": "L2 Tag"
+                    }
+                )
+            else:
+                st.caption(f"#{selected_issue} is not in the index.")
+        profiler.lap('similar', 'render')
 
     # Most Discussed Issues
     st.markdown("---")
     st.subheader("💬 Most Discussed Issues")
-    top_discussed = filtered_df.nlargest(10, 'comments_count')[
-        ['issue_number', 'title', 'Category', 'Priority', 'comments_count', 'html_url']
-    ]
+    top_discussed = backend.most_discussed(
+        filters, 10,
+        columns=['issue_number', 'title', 'Category', 'Priority', 'comments_count', 'html_url']
+    )
+    profiler.lap('most_discussed', 'data')
+    profiler.payload('most_discussed', top_discussed)
     st.dataframe(
         top_discussed,
         use_container_width=True,
@@ -359,6 +583,23 @@ if df is not None:
         },
         hide_index=True
     )
+    profiler.lap('most_discussed', 'render')
+
+    # Shared cache stats (process-wide, across all dashboard sessions)
+    with st.expander("⚙️ Query Cache"):
+        cache_stats = get_query_cache().stats()
+        cache_col1, cache_col2, cache_col3, cache_col4 = st.columns(4)
+        cache_col1.metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+        cache_col2.metric("Entries", cache_stats['entries'])
+        cache_col3.metric("Memory", f"{cache_stats['bytes'] / 2**20:.1f} / {cache_stats['max_bytes'] / 2**20:.0f} MB")
+        cache_col4.metric("Evictions", cache_stats['evictions'])
+
+    # Render profile (debug panel): per-section data prep / chart / render time
+    if profiler.enabled:
+        profiler.write_log(backend=backend.name, rows=metrics['total'], bucket=bucket)
+        with st.expander("⏱️ Render Profile", expanded=True):
+            st.caption(f"Rerun total: {profiler.total_ms():.0f} ms · appended to `{profiler.log_file}`")
+            st.dataframe(profiler.summary(), use_container_width=True, hide_index=True)
 
 else:
     st.info("""
@@ -0,0 +1,64 @@
+"""
+Chart Time Bucketing
+Keeps timeline figures bounded: adaptive bucket size and top-N series folding
+"""
+
+import pandas as pd
+
+# Bucket sizes from finest to coarsest: (code, label, approx. days per bucket)
+BUCKETS = [
+    ('D', 'Day', 1),
+    ('W', 'Week', 7),
+    ('M', 'Month', 30.44),
+    ('Q', 'Quarter', 91.31),
+    ('Y', 'Year', 365.25),
+]
+
+DEFAULT_POINT_BUDGET = 600
+DEFAULT_TOP_SERIES = 8
+OTHER_LABEL = 'Other'
+
+
+def choose_bucket(start_date, end_date, n_series=1, point_budget=DEFAULT_POINT_BUDGET):
+    """
+    Pick the finest time bucket whose chart stays within the point budget
+
+    Args:
+        start_date: First day of the selected range
+        end_date: Last day of the selected range
+        n_series: Number of series (colors) that will be plotted
+        point_budget: Maximum number of (bucket, series) points per figure
+
+    Returns:
+        Tuple of (bucket code, bucket label), e.g. ('W', 'Week')
+    """
+    days = max((pd.Timestamp(end_date) - pd.Timestamp(start_date)).days + 1, 1)
+    for code, label, bucket_days in BUCKETS:
+        n_buckets = days / bucket_days + 1
+        if n_buckets * max(n_series, 1) <= point_budget:
+            return code, label
+    code, label, _ = BUCKETS[-1]
+    return code, label
+
+
+def fold_top_series(timeline, column, top_n=DEFAULT_TOP_SERIES, other_label=OTHER_LABEL):
+    """
+    Keep the top_n series by total count and fold the rest into one series
+
+    Args:
+        timeline: DataFrame with 'period', column and 'count'
+        column: Series column (e.g. 'Category', 'L2_Category')
+        top_n: Number of series to keep as-is
+        other_label: Name of the folded series
+
+    Returns:
+        DataFrame with the same columns and at most top_n + 1 series
+    """
+    totals = timeline.groupby(column)['count'].sum().sort_values(ascending=False)
+    if len(totals) <= top_n:
+        return timeline
+
+    keep = set(totals.index[:top_n])
+    folded = timeline.copy()
+    folded[column] = folded[column].where(folded[column].isin(keep), other_label)
+    return folded.groupby(['period', column], as_index=False)['count'].sum()
@@ -0,0 +1,195 @@
+"""
+Compact Tracker Loader
+Loads the enriched tracker with categorical/downcast dtypes and keeps issue
+bodies out of the DataFrame in a memory-mapped side store
+"""
+
+import mmap
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from issue_schema import ENUMS, apply_schema, header_row
+
+TRACKER_FILE = 'Claude_Code_Github_Categorized_ Issue_Tracker.csv'
+CACHE_DIR = '.cache'
+
+# Low-cardinality strings repeated across rows -> pandas categoricals
+# (enum columns additionally get their declared values from issue_schema)
+CATEGORICAL_COLUMNS = [
+    'state', 'state_reason', 'labels', 'author', 'author_association',
+    'assignees', 'milestone', 'closed_by',
+    'L1_Tag', 'L1_Category', 'L2_Tag', 'L2_Category',
+] + list(ENUMS)
+
+# Small non-negative counters -> smallest unsigned integer dtype that fits
+COUNTER_COLUMNS = [
+    'comments_count', 'reactions_total', 'reactions_plus1', 'reactions_minus1',
+    'reactions_heart', 'reactions_hooray', 'reactions_rocket', 'reactions_eyes',
+]
+
+# Large free text kept out of the frame and fetched lazily by issue_number
+BODY_COLUMN = 'body'
+
+
+class BodyStore:
+    """
+    Read-only, memory-mapped issue bodies keyed by issue_number
+
+    Layout: <name>.body.bin holds the UTF-8 bodies back to back and
+    <name>.body.npz holds sorted issue numbers with byte offsets, plus the
+    size/mtime of the CSV the store was built from.
+    """
+
+    def __init__(self, bin_path, index_path):
+        with np.load(index_path) as index:
+            self.issue_numbers = index['issue_number']
+            self.offsets = index['offset']
+        self._file = open(bin_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    def get(self, issue_number, default=''):
+        """Return the body for one issue (default if unknown)"""
+        pos = np.searchsorted(self.issue_numbers, issue_number)
+        if pos >= len(self.issue_numbers) or self.issue_numbers[pos] != issue_number:
+            return default
+        start, end = self.offsets[pos], self.offsets[pos + 1]
+        return self._data[start:end].decode('utf-8')
+
+    def get_many(self, issue_numbers):
+        """Return a list of bodies aligned with issue_numbers"""
+        return [self.get(n) for n in issue_numbers]
+
+    def attach(self, df):
+        """Return a copy of df with the body column filled back in after title"""
+        df = df.copy()
+        position = df.columns.get_loc('title') + 1 if 'title' in df.columns else len(df.columns)
+        df.insert(position, BODY_COLUMN, self.get_many(df['issue_number'].tolist()))
+        return df
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+
+def _store_paths(filename, cache_dir):
+    stem = os.path.basename(filename).rsplit('.', 1)[0].replace(' ', '_')
+    base = os.path.join(cache_dir, stem)
+    return base + '.body.bin', base + '.body.npz'
+
+
+def _source_signature(filename):
+    stat = os.stat(filename)
+    return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+
+def _store_is_fresh(filename, bin_path, index_path):
+    if not (os.path.exists(bin_path) and os.path.exists(index_path)):
+        return False
+    with np.load(index_path) as index:
+        return np.array_equal(index['source'], _source_signature(filename))
+
+
+def build_body_store(filename, issue_numbers, bodies, cache_dir=CACHE_DIR):
+    """
+    Write the body side store for a tracker CSV
+
+    Args:
+        filename: Source CSV (its size/mtime is recorded for staleness checks)
+        issue_numbers: Issue numbers, aligned with bodies
+        bodies: Body strings (NaN is stored as empty)
+        cache_dir: Directory for the store files
+
+    Returns:
+        Tuple of (bin path, index path)
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    bin_path, index_path = _store_paths(filename, cache_dir)
+
+    order = np.argsort(np.asarray(issue_numbers, dtype=np.int64), kind='stable')
+    numbers = np.asarray(issue_numbers, dtype=np.int64)[order]
+    offsets = np.zeros(len(numbers) + 1, dtype=np.int64)
+
+    with open(bin_path, 'wb') as f:
+        for i, idx in enumerate(order):
+            body = bodies[idx]
+            encoded = body.encode('utf-8') if isinstance(body, str) else b''
+            f.write(encoded)
+            offsets[i + 1] = offsets[i] + len(encoded)
+
+    np.savez(index_path, issue_number=numbers, offset=offsets, source=_source_signature(filename))
+    return bin_path, index_path
+
+
+def load_compact_tracker(filename=TRACKER_FILE, cache_dir=CACHE_DIR):
+    """
+    Load the enriched tracker CSV in compact form
+
+    Args:
+        filename: Path to the tracker CSV (two header rows)
+        cache_dir: Directory for the memory-mapped body store
+
+    Returns:
+        Tuple of (DataFrame without the body column, BodyStore)
+    """
+    bin_path, index_path = _store_paths(filename, cache_dir)
+    fresh = _store_is_fresh(filename, bin_path, index_path)
+
+    header = header_row(filename)
+    columns = pd.read_csv(filename, header=header, nrows=0).columns
+    dtypes = {col: 'category' for col in CATEGORICAL_COLUMNS if col in columns}
+    usecols = [col for col in columns if col != BODY_COLUMN] if fresh else None
+
+    df = pd.read_csv(filename, header=header, usecols=usecols, dtype=dtypes)
+
+    if not fresh:
+        build_body_store(filename, df['issue_number'].to_numpy(), df[BODY_COLUMN].tolist(), cache_dir)
+    if BODY_COLUMN in df.columns:
+        df = df.drop(columns=[BODY_COLUMN])
+
+    # Schema types: datetimes, numeric counters, enums with declared values
+    df, invalid = apply_schema(df)
+    for col, values in invalid.items():
+        print(f"⚠ {col}: values outside the schema: {', '.join(values)}")
+
+    for col in COUNTER_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], downcast='unsigned')
+    df['issue_number'] = pd.to_numeric(df['issue_number'], downcast='unsigned')
+
+    return df, BodyStore(bin_path, index_path)
+
+
+def memory_report(filename=TRACKER_FILE):
+    """
+    Print the in-memory footprint of the plain vs compact tracker
+
+    Returns:
+        Tuple of (plain bytes, compact bytes)
+    """
+    plain = pd.read_csv(filename, header=header_row(filename))
+    plain['created_at'] = pd.to_datetime(plain['created_at'])
+    plain['updated_at'] = pd.to_datetime(plain['updated_at'])
+    plain_bytes = plain.memory_usage(deep=True).sum()
+
+    compact, store = load_compact_tracker(filename)
+    compact_bytes = compact.memory_usage(deep=True).sum()
+    store.close()
+
+    print(f"\n{'='*60}")
+    print("TRACKER MEMORY FOOTPRINT")
+    print(f"{'='*60}\n")
+    print(f"  Rows: {len(plain)}")
+    print(f"  Plain load:   {plain_bytes / 1e6:8.2f} MB")
+    print(f"  Compact load: {compact_bytes / 1e6:8.2f} MB  (body memory-mapped from {CACHE_DIR}/)")
+    print(f"  Reduction:    {plain_bytes / compact_bytes:8.1f}x")
+    print(f"\n{'='*60}\n")
+    return plain_bytes, compact_bytes
+
+
+if __name__ == "__main__":
+    memory_report(sys.argv[1] if len(sys.argv) > 1 else TRACKER_FILE)
@@ -0,0 +1,319 @@
+"""
+Issue Dataset Schema
+Single source of truth for issue columns, dtypes and enum values, shared by
+the classifier, triage agent, validator and dashboard
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# ENUMS
+# ============================================================================
+
+CATEGORIES = [
+    'Bug', 'Feature Request', 'Documentation',
+    'UX/UI', 'Performance', 'Installation/Setup', 'Integration'
+]
+PRIORITIES = ['P0', 'P1', 'P2', 'P3', 'P4']
+HIGH_PRIORITIES = ['P0', 'P1']
+SENTIMENTS = ['Positive', 'Neutral', 'Negative']
+CONFIDENCE_LEVELS = ['High', 'Medium', 'Low']
+
+ENUMS = {
+    'Category': CATEGORIES,
+    'Priority': PRIORITIES,
+    'Sentiment': SENTIMENTS,
+    'Confidence': CONFIDENCE_LEVELS,
+}
+
+# Enums with a meaningful order (P0 < P1 < ... when sorting)
+ORDERED_ENUMS = {'Priority'}
+
+# ============================================================================
+# COLUMNS
+# ============================================================================
+
+# Column -> logical type: int, bool, datetime, string, category (free-form
+# but low-cardinality) or enum (one of ENUMS)
+RAW_COLUMNS = {
+    'issue_number': 'int',
+    'title': 'string',
+    'body': 'string',
+    'html_url': 'string',
+    'state': 'category',
+    'state_reason': 'category',
+    'created_at': 'datetime',
+    'updated_at': 'datetime',
+    'closed_at': 'datetime',
+    'comments_count': 'int',
+    'labels': 'string',
+    'author': 'string',
+    'author_association': 'category',
+    'assignees': 'string',
+    'milestone': 'string',
+    'is_pull_request': 'bool',
+    'locked': 'bool',
+    'closed_by': 'string',
+    'reactions_total': 'int',
+    'reactions_plus1': 'int',
+    'reactions_minus1': 'int',
+    'reactions_heart': 'int',
+    'reactions_hooray': 'int',
+    'reactions_rocket': 'int',
+    'reactions_eyes': 'int',
+}
+
+ENRICHED_COLUMNS = {
+    'Category': 'enum',
+    'Summary': 'string',
+    'Sentiment': 'enum',
+    'L1_Tag': 'category',
+    'L1_Category': 'category',
+    'L2_Tag': 'category',
+    'L2_Category': 'category',
+    'Confidence': 'enum',
+    'Tagging_Notes': 'string',
+}
+
+TRIAGE_COLUMNS = {
+    'Priority': 'enum',
+    'Prio Reasoning': 'string',
+}
+
+# Written by near_duplicates.py: issue_number of the canonical issue
+DUPLICATE_COLUMNS = {
+    'Duplicate_Of': 'int',
+}
+
+COLUMN_TYPES = {**RAW_COLUMNS, **ENRICHED_COLUMNS, **TRIAGE_COLUMNS, **DUPLICATE_COLUMNS}
+
+# Columns each stage must provide
+REQUIRED_COLUMNS = {
+    'raw': ['issue_number', 'title', 'body', 'html_url', 'created_at', 'comments_count'],
+    'classified': ['Category', 'Summary', 'Sentiment', 'L1_Tag', 'L2_Tag'],
+    'enriched': ['Category', 'Priority', 'Summary', 'Sentiment'],
+}
+
+# Older exports (Golden Prompt workflow) used different names
+COLUMN_ALIASES = {'body_preview': 'body'}
+
+# Datetimes are written back as GitHub API timestamps (UTC), e.g. 2025-12-16T20:47:17Z
+DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+class SchemaError(ValueError):
+    """Raised when a dataset does not match the issue schema"""
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def enum_dtype(column, extra_values=()):
+    """
+    Return the categorical dtype for an enum column
+
+    Args:
+        column: Enum column name (key of ENUMS)
+        extra_values: Unexpected values to keep as trailing categories
+
+    Returns:
+        pd.CategoricalDtype with the declared values first
+    """
+    categories = list(ENUMS[column]) + [v for v in extra_values if v not in ENUMS[column]]
+    return pd.CategoricalDtype(categories, ordered=column in ORDERED_ENUMS)
+
+
+def invalid_enum_mask(series, column):
+    """
+    Vectorized enum check: True where a non-null value is not a declared value
+
+    Encodes the series against the declared categories; anything that
+    doesn't map to a category code (code -1) and isn't null is invalid.
+    """
+    codes = pd.Categorical(series, categories=ENUMS[column]).codes
+    return pd.Series(codes == -1, index=series.index) & series.notna()
+
+
+def invalid_enum_values(df):
+    """
+    Return {column: sorted invalid values} for every enum column present in df
+    """
+    invalid = {}
+    for column in ENUMS:
+        if column in df.columns:
+            mask = invalid_enum_mask(df[column], column)
+            if mask.any():
+                invalid[column] = sorted(df.loc[mask, column].astype(str).unique())
+    return invalid
+
+
+def check_enums(df):
+    """Raise SchemaError if any enum column of df holds undeclared values"""
+    invalid = invalid_enum_values(df)
+    if invalid:
+        details = '; '.join(f"{col}: {', '.join(values)}" for col, values in invalid.items())
+        raise SchemaError(f"Invalid enum values ({details})")
+    return invalid
+
+
+def normalize_columns(columns):
+    """Map legacy column names onto schema names"""
+    return [COLUMN_ALIASES.get(col, col) for col in columns]
+
+
+def missing_columns(columns, stage):
+    """Return the required columns of a stage that are absent from columns"""
+    present = set(normalize_columns(columns))
+    return [col for col in REQUIRED_COLUMNS[stage] if col not in present]
+
+
+def header_row(path):
+    """
+    Return the header row index of an issues CSV
+
+    The tracker export has a group row ("Raw Exports", "AI Generated
+    Outputs") above the real column names.
+    """
+    first_two = pd.read_csv(path, header=None, nrows=2, dtype=str)
+    if 'issue_number' not in first_two.iloc[0].tolist() and len(first_two) > 1 \
+            and 'issue_number' in first_two.iloc[1].tolist():
+        return 1
+    return 0
+
+
+def read_dtypes(columns):
+    """Return a read_csv dtype mapping for the given columns"""
+    dtypes = {}
+    for col in columns:
+        kind = COLUMN_TYPES.get(COLUMN_ALIASES.get(col, col))
+        if kind in ('category', 'enum'):
+            dtypes[col] = 'category'
+    return dtypes
+
+
+def apply_schema(df, strict=False):
+    """
+    Coerce a DataFrame to schema types in place of ad-hoc per-script parsing
+
+    Renames legacy columns, parses datetimes, makes counters numeric and
+    encodes enum columns as categoricals with the declared values.
+
+    Args:
+        df: Issues DataFrame
+        strict: Raise SchemaError on invalid enum values instead of
+            keeping them as extra categories
+
+    Returns:
+        Tuple of (typed DataFrame, {column: invalid values})
+    """
+    df = df.rename(columns={old: new for old, new in COLUMN_ALIASES.items()
+                            if old in df.columns and new not in df.columns})
+
+    invalid = check_enums(df) if strict else invalid_enum_values(df)
+
+    for col in df.columns:
+        kind = COLUMN_TYPES.get(col)
+        if kind == 'datetime':
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+        elif kind == 'int':
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        elif kind == 'enum':
+            df[col] = df[col].astype(str).where(df[col].notna()).astype(
+                enum_dtype(col, invalid.get(col, ()))
+            )
+        elif kind == 'category':
+            df[col] = df[col].astype('category')
+
+    return df, invalid
+
+
+def read_issues(path, stage=None, strict=False, **read_csv_kwargs):
+    """
+    Read an issues CSV (raw, classified or tracker export) with schema dtypes
+
+    Args:
+        path: CSV path
+        stage: If given, raise SchemaError when the stage's required
+            columns are missing ('raw', 'classified', 'enriched')
+        strict: Raise SchemaError on invalid enum values
+        **read_csv_kwargs: Passed through to pd.read_csv
+
+    Returns:
+        Typed DataFrame
+    """
+    header = header_row(path)
+    columns = pd.read_csv(path, header=header, nrows=0).columns
+    if stage is not None:
+        missing = missing_columns(columns, stage)
+        if missing:
+            raise SchemaError(f"{path}: missing {stage} columns: {', '.join(missing)}")
+
+    df = pd.read_csv(path, header=header, dtype=read_dtypes(columns), **read_csv_kwargs)
+    df, _ = apply_schema(df, strict=strict)
+    return df
+
+
+# ============================================================================
+# LABELS
+# ============================================================================
+
+def parse_labels(labels):
+    """
+    Split a comma-separated labels string into normalized label tokens
+
+    Args:
+        labels: Raw labels value ("bug, area:core"), NaN/NA for none
+
+    Returns:
+        Tuple of stripped, lowercased, de-duplicated labels in original order
+    """
+    if not isinstance(labels, str):
+        if labels is None or pd.isna(labels):
+            return ()
+        labels = str(labels)
+    return tuple(dict.fromkeys(sys.intern(l.strip().lower()) for l in labels.split(',') if l.strip()))
+
+
+def label_sets(labels):
+    """
+    Parse a labels column once; each distinct raw string is split only once
+
+    Args:
+        labels: Iterable of raw labels values (e.g. df['labels'])
+
+    Returns:
+        List of label tuples (see parse_labels), one per row; rows with the
+        same raw string share one tuple
+    """
+    parsed = {}
+    result = []
+    for raw in labels:
+        key = raw if isinstance(raw, str) else ''
+        if key not in parsed:
+            parsed[key] = parse_labels(key)
+        result.append(parsed[key])
+    return result
+
+
+def has_label(sets, *labels, prefixes=()):
+    """
+    Boolean mask of rows carrying any of the given labels (exact match)
+
+    Args:
+        sets: Output of label_sets
+        *labels: Labels to look for, e.g. 'area:core'
+        prefixes: Label prefixes that also count, e.g. ('perf:',)
+
+    Returns:
+        numpy bool array, usable as df[mask]
+    """
+    wanted = {l.lower() for l in labels}
+    prefixes = tuple(p.lower() for p in prefixes)
+    hits = {}
+    for tokens in set(sets):
+        hits[tokens] = any(t in wanted or (prefixes and t.startswith(prefixes)) for t in tokens)
+    return np.fromiter((hits[tokens] for tokens in sets), dtype=bool, count=len(sets))
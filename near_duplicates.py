@@ -0,0 +1,337 @@
+"""
+Near-Duplicate Issue Detection
+MinHash + LSH over title/body shingles; writes a Duplicate_Of column
+"""
+
+import argparse
+import csv
+import re
+import sys
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from issue_schema import COLUMN_ALIASES, header_row
+
+SHINGLE_SIZE = 3          # Words per shingle
+NUM_PERM = 128            # MinHash signature length
+DEFAULT_THRESHOLD = 0.6   # Estimated Jaccard similarity to count as a duplicate
+SEED = 42
+
+# Shingles shared by more than this share of issues are issue-template
+# boilerplate ("steps to reproduce", "environment", ...) and are dropped,
+# otherwise every bug report looks alike
+BOILERPLATE_SHARE = 0.05
+BOILERPLATE_MIN_COUNT = 10
+
+# Shingle values are hashed with all permutations in one numpy operation;
+# this bounds the (NUM_PERM x shingles) uint64 block (32 MB at 128 permutations)
+BLOCK_SHINGLES = 32_768
+
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+DUPLICATE_COLUMN = 'Duplicate_Of'
+
+_TOKEN_RE = re.compile(r'\w+')
+# Fenced blocks are mostly auto-attached logs and stack traces, which make
+# unrelated reports from the same machine look identical
+_CODE_BLOCK_RE = re.compile(r'```.*?(```|$)', re.DOTALL)
+
+
+def shingle_hashes(text, k=SHINGLE_SIZE):
+    """
+    Hash the k-word shingles of a text
+
+    Args:
+        text: Issue text (title + body); fenced code blocks are ignored
+        k: Words per shingle
+
+    Returns:
+        Sorted array of unique 32-bit shingle hashes (uint64 dtype)
+    """
+    tokens = _TOKEN_RE.findall(_CODE_BLOCK_RE.sub(' ', str(text)).lower())
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+    words = np.array([zlib.crc32(t.encode('utf-8')) for t in tokens], dtype=np.uint64)
+    if len(words) < k:
+        k = len(words)
+    # Polynomial combination of k consecutive word hashes (wraps mod 2^64)
+    combined = np.zeros(len(words) - k + 1, dtype=np.uint64)
+    for i in range(k):
+        combined = combined * np.uint64(1_000_003) + words[i:len(words) - k + 1 + i]
+    return np.unique(combined & MAX_HASH)
+
+
+def drop_boilerplate(shingle_sets, share=BOILERPLATE_SHARE, min_count=BOILERPLATE_MIN_COUNT):
+    """Remove shingles that occur in more than max(share * n, min_count) issues"""
+    if not shingle_sets:
+        return shingle_sets
+    values, counts = np.unique(np.concatenate(shingle_sets), return_counts=True)
+    common = values[counts > max(share * len(shingle_sets), min_count)]
+    if not len(common):
+        return shingle_sets
+    return [s[~np.isin(s, common, assume_unique=True)] for s in shingle_sets]
+
+
+def minhash_signatures(shingle_sets, num_perm=NUM_PERM, seed=SEED):
+    """
+    Compute MinHash signatures for many shingle sets at once
+
+    Shingles of a block of issues are concatenated and hashed with all
+    permutations in one array operation (multiply-shift hashing, which
+    needs no modulo) computed in place in one reused buffer;
+    np.minimum.reduceat then takes the per-issue minimum along the
+    contiguous axis.
+
+    Args:
+        shingle_sets: List of shingle hash arrays
+        num_perm: Number of hash permutations
+        seed: Random seed for the permutations
+
+    Returns:
+        (n_issues, num_perm) uint64 array; rows of empty sets stay MAX_HASH
+    """
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+    b = rng.randint(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+    signatures = np.full((len(shingle_sets), num_perm), MAX_HASH, dtype=np.uint64)
+    lengths = np.array([len(s) for s in shingle_sets], dtype=np.int64)
+    # A block is at most BLOCK_SHINGLES, or one larger set
+    buffer = np.empty((num_perm, min(max(BLOCK_SHINGLES, lengths.max(initial=0)), lengths.sum())), dtype=np.uint64)
+
+    start = 0
+    while start < len(shingle_sets):
+        end = start + max(1, int(np.searchsorted(np.cumsum(lengths[start:]), BLOCK_SHINGLES, side='right')))
+        members = np.flatnonzero(lengths[start:end]) + start
+        if len(members):
+            values = np.concatenate([shingle_sets[i] for i in members])
+            hashed = np.multiply(a[:, None], values, out=buffer[:, :len(values)])
+            np.add(hashed, b[:, None], out=hashed)
+            np.right_shift(hashed, np.uint64(32), out=hashed)
+            offsets = np.concatenate([[0], np.cumsum(lengths[members])[:-1]])
+            signatures[members] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        start = end
+
+    return signatures
+
+
+def lsh_params(threshold, num_perm=NUM_PERM):
+    """
+    Pick the LSH band/row split whose S-curve best matches the threshold
+
+    Minimizes the false-positive area below the threshold plus the
+    false-negative area above it.
+
+    Returns:
+        Tuple of (bands, rows)
+    """
+    grid = np.linspace(0, 1, 201)
+    best, best_error = (num_perm, 1), float('inf')
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        probability = 1 - (1 - grid ** rows) ** bands
+        below = grid <= threshold
+        error = np.trapezoid(probability[below], grid[below]) + \
+            np.trapezoid(1 - probability[~below], grid[~below])
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+def candidate_pairs(signatures, bands, rows, valid=None):
+    """
+    Find candidate duplicate pairs with LSH banding
+
+    Issues whose signatures agree on every row of some band share a
+    bucket. Each bucket member is paired with the bucket's first issue
+    only, so a large bucket costs linear rather than quadratic work.
+
+    Args:
+        signatures: (n, num_perm) MinHash signatures
+        bands: Number of bands
+        rows: Signature rows per band
+        valid: Boolean mask of issues to consider (e.g. non-empty text)
+
+    Returns:
+        (m, 2) int array of unique (first, member) index pairs
+    """
+    n = len(signatures)
+    index = np.flatnonzero(valid) if valid is not None else np.arange(n)
+    if len(index) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    multipliers = np.random.RandomState(SEED + 1).randint(
+        1, np.iinfo(np.int64).max, size=rows, dtype=np.int64
+    ).astype(np.uint64) | np.uint64(1)
+
+    pairs = []
+    for band in range(bands):
+        keys = signatures[index, band * rows:(band + 1) * rows] @ multipliers
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        sizes = np.diff(np.r_[starts, len(order)])
+        first = np.repeat(order[starts], sizes)
+        members = np.flatnonzero(first != order)
+        if len(members):
+            pairs.append(np.column_stack([index[first[members]], index[order[members]]]))
+
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(pairs), axis=1)
+    return np.unique(pairs, axis=0)
+
+
+def _clusters(n, pairs):
+    """Union-find over accepted pairs; returns the root (smallest index) per issue"""
+    parent = np.arange(n)
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in pairs:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+    return np.array([find(i) for i in range(n)])
+
+
+def issue_text(df):
+    """Return title + body text per issue (body may be exported as body_preview)"""
+    legacy = [old for old, new in COLUMN_ALIASES.items() if new == 'body' and old in df.columns]
+    body_column = 'body' if 'body' in df.columns else next(iter(legacy), None)
+    body = df[body_column] if body_column else ''
+    return df['title'].fillna('').astype(str) + ' ' + pd.Series(body, index=df.index).fillna('').astype(str)
+
+
+def find_near_duplicates(df, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE):
+    """
+    Detect near-duplicate issues
+
+    The oldest issue (lowest issue_number) of each cluster is canonical;
+    every other member points at it.
+
+    Args:
+        df: Issues DataFrame with issue_number, title and body
+        threshold: Minimum estimated Jaccard similarity
+        num_perm: MinHash signature length
+        shingle_size: Words per shingle
+
+    Returns:
+        DataFrame of duplicates with issue_number, Duplicate_Of and
+        similarity (estimated Jaccard to the canonical issue)
+    """
+    issues = df.assign(_text=issue_text(df)).sort_values('issue_number', kind='stable')
+    numbers = issues['issue_number'].to_numpy()
+
+    shingle_sets = drop_boilerplate([shingle_hashes(t, shingle_size) for t in issues['_text']])
+    signatures = minhash_signatures(shingle_sets, num_perm)
+    valid = np.array([len(s) > 0 for s in shingle_sets])
+
+    bands, rows = lsh_params(threshold, num_perm)
+    pairs = candidate_pairs(signatures, bands, rows, valid)
+    if len(pairs):
+        similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+        pairs = pairs[similarity >= threshold]
+
+    roots = _clusters(len(issues), pairs)
+    members = np.flatnonzero(roots != np.arange(len(issues)))
+    similarity = (signatures[members] == signatures[roots[members]]).mean(axis=1)
+
+    return pd.DataFrame({
+        'issue_number': numbers[members],
+        DUPLICATE_COLUMN: numbers[roots[members]],
+        'similarity': similarity.round(3),
+    })
+
+
+def add_duplicate_column(df, duplicates):
+    """Return df with Duplicate_Of filled from find_near_duplicates() output"""
+    mapping = dict(zip(duplicates['issue_number'].astype(str), duplicates[DUPLICATE_COLUMN].astype(str)))
+    df = df.drop(columns=[DUPLICATE_COLUMN], errors='ignore')
+    df[DUPLICATE_COLUMN] = df['issue_number'].astype(str).map(mapping).fillna('')
+    return df
+
+
+def write_duplicates(input_file, output_file=None, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM):
+    """
+    Add a Duplicate_Of column to an issues CSV
+
+    Values are read and written as text so every other column round-trips
+    unchanged; the tracker's group header row is preserved.
+
+    Args:
+        input_file: Raw, classified or tracker CSV
+        output_file: Destination (default: overwrite input_file)
+        threshold: Minimum estimated Jaccard similarity
+        num_perm: MinHash signature length
+
+    Returns:
+        DataFrame of duplicates (see find_near_duplicates)
+    """
+    output_file = output_file or input_file
+    header = header_row(input_file)
+    df = pd.read_csv(input_file, header=header, dtype=str, keep_default_na=False)
+    group_row = None
+    if header:
+        with open(input_file, newline='', encoding='utf-8') as f:
+            group_row = next(csv.reader(f))
+
+    print(f"\n{'='*60}")
+    print("NEAR-DUPLICATE DETECTION")
+    print(f"{'='*60}\n")
+
+    started = time.perf_counter()
+    typed = df.assign(issue_number=pd.to_numeric(df['issue_number'], errors='coerce'))
+    duplicates = find_near_duplicates(typed.dropna(subset=['issue_number']), threshold, num_perm)
+    duplicates['issue_number'] = duplicates['issue_number'].astype(np.int64)
+    duplicates[DUPLICATE_COLUMN] = duplicates[DUPLICATE_COLUMN].astype(np.int64)
+    elapsed = time.perf_counter() - started
+
+    bands, rows = lsh_params(threshold, num_perm)
+    print(f"✓ Scanned {len(df)} issues in {elapsed:.2f}s "
+          f"({num_perm} permutations, {bands} bands x {rows} rows, threshold {threshold})")
+    print(f"  Duplicate issues: {len(duplicates)} in {duplicates[DUPLICATE_COLUMN].nunique()} clusters")
+
+    if len(duplicates):
+        titles = dict(zip(df['issue_number'], df['title']))
+        print("\n  Largest clusters:")
+        sizes = duplicates[DUPLICATE_COLUMN].value_counts().head(5)
+        for canonical, size in sizes.items():
+            print(f"    #{canonical} ({size} duplicates): {titles.get(str(canonical), '')[:70]}")
+
+    # Keep the group row aligned when the column is new
+    if group_row is not None and DUPLICATE_COLUMN not in df.columns:
+        group_row.append('')
+    df = add_duplicate_column(df, duplicates)
+
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        if group_row is not None:
+            csv.writer(f).writerow(group_row)
+        df.to_csv(f, index=False)
+
+    print(f"\n✓ Wrote {DUPLICATE_COLUMN} column to: {output_file}")
+    print(f"\n{'='*60}\n")
+    return duplicates
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Flag near-duplicate issues with MinHash/LSH')
+    parser.add_argument('input_file', help='Issues CSV (raw, classified or tracker)')
+    parser.add_argument('-o', '--output', help='Output CSV (default: update the input file)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Minimum estimated Jaccard similarity (default: %(default)s)')
+    parser.add_argument('--num-perm', type=int, default=NUM_PERM, help='MinHash signature length')
+    args = parser.parse_args()
+
+    try:
+        write_duplicates(args.input_file, args.output, args.threshold, args.num_perm)
+    except FileNotFoundError:
+        print(f"✗ Error: File '{args.input_file}' not found")
+        sys.exit(1)
@@ -0,0 +1,238 @@
+"""
+Partitioned Issue Dataset
+Hive-style Parquet partitions (L1_Tag / created week) with per-partition
+overwrite and append, so re-runs only rewrite the partitions that changed
+"""
+
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from urllib.parse import quote, unquote
+
+import pandas as pd
+
+PARTITION_COLUMNS = ['L1_Tag', 'week']
+MANIFEST_FILE = '_manifest.json'
+NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+MODES = ('overwrite', 'append')
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Partitioned output requires pyarrow: pip install pyarrow") from e
+
+
+def week_start(created_at):
+    """
+    Return the Monday (YYYY-MM-DD) of each timestamp's week
+
+    Args:
+        created_at: Series of timestamps or ISO strings
+
+    Returns:
+        Series of strings (None where the timestamp is missing)
+    """
+    created = pd.to_datetime(created_at, errors='coerce', utc=True).dt.tz_convert(None)
+    weeks = created.dt.to_period('W-SUN').dt.start_time.dt.strftime('%Y-%m-%d')
+    return weeks.where(created.notna(), None)
+
+
+def _encode(value):
+    return NULL_PARTITION if value is None or pd.isna(value) else quote(str(value), safe='')
+
+
+def _decode(text):
+    return None if text == NULL_PARTITION else unquote(text)
+
+
+def partition_dir(root, key, by=PARTITION_COLUMNS):
+    """Return the directory of one partition, e.g. root/L1_Tag=L1.1/week=2025-12-01"""
+    return os.path.join(root, *(f"{col}={_encode(value)}" for col, value in zip(by, key)))
+
+
+def content_hash(df):
+    """Order-sensitive hash of a DataFrame's columns and values"""
+    digest = hashlib.sha256(json.dumps([str(c) for c in df.columns]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df.astype(object), index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def load_manifest(root):
+    """
+    Return the partition manifest: {partition dir (relative): entry}
+
+    Each entry holds the partition values, row count, part files,
+    content hash and last write time.
+    """
+    path = os.path.join(root, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['partitions']
+
+
+def _save_manifest(root, partitions, by):
+    path = os.path.join(root, MANIFEST_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'partition_columns': by, 'partitions': partitions}, f, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def _write_part(df, directory, name):
+    os.makedirs(directory, exist_ok=True)
+    target = os.path.join(directory, name)
+    df.to_parquet(target + '.tmp', index=False)
+    os.replace(target + '.tmp', target)
+
+
+def write_partitions(df, root, mode='overwrite', by=PARTITION_COLUMNS, prune=False):
+    """
+    Write issues into a partitioned Parquet dataset
+
+    overwrite: each partition present in df is replaced by df's rows for it,
+        but only if its content hash changed; partitions absent from df are
+        left alone (unless prune=True, which removes them).
+    append: df's rows are added to their partitions as new part files.
+
+    Partition columns are encoded in the directory names (hive style) and
+    not stored in the files; a 'week' partition column is derived from
+    created_at when df doesn't have one.
+
+    Args:
+        df: Issues DataFrame
+        root: Dataset directory
+        mode: 'overwrite' or 'append'
+        by: Partition columns
+        prune: With overwrite, delete partitions that have no rows in df
+
+    Returns:
+        Dict of partition dir lists: written, appended, unchanged, pruned
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}")
+    _require_pyarrow()
+
+    if 'week' in by and 'week' not in df.columns:
+        df = df.assign(week=week_start(df['created_at']))
+    partitions = load_manifest(root)
+    result = {'written': [], 'appended': [], 'unchanged': [], 'pruned': []}
+    now = datetime.now().isoformat(timespec='seconds')
+    seen = set()
+
+    for key, group in df.groupby(by, observed=True, dropna=False, sort=True):
+        key = key if isinstance(key, tuple) else (key,)
+        directory = partition_dir(root, key, by)
+        relative = os.path.relpath(directory, root)
+        seen.add(relative)
+
+        rows = group.drop(columns=by)
+        if 'issue_number' in rows.columns:
+            rows = rows.sort_values('issue_number', kind='stable')
+        rows = rows.reset_index(drop=True)
+        digest = content_hash(rows)
+        entry = partitions.get(relative)
+
+        if mode == 'append' and entry:
+            name = f"part-{len(entry['files']):05d}.parquet"
+            _write_part(rows, directory, name)
+            entry.update(
+                rows=entry['rows'] + len(rows),
+                files=entry['files'] + [name],
+                hash=hashlib.sha256((entry['hash'] + digest).encode('utf-8')).hexdigest(),
+                updated=now,
+            )
+            result['appended'].append(relative)
+            continue
+
+        if entry and entry['hash'] == digest and \
+                all(os.path.exists(os.path.join(directory, f)) for f in entry['files']):
+            result['unchanged'].append(relative)
+            continue
+
+        _write_part(rows, directory, 'part-00000.parquet')
+        for stale in (entry or {}).get('files', []):
+            if stale != 'part-00000.parquet':
+                os.remove(os.path.join(directory, stale))
+        partitions[relative] = {
+            'values': {col: (None if pd.isna(value) else str(value)) for col, value in zip(by, key)},
+            'rows': len(rows),
+            'files': ['part-00000.parquet'],
+            'hash': digest,
+            'updated': now,
+        }
+        result['written'].append(relative)
+
+    if prune and mode == 'overwrite':
+        for relative in sorted(set(partitions) - seen):
+            directory = os.path.join(root, relative)
+            for name in partitions.pop(relative)['files']:
+                path = os.path.join(directory, name)
+                if os.path.exists(path):
+                    os.remove(path)
+            _remove_empty_dirs(directory, root)
+            result['pruned'].append(relative)
+
+    os.makedirs(root, exist_ok=True)
+    _save_manifest(root, partitions, by)
+    return result
+
+
+def _remove_empty_dirs(directory, root):
+    root = os.path.abspath(root)
+    directory = os.path.abspath(directory)
+    while directory != root and os.path.isdir(directory) and not os.listdir(directory):
+        os.rmdir(directory)
+        directory = os.path.dirname(directory)
+
+
+def read_partitions(root, columns=None, **equals):
+    """
+    Read selected partitions back into one DataFrame
+
+    Only the matching partitions' files are opened, e.g.
+    read_partitions('reports/issues_by_l1', L1_Tag='L1.5'). The partition
+    columns are restored from the manifest. (DuckDB/pyarrow can also read
+    the directory directly with hive partitioning.)
+
+    Args:
+        root: Dataset directory
+        columns: Data columns to read (default: all)
+        **equals: Partition column filters; a list/tuple matches any value
+
+    Returns:
+        DataFrame (empty if nothing matches)
+    """
+    frames = []
+    for relative, entry in sorted(load_manifest(root).items()):
+        values = entry['values']
+        if any(values.get(col) not in (wanted if isinstance(wanted, (list, tuple, set)) else [wanted])
+               for col, wanted in equals.items()):
+            continue
+        for name in entry['files']:
+            part = pd.read_parquet(os.path.join(root, relative, name), columns=columns)
+            frames.append(part.assign(**values))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+def list_partitions(root):
+    """Return one row per partition: partition values, rows, files, updated"""
+    rows = [{**entry['values'], 'rows': entry['rows'], 'files': len(entry['files']), 'updated': entry['updated']}
+            for _, entry in sorted(load_manifest(root).items())]
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    # python partitioned_dataset.py <dataset dir>
+    if len(sys.argv) != 2:
+        print("Usage: python partitioned_dataset.py <dataset dir>")
+        sys.exit(1)
+    listing = list_partitions(sys.argv[1])
+    if listing.empty:
+        print(f"✗ No partitions found in {sys.argv[1]}")
+        sys.exit(1)
+    print(listing.to_string(index=False))
+    print(f"\n✓ {len(listing)} partitions, {listing['rows'].sum()} rows")
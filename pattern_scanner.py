@@ -0,0 +1,345 @@
+"""
+Pattern Scanner
+Matches many named patterns against issue text with one combined matcher
+and returns a boolean issue x pattern matrix (optionally across processes)
+"""
+
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+ENGINES = ('auto', 'arrow', 'python')
+# One alternative of a literal pattern: plain characters and re.escape()d punctuation
+_LITERAL = re.compile(r'(?:[^.^$*+?{}\[\]\\()|]|\\[^0-9A-Za-z])+')
+# Characters RE2 needs escaped in a literal
+_RE2_META = re.compile(r'([.^$*+?{}\[\]\\()|])')
+# Wraps every combined match in the arrow engine (texts containing it are rescanned)
+MARK = '\x1f'
+# Fewer literal patterns than this get an RE2 pass each (rewriting the texts costs about two passes)
+COMBINE_MIN = 3
+# Below this many texts a process pool costs more than it saves
+PARALLEL_MIN_TEXTS = 50000
+
+
+def _literals(pattern):
+    """Return the alternatives of a pure 'a|b|c' literal pattern (escapes undone), or None"""
+    parts = pattern.split('|')
+    if not all(_LITERAL.fullmatch(part) for part in parts):
+        return None
+    return tuple(re.sub(r'\\(.)', r'\1', part) for part in parts)
+
+
+def _alternation(literals):
+    """RE2 alternation of literal strings"""
+    return '|'.join(_RE2_META.sub(r'\\\1', l) for l in literals)
+
+
+def _overlaps(matched, literal):
+    """Whether a match of `matched` can hide `literal` (a suffix of one starts the other)"""
+    return any(matched[-k:] == literal[:k] for k in range(1, min(len(matched), len(literal))))
+
+
+def _has_pyarrow():
+    try:
+        import pyarrow.compute  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _to_arrow(texts):
+    """Texts as an Arrow string array (non-strings become null)"""
+    import pyarrow as pa
+
+    try:
+        array = pa.array(texts, type=pa.large_string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([t if isinstance(t, str) else None for t in texts], type=pa.large_string())
+    # A concatenated Arrow-backed Series comes back in chunks
+    return array.combine_chunks() if isinstance(array, pa.ChunkedArray) else array
+
+
+def _rows_containing(array, char):
+    """Rows of a large_string array containing an ASCII character (a byte scan of the data buffer)"""
+    _, offsets, data = array.buffers()
+    if data is None:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.frombuffer(offsets, dtype=np.int64)[array.offset:array.offset + len(array) + 1]
+    found = np.flatnonzero(np.frombuffer(data, dtype=np.uint8)[offsets[0]:offsets[-1]] == ord(char)) + offsets[0]
+    return np.unique(np.searchsorted(offsets, found, side='right') - 1)
+
+
+def _following(flat, parents, positions, width):
+    """
+    The `width` characters after each match at flat[positions] (split pieces
+    of the combined pass), read across the next match when the gap is shorter
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    rows = parents[positions]
+
+    def piece(offset):
+        at = np.minimum(positions + offset, len(flat) - 1)
+        same_text = (positions + offset < len(flat)) & (parents[at] == rows)
+        return pc.if_else(pa.array(same_text), pc.utf8_slice_codeunits(flat.take(pa.array(at)), 0, width),
+                          pa.scalar('', pa.large_string()))
+
+    # Gap, then (when the gap is shorter than width) the next match and gap
+    following = pc.utf8_slice_codeunits(pc.binary_join_element_wise(piece(1), piece(2), piece(3), pa.scalar('', pa.large_string())), 0, width)
+    short = np.flatnonzero((pc.utf8_length(following).to_numpy() < width) & (positions + 4 < len(flat))
+                           & (parents[np.minimum(positions + 4, len(flat) - 1)] == rows))
+    if not len(short):
+        return following
+    # Runs of short gaps and matches: join the rest of the text piece by piece
+    texts = following.to_pylist()
+    for i in short:
+        position = positions[i] + 4
+        while len(texts[i]) < width and position < len(flat) and parents[position] == rows[i]:
+            texts[i] += flat[position].as_py()
+            position += 1
+        texts[i] = texts[i][:width]
+    return pa.array(texts, type=pa.large_string())
+
+
+class PatternScanner:
+    """
+    Compiled set of named patterns, scanned together
+
+    Results match re.search(pattern, text) per pattern, i.e. what
+    Series.str.contains(pattern, case=not ignore_case) returns. Two engines:
+
+    arrow: the texts become one Arrow array. Every literal alternation
+        ('slow|lag|hang', from_keywords groups) goes into one RE2
+        alternation, and a single pass marks all its non-overlapping
+        matches; each matched literal credits every pattern with a
+        literal inside it. A match can only hide another pattern's literal
+        it runs into, so only the text right after such matches is
+        checked again. Real regexes ('error.*400') can span other matches
+        and get an RE2 pass each, as do literal patterns when there are
+        fewer than COMBINE_MIN; patterns RE2 can't compile (lookarounds,
+        backreferences) use the python engine.
+    python: a loop over the texts; each text is lowercased once and every
+        pattern is checked on it. Literal alternations are substring
+        checks, all-lowercase regexes run case-sensitively on the
+        lowercased text and anything else uses re.IGNORECASE.
+
+    ('auto' picks arrow when pyarrow is installed.)
+    """
+
+    def __init__(self, patterns, ignore_case=True, engine='auto'):
+        """
+        Args:
+            patterns: Dict of name -> regex
+            ignore_case: Case-insensitive matching
+            engine: 'auto', 'arrow' or 'python'
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"engine must be one of {', '.join(ENGINES)}")
+        if engine == 'auto':
+            engine = 'arrow' if _has_pyarrow() else 'python'
+        elif engine == 'arrow' and not _has_pyarrow():
+            raise ImportError("The arrow engine requires pyarrow: pip install pyarrow")
+
+        self.patterns = dict(patterns)
+        self.names = list(self.patterns)
+        self.ignore_case = ignore_case
+        self.engine = engine
+
+        # python engine: (index, literals) and (index, compiled regex, run on lowercased text?)
+        self._literal = []
+        self._regex = []
+        for idx, pattern in enumerate(self.patterns.values()):
+            literals = _literals(pattern)
+            if literals is not None:
+                self._literal.append((idx, tuple(l.lower() for l in literals) if ignore_case else literals))
+            elif ignore_case and pattern == pattern.lower():
+                self._regex.append((idx, re.compile(pattern), True))
+            else:
+                self._regex.append((idx, re.compile(pattern, re.IGNORECASE if ignore_case else 0), False))
+
+    @classmethod
+    def from_keywords(cls, groups, ignore_case=True, engine='auto'):
+        """
+        Build a scanner from keyword lists (matched as plain substrings)
+
+        Args:
+            groups: Dict of name -> list of keywords
+            ignore_case: Case-insensitive matching
+            engine: 'auto', 'arrow' or 'python'
+        """
+        return cls({name: '|'.join(re.escape(k) for k in keywords) for name, keywords in groups.items()},
+                   ignore_case=ignore_case, engine=engine)
+
+    # ------------------------------------------------------------------
+    # python engine
+    # ------------------------------------------------------------------
+
+    def _hits(self, text, only=None):
+        """Indices of the patterns found in one text (restricted to `only` if given)"""
+        if not isinstance(text, str):
+            return []
+        lowered = text.lower() if self.ignore_case else text
+        hits = [idx for idx, literals in self._literal
+                if (only is None or idx in only) and any(l in lowered for l in literals)]
+        hits.extend(idx for idx, regex, on_lowered in self._regex
+                    if (only is None or idx in only) and regex.search(lowered if on_lowered else text))
+        return hits
+
+    def search(self, text):
+        """
+        Names of the patterns found in one text
+
+        Returns:
+            Set of pattern names (empty for missing text)
+        """
+        return {self.names[idx] for idx in self._hits(text)}
+
+    def _python_matrix(self, texts, only=None):
+        result = np.zeros((len(texts), len(self.names)), dtype=bool)
+        for row, text in enumerate(texts):
+            for idx in self._hits(text, only):
+                result[row, idx] = True
+        return result
+
+    # ------------------------------------------------------------------
+    # arrow engine
+    # ------------------------------------------------------------------
+
+    def _combined_hits(self, array, result, patterns):
+        """One RE2 pass for all the literal patterns [(index, literals)] into result"""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        literals = sorted({l for _, group in patterns for l in group}, key=len, reverse=True)
+        # Longest first: at any position the longest literal wins, shorter ones inside it are credited below
+        alternation = _alternation(literals)
+        wrapped = pc.replace_substring_regex(array, f"{'(?i)' if self.ignore_case else ''}{alternation}",
+                                             f'{MARK}\\0{MARK}')
+
+        # Pieces alternate text, match, text, ... so matches sit at odd positions
+        pieces = pc.split_pattern(wrapped, MARK)
+        parents = pc.list_parent_indices(pieces).to_numpy()
+        if not len(parents):
+            return
+        odd = (np.arange(len(parents)) - pieces.offsets.to_numpy()[parents]) % 2 == 1
+        matched = pc.list_flatten(pieces).filter(pa.array(odd))
+        if self.ignore_case:
+            matched = pc.utf8_lower(matched)
+        encoded = pc.dictionary_encode(matched)
+        codes = encoded.indices.to_numpy()
+        rows = parents[odd]
+
+        # Distinct matched strings x literal patterns with a literal inside them
+        distinct = encoded.dictionary.to_pylist()
+        flat = pc.list_flatten(pieces)
+        matches = np.flatnonzero(odd)
+        for col, (idx, group) in enumerate(patterns):
+            found = np.array([any(l in m for l in group) for m in distinct], dtype=bool)
+            result[rows[found[codes]], idx] = True
+
+            # A match can hide a literal it runs into ('timeout' in 'timeout of memory' hides
+            # 'out of memory'): the literal occurs iff the text after the match continues it
+            for code, m in enumerate(distinct):
+                tails = {l[k:] for l in group for k in range(1, min(len(m), len(l))) if m[-k:] == l[:k]}
+                if found[code] or not tails:
+                    continue
+                at = np.flatnonzero(codes == code)
+                at = at[~result[rows[at], idx]]
+                if not len(at):
+                    continue
+                following = _following(flat, parents, matches[at], max(map(len, tails)))
+                pattern = '^(?:' + _alternation(tails) + ')'
+                continues = pc.match_substring_regex(following, pattern, ignore_case=self.ignore_case)
+                result[rows[at[continues.to_numpy(zero_copy_only=False)]], idx] = True
+
+        # A text containing MARK itself breaks the alternation above; redo it directly
+        literal = [idx for idx, _ in patterns]
+        for row in _rows_containing(array, MARK):
+            result[row, literal] = False
+            for idx in self._hits(array[row].as_py(), only=set(literal)):
+                result[row, idx] = True
+
+    def _arrow_matrix(self, texts):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        result = np.zeros((len(texts), len(self.names)), dtype=bool)
+        array = _to_arrow(texts)
+
+        combined = self._literal if len(self._literal) >= COMBINE_MIN else []
+        if combined:
+            self._combined_hits(array, result, combined)
+
+        # Regexes (and the odd literal pattern) get a pass each; RE2 rejects some Python
+        # patterns, those fall back to the python engine
+        single = [(idx, _alternation(group)) for idx, group in self._literal if not combined]
+        single += [(idx, self.patterns[self.names[idx]]) for idx, _, _ in self._regex]
+        fallback = set()
+        for idx, pattern in single:
+            try:
+                hits = pc.match_substring_regex(array, pattern, ignore_case=self.ignore_case)
+            except pa.ArrowInvalid:
+                fallback.add(idx)
+                continue
+            # Missing texts stay null and count as no match
+            result[:, idx] = pc.fill_null(hits, False).to_numpy(zero_copy_only=False)
+        if fallback:
+            partial = self._python_matrix(texts, only=fallback)
+            for idx in fallback:
+                result[:, idx] = partial[:, idx]
+        return result
+
+    # ------------------------------------------------------------------
+
+    def matrix(self, texts):
+        """Boolean numpy matrix (len(texts) x len(names)) for a list or Series of texts"""
+        if self.engine == 'arrow':
+            return self._arrow_matrix(texts)
+        return self._python_matrix(texts)
+
+    def scan(self, texts, workers=None, chunksize=20000):
+        """
+        Scan every text for all patterns
+
+        Args:
+            texts: Series or list of strings (NaN/None count as no match)
+            workers: Worker processes (default: 1 below PARALLEL_MIN_TEXTS
+                texts, else os.cpu_count())
+            chunksize: Texts per worker task
+
+        Returns:
+            Boolean DataFrame, one column per pattern name (index of texts
+            if it is a Series)
+        """
+        index = texts.index if isinstance(texts, pd.Series) else None
+        # Kept as a Series: an Arrow-backed one converts without copying
+        texts = texts if index is not None else pd.Series(list(texts), dtype=object)
+        if workers is None:
+            workers = 1 if len(texts) < PARALLEL_MIN_TEXTS else (os.cpu_count() or 1)
+
+        if workers > 1 and len(texts) > chunksize:
+            chunks = [texts.iloc[start:start + chunksize] for start in range(0, len(texts), chunksize)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                matrix = np.vstack(list(pool.map(self.matrix, chunks)))
+        else:
+            matrix = self.matrix(texts)
+
+        return pd.DataFrame(matrix, columns=self.names, index=index)
+
+
+if __name__ == "__main__":
+    # python pattern_scanner.py <issues.csv> <name=regex> [name=regex ...]
+    if len(sys.argv) < 3:
+        print("Usage: python pattern_scanner.py <issues.csv> <name=regex> [name=regex ...]")
+        sys.exit(1)
+
+    issues = pd.read_csv(sys.argv[1])
+    patterns = dict(arg.split('=', 1) for arg in sys.argv[2:])
+    hits = PatternScanner(patterns).scan(issues['title'].fillna('') + ' ' + issues['body'].fillna(''))
+    for name, count in hits.sum().items():
+        print(f"  {name:20} {count:5} ({count / len(issues) * 100:5.1f}%)")
@@ -0,0 +1,470 @@
+"""
+Pipeline Runner
+Runs extract -> classify -> flag duplicates -> triage -> merge -> validate ->
+dashboard index (plus the analysis reports) as one DAG of cached stages
+"""
+
+import argparse
+import ast
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from issue_schema import PRIORITIES, RAW_COLUMNS, header_row
+from query_backend import TRACKER_FILE
+from stage_cache import CACHE_DIR, StageCache, stage_key
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CLASSIFY_SCRIPT = os.path.join(ROOT, '2. Raw data categorization and enrich', 'issue_categorization_toolkit', 'scripts', 'classify_issues.py')
+REPORTS_SCRIPT = os.path.join(ROOT, '2. Raw data categorization and enrich', 'issue_categorization_toolkit', 'scripts', 'analyze_results.py')
+DEFAULT_TAXONOMY = os.path.join(ROOT, '2. Raw data categorization and enrich', 'issue_categorization_toolkit', 'data', 'taxonomy_l1_l2_EXAMPLE.csv')
+TRIAGE_SCRIPT = os.path.join(ROOT, '3. Priority definition ', 'prio_triage_agent.py')
+ANALYZE_SCRIPT = os.path.join(ROOT, '1. Clustering_for_taxonomy', 'analyze_issues.py')
+DEEP_ANALYSIS_SCRIPT = os.path.join(ROOT, '1. Clustering_for_taxonomy', 'deep_analysis.py')
+# Committed tracker: past triage decisions the triage agent shows as similar issues
+HISTORY_FILE = os.path.join(ROOT, TRACKER_FILE)
+
+WORKDIR = 'runs'
+MANIFEST_FILE = 'pipeline.json'
+LOG_DIR = 'logs'
+WORKERS = 4
+
+# Tracker group row over the raw and the enriched columns
+RAW_GROUP, ENRICHED_GROUP = 'Raw Exports', 'AI Generated Outputs'
+
+# File names inside the work directory (triage reads/writes fixed names in its cwd)
+RAW_FILE = 'raw_issues.csv'
+CLASSIFIED_FILE = 'classified_issues.csv'
+TRIAGE_INPUT_FILE = 'issues_to_triage.csv'
+PRIORITIES_FILE = 'prioritized_issues.csv'
+VALIDATION_FILE = 'validation_report.json'
+REPORTS_DIR = 'reports'
+ANALYSIS_DIR = 'analysis'
+
+
+@dataclass
+class Stage:
+    """One pipeline step: run() turns the input files into the output files"""
+    name: str
+    run: callable
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+    code: list = field(default_factory=list)
+    params: dict = None
+
+
+# ============================================================================
+# STAGE ACTIONS
+# ============================================================================
+
+def script(path, *args, log_file=None, cwd=None):
+    """Action running a Python script in cwd, output going to log_file"""
+    def run():
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        with open(log_file, 'w') as log:
+            result = subprocess.run([sys.executable, path, *args], cwd=cwd, stdout=log, stderr=subprocess.STDOUT)
+        if result.returncode != 0:
+            raise RuntimeError(f"{os.path.basename(path)} exited with {result.returncode} (see {log_file})")
+    return run
+
+
+def extract(num_issues, output_file):
+    """Fetch issues from GitHub into output_file"""
+    # requests is only needed for extraction
+    from extract_github_issues import fetch_issues, save_to_csv
+
+    issues = fetch_issues(num_issues)
+    if not issues:
+        raise RuntimeError("No issues fetched")
+    save_to_csv(issues, output_file)
+
+
+def read_tracker(path):
+    """
+    Tracker CSV as strings, with its group row if it has one
+
+    Returns:
+        Tuple of (DataFrame, {column: group label} or None)
+    """
+    header = header_row(path)
+    df = pd.read_csv(path, header=header, dtype=str)
+    if not header:
+        return df, None
+    labels = pd.read_csv(path, header=None, nrows=1, dtype=str).iloc[0].fillna('')
+    return df, dict(zip(df.columns, labels))
+
+
+def group_row(columns, groups=None):
+    """
+    Group labels for columns: as in groups when given, else 'Raw Exports'
+    at the first column and 'AI Generated Outputs' at the first enriched one
+    """
+    if groups is not None:
+        return [groups.get(col, '') for col in columns]
+    enriched = next((i for i, col in enumerate(columns) if col not in RAW_COLUMNS), None)
+    return [RAW_GROUP if i == 0 else ENRICHED_GROUP if i == enriched else '' for i in range(len(columns))]
+
+
+def merge_priorities(issues_file, priorities_file, tracker_file, history_file=None):
+    """
+    Join triage results onto the classified issues as Priority / Prio Reasoning
+    and upsert them by issue_number into the tracker
+
+    Issues the triage agent could not prioritize (ERROR rows or missing) keep
+    an empty Priority; their reasoning explains why. The tracker starts from
+    tracker_file if it exists, else from history_file (the committed tracker);
+    other issues are kept as they are, and so is the group row above the
+    column names.
+
+    Returns:
+        Dict of run info (unprioritized issues in this batch)
+    """
+    issues = pd.read_csv(issues_file, header=header_row(issues_file), dtype=str)
+    priorities = pd.read_csv(priorities_file, dtype=str).drop_duplicates('issue_number', keep='last')
+    priorities = priorities.rename(columns={'priority': 'Priority', 'reasoning': 'Prio Reasoning'})
+
+    batch = issues.drop(columns=['Priority', 'Prio Reasoning'], errors='ignore').merge(
+        priorities[['issue_number', 'Priority', 'Prio Reasoning']], on='issue_number', how='left'
+    ).drop_duplicates('issue_number', keep='last')
+    batch.loc[~batch['Priority'].isin(PRIORITIES), 'Priority'] = None
+
+    base = next((path for path in (tracker_file, history_file) if path and os.path.exists(path)), None)
+    if base is None:
+        tracker, groups = batch, None
+        columns = list(batch.columns)
+    else:
+        existing, groups = read_tracker(base)
+        columns = list(existing.columns) + [col for col in batch.columns if col not in existing.columns]
+        # Columns the batch doesn't carry keep their tracker values
+        previous = existing.drop_duplicates('issue_number', keep='last').set_index('issue_number')
+        batch = batch.set_index('issue_number')
+        for col in previous.columns.difference(batch.columns):
+            batch[col] = previous[col].reindex(batch.index)
+        batch = batch.reset_index()
+
+        # Updated issues stay where they were; new ones go at the end
+        order = pd.concat([existing['issue_number'], batch['issue_number']]).drop_duplicates()
+        tracker = pd.concat([existing, batch], ignore_index=True).drop_duplicates('issue_number', keep='last')
+        tracker = tracker.set_index('issue_number').loc[order].reset_index()[columns]
+
+    with open(tracker_file + '.tmp', 'w', newline='', encoding='utf-8') as f:
+        pd.DataFrame([group_row(columns, groups)]).to_csv(f, header=False, index=False)
+        tracker.to_csv(f, index=False)
+    os.replace(tracker_file + '.tmp', tracker_file)
+    return {'unprioritized': int(batch['Priority'].isna().sum())}
+
+
+def build_similar_index(tracker_file):
+    """Build/update the dashboard's similar-issue index next to the tracker"""
+    from similar_issues import load_index
+    load_index(tracker_file)
+
+
+def local_modules(*scripts):
+    """
+    The given scripts plus every repository module they import, transitively
+
+    Imports (including ones inside functions) are resolved next to the
+    importing file and at the repository root, where the scripts put
+    their sys.path entries; anything else is a third-party dependency.
+
+    Returns:
+        Sorted list of paths (StageCache code entries)
+    """
+    found, pending = set(), [os.path.abspath(s) for s in scripts]
+    while pending:
+        path = pending.pop()
+        if path in found:
+            continue
+        found.add(path)
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                for folder in (os.path.dirname(path), ROOT):
+                    candidate = os.path.join(folder, *name.split('.')) + '.py'
+                    if os.path.exists(candidate):
+                        pending.append(candidate)
+                        break
+    return sorted(found)
+
+
+def count_rows(path):
+    """Rows of a CSV or Parquet file (None for other files)"""
+    if path.endswith('.csv'):
+        return len(pd.read_csv(path, header=header_row(path), usecols=[0]))
+    if path.endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            return None
+        return pq.ParquetFile(path).metadata.num_rows
+    return None
+
+
+# ============================================================================
+# STAGES
+# ============================================================================
+
+def build_stages(workdir, raw_file=None, num_issues=1000, taxonomy=DEFAULT_TAXONOMY):
+    """
+    Declare the workflow
+
+    Args:
+        workdir: Directory for every intermediate and final file (not the
+            repository root: the committed tracker there is the triage history)
+        raw_file: Existing raw issues CSV (skips extraction)
+        num_issues: Issues to extract
+        taxonomy: Taxonomy CSV for classification
+
+    Returns:
+        List of Stage
+
+    Raises:
+        ValueError: If workdir would overwrite the committed tracker
+    """
+    path = lambda name: os.path.join(workdir, name)
+    log = lambda name: os.path.join(workdir, LOG_DIR, f"{name}.log")
+    raw = os.path.abspath(raw_file) if raw_file else path(RAW_FILE)
+    tracker = path(TRACKER_FILE)
+    if os.path.abspath(tracker) == os.path.abspath(HISTORY_FILE):
+        raise ValueError(f"{workdir} holds the committed tracker (the triage history); use another work directory")
+    history = [HISTORY_FILE] if os.path.exists(HISTORY_FILE) else []
+
+    stages = []
+    if not raw_file:
+        stages.append(Stage('extract', lambda: extract(num_issues, raw), outputs=[raw],
+                            code=[extract, *local_modules(os.path.join(ROOT, 'extract_github_issues.py'))],
+                            params={'num_issues': num_issues}))
+    stages += [
+        Stage('classify', script(CLASSIFY_SCRIPT, '--input', raw, '--taxonomy', taxonomy, '--output', path(CLASSIFIED_FILE),
+                                 log_file=log('classify'), cwd=workdir),
+              inputs=[raw, taxonomy], outputs=[path(CLASSIFIED_FILE)], code=local_modules(CLASSIFY_SCRIPT)),
+        Stage('duplicates', script(os.path.join(ROOT, 'near_duplicates.py'), path(CLASSIFIED_FILE), '-o', path(TRIAGE_INPUT_FILE),
+                                   log_file=log('duplicates'), cwd=workdir),
+              inputs=[path(CLASSIFIED_FILE)], outputs=[path(TRIAGE_INPUT_FILE)], code=local_modules(os.path.join(ROOT, 'near_duplicates.py'))),
+        Stage('triage', script(TRIAGE_SCRIPT, log_file=log('triage'), cwd=workdir),
+              inputs=[path(TRIAGE_INPUT_FILE), *history], outputs=[path(PRIORITIES_FILE)], code=local_modules(TRIAGE_SCRIPT)),
+        Stage('merge', lambda: merge_priorities(path(TRIAGE_INPUT_FILE), path(PRIORITIES_FILE), tracker, HISTORY_FILE),
+              inputs=[path(TRIAGE_INPUT_FILE), path(PRIORITIES_FILE), *history], outputs=[tracker],
+              code=[merge_priorities, *local_modules(os.path.join(ROOT, 'issue_schema.py'))]),
+        Stage('validate', script(os.path.join(ROOT, 'validate_data.py'), tracker, '--json', path(VALIDATION_FILE),
+                                 log_file=log('validate'), cwd=workdir),
+              inputs=[tracker], outputs=[path(VALIDATION_FILE)], code=local_modules(os.path.join(ROOT, 'validate_data.py'))),
+        Stage('dashboard_index', lambda: build_similar_index(tracker),
+              inputs=[tracker], outputs=[os.path.splitext(tracker)[0] + '.simindex.pkl'],
+              code=[build_similar_index, *local_modules(os.path.join(ROOT, 'similar_issues.py'))]),
+
+        # Reports only need the raw or classified issues, so they run next to triage
+        Stage('reports', script(REPORTS_SCRIPT, '--input', path(CLASSIFIED_FILE), '--output-dir', path(REPORTS_DIR),
+                                log_file=log('reports'), cwd=workdir),
+              inputs=[path(CLASSIFIED_FILE)],
+              outputs=[path(os.path.join(REPORTS_DIR, 'summary_report.md')), path(os.path.join(REPORTS_DIR, 'edge_cases.csv'))],
+              code=local_modules(REPORTS_SCRIPT)),
+        Stage('analyze', script(ANALYZE_SCRIPT, raw, '-o', path(ANALYSIS_DIR), log_file=log('analyze'), cwd=workdir),
+              inputs=[raw],
+              outputs=[path(os.path.join(ANALYSIS_DIR, 'issues_processed.parquet')),
+                       path(os.path.join(ANALYSIS_DIR, 'analysis_results.json'))],
+              code=local_modules(ANALYZE_SCRIPT)),
+        Stage('deep_analysis', script(DEEP_ANALYSIS_SCRIPT, '-o', path(ANALYSIS_DIR), log_file=log('deep_analysis'), cwd=workdir),
+              inputs=[path(os.path.join(ANALYSIS_DIR, 'issues_processed.parquet'))],
+              outputs=[path(os.path.join(ANALYSIS_DIR, 'categorization_results.json'))],
+              code=local_modules(DEEP_ANALYSIS_SCRIPT)),
+    ]
+    return stages
+
+
+def dependencies(stages):
+    """
+    Stage name -> names of the stages producing its inputs
+
+    Raises:
+        ValueError: If two stages write the same file or the stages form a cycle
+    """
+    producer = {}
+    for stage in stages:
+        for path in stage.outputs:
+            if path in producer:
+                raise ValueError(f"{path} is written by both {producer[path]} and {stage.name}")
+            producer[path] = stage.name
+    deps = {stage.name: {producer[path] for path in stage.inputs if path in producer} for stage in stages}
+
+    done, remaining = set(), dict(deps)
+    while remaining:
+        ready = [name for name, needs in remaining.items() if needs <= done]
+        if not ready:
+            raise ValueError(f"Stages form a cycle: {', '.join(sorted(remaining))}")
+        for name in ready:
+            done.add(name)
+            del remaining[name]
+    return deps
+
+
+def upstream(deps, names):
+    """names plus every stage they (transitively) depend on"""
+    selected, queue = set(), list(names)
+    while queue:
+        name = queue.pop()
+        if name not in selected:
+            selected.add(name)
+            queue.extend(deps[name])
+    return selected
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def _first_count(paths):
+    """Row count of the first CSV/Parquet file among paths"""
+    for path in paths:
+        rows = count_rows(path) if os.path.exists(path) else None
+        if rows is not None:
+            return rows
+    return None
+
+
+def _execute(stage):
+    """Run a stage and collect its run info (rows of the first table it reads and writes)"""
+    for path in stage.outputs:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    rows_in = _first_count(stage.inputs)
+    info = stage.run() or {}
+    return {'rows_in': rows_in, 'rows_out': _first_count(stage.outputs), **info}
+
+
+def _run_stage(stage, cache, rebuild):
+    """Run one stage through the cache; returns (status, manifest entry or error message)"""
+    missing = [path for path in stage.inputs if not os.path.exists(path)]
+    if missing:
+        return 'failed', f"missing input {missing[0]}"
+    try:
+        entry, skipped = cache.run(stage.name, lambda: _execute(stage), stage.inputs, stage.outputs,
+                                   stage.params, stage.code, rebuild)
+    except Exception as e:
+        return 'failed', f"{type(e).__name__}: {e}"
+    return ('cached' if skipped else 'ran'), entry
+
+
+def run_pipeline(stages, cache, rebuild=(), only=None, workers=WORKERS):
+    """
+    Run the stages in dependency order, independent ones in parallel
+
+    A stage starts as soon as every stage producing its inputs has finished
+    (ran or was cached); stages downstream of a failure are blocked.
+
+    Args:
+        stages: List of Stage
+        cache: StageCache holding the manifest
+        rebuild: Stage names to rerun even if fresh ('all' for every stage)
+        only: Stage names to run (plus what they depend on); default all
+        workers: Stages running at once
+
+    Returns:
+        Dict of stage name -> (status, entry or message); status is one of
+        ran, cached, failed, blocked
+    """
+    deps = dependencies(stages)
+    selected = upstream(deps, only) if only else set(deps)
+    pending = {stage.name: stage for stage in stages if stage.name in selected}
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {}
+        while pending or running:
+            for name, stage in list(pending.items()):
+                statuses = [results.get(dep, (None,))[0] for dep in deps[name]]
+                if any(status in ('failed', 'blocked') for status in statuses):
+                    results[name] = ('blocked', 'upstream stage failed')
+                elif all(status in ('ran', 'cached') for status in statuses):
+                    print(f"  → {name}")
+                    running[pool.submit(_run_stage, stage, cache, 'all' in rebuild or name in rebuild)] = name
+                else:
+                    continue
+                del pending[name]
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                results[name] = future.result()
+                status, detail = results[name]
+                print(f"  {'✗' if status == 'failed' else '✓'} {name} {status}"
+                      + (f": {detail}" if status == 'failed' else ''))
+    return results
+
+
+def print_summary(stages, results):
+    print(f"\n{'='*60}")
+    print("PIPELINE SUMMARY")
+    print(f"{'='*60}")
+    print(f"  {'Stage':16} {'Status':8} {'Wall time':>10} {'Rows in':>8} {'Rows out':>8}")
+    for stage in stages:
+        if stage.name not in results:
+            continue
+        status, detail = results[stage.name]
+        entry = detail if isinstance(detail, dict) else {}
+        seconds = f"{entry['seconds']:.1f}s" if 'seconds' in entry else '-'
+        rows_in, rows_out = (entry.get(key) if entry.get(key) is not None else '-' for key in ('rows_in', 'rows_out'))
+        note = ' (last run)' if status == 'cached' else ''
+        print(f"  {stage.name:16} {status:8} {seconds:>10} {rows_in:>8} {rows_out:>8}{note}")
+        if not entry:
+            print(f"    {detail}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run the issue workflow as a DAG of cached stages')
+    parser.add_argument('-w', '--workdir', default=WORKDIR,
+                        help=f"Directory for all stage files (the dashboard reads {TRACKER_FILE} from here; default: %(default)s)")
+    parser.add_argument('--raw', help='Use this raw issues CSV instead of extracting from GitHub')
+    parser.add_argument('--issues', type=int, default=1000, help='Issues to extract (default: %(default)s)')
+    parser.add_argument('--taxonomy', default=DEFAULT_TAXONOMY, help='Taxonomy CSV for classification')
+    parser.add_argument('--only', nargs='+', metavar='STAGE', help='Run only these stages (and what they depend on)')
+    parser.add_argument('--rebuild', nargs='+', default=[], metavar='STAGE', help="Rerun these stages even if unchanged ('all')")
+    parser.add_argument('--workers', type=int, default=WORKERS, help='Stages running at once (default: %(default)s)')
+    parser.add_argument('--dry-run', action='store_true', help='List the stages, their dependencies and whether they are up to date')
+    args = parser.parse_args()
+
+    workdir = os.path.abspath(args.workdir)
+    os.makedirs(workdir, exist_ok=True)
+    cache = StageCache(os.path.join(workdir, CACHE_DIR), MANIFEST_FILE)
+
+    try:
+        stages = build_stages(workdir, args.raw, args.issues, os.path.abspath(args.taxonomy))
+        deps = dependencies(stages)
+    except ValueError as e:
+        print(f"✗ Error: {e}")
+        sys.exit(1)
+    unknown = [name for name in (args.only or []) + args.rebuild if name not in deps and name != 'all']
+    if unknown:
+        print(f"✗ Error: unknown stage(s) {', '.join(unknown)}; stages: {', '.join(deps)}")
+        sys.exit(1)
+
+    if args.dry_run:
+        for stage in stages:
+            if all(os.path.exists(path) for path in stage.inputs):
+                key = stage_key(stage.name, stage.inputs, stage.outputs, stage.params, stage.code)
+                state = 'up to date' if cache.fresh(stage.name, key) else 'will run'
+            else:
+                state = 'waiting for inputs'
+            print(f"  {stage.name:16} {state:20} after: {', '.join(sorted(deps[stage.name])) or '-'}")
+        sys.exit(0)
+
+    print(f"Running pipeline in {workdir} ({args.workers} workers)")
+    started = time.perf_counter()
+    results = run_pipeline(stages, cache, args.rebuild, args.only, args.workers)
+    print_summary(stages, results)
+    print(f"\n  Total wall time: {time.perf_counter() - started:.1f}s")
+    if any(status == 'failed' for status, _ in results.values()):
+        sys.exit(1)
+    print(f"  Launch the dashboard from {workdir}: streamlit run {os.path.join(ROOT, 'app.py')}")
@@ -0,0 +1,326 @@
+"""
+Dashboard Query Backends
+Filtering and chart aggregations for app.py, in pandas or embedded DuckDB
+"""
+
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import date
+
+import pandas as pd
+
+from issue_schema import HIGH_PRIORITIES, read_issues
+
+TRACKER_FILE = 'Claude_Code_Github_Categorized_ Issue_Tracker.csv'
+
+# chart_buckets codes -> DuckDB date_trunc parts
+DATE_TRUNC_PARTS = {'D': 'day', 'W': 'week', 'M': 'month', 'Q': 'quarter', 'Y': 'year'}
+
+
+@dataclass(frozen=True)
+class IssueFilters:
+    """Filter state selected in the dashboard sidebar/filter row"""
+    start_date: date
+    end_date: date
+    categories: tuple = field(default_factory=tuple)
+    priorities: tuple = field(default_factory=tuple)
+    l1_categories: tuple = field(default_factory=tuple)
+    l2_categories: tuple = field(default_factory=tuple)
+
+    def column_filters(self):
+        """Return (column, selected values) pairs for the non-empty multiselects"""
+        pairs = [
+            ('Category', self.categories),
+            ('Priority', self.priorities),
+            ('L1_Category', self.l1_categories),
+            ('L2_Category', self.l2_categories),
+        ]
+        return [(col, values) for col, values in pairs if values]
+
+    def normalized(self):
+        """Return an equivalent filter with sorted, de-duplicated selections (cache keys)"""
+        return IssueFilters(
+            start_date=self.start_date,
+            end_date=self.end_date,
+            categories=tuple(sorted(set(self.categories))),
+            priorities=tuple(sorted(set(self.priorities))),
+            l1_categories=tuple(sorted(set(self.l1_categories))),
+            l2_categories=tuple(sorted(set(self.l2_categories))),
+        )
+
+
+def load_tracker_csv(filename=TRACKER_FILE):
+    """
+    Load the enriched tracker CSV (two header rows) with schema dtypes
+
+    Args:
+        filename: Path to the tracker CSV
+
+    Returns:
+        DataFrame with parsed datetimes and categorical enums
+    """
+    return read_issues(filename)
+
+
+class PandasBackend:
+    """In-memory backend: every query runs over a pandas DataFrame"""
+
+    name = 'pandas'
+
+    def __init__(self, df):
+        self.df = df
+        self._last = None
+
+    def date_bounds(self):
+        return self.df['created_at'].min(), self.df['created_at'].max()
+
+    def distinct(self, column):
+        return sorted(self.df[column].dropna().unique())
+
+    def filtered(self, filters):
+        """Return all rows (all columns) matching the filters"""
+        # Every section of a rerun asks for the same filters; mask once
+        if self._last is None or self._last[0] != filters:
+            df = self.df
+            created = df['created_at'].dt.date
+            mask = (created >= filters.start_date) & (created <= filters.end_date)
+            for column, values in filters.column_filters():
+                mask &= df[column].isin(values)
+            self._last = (filters, df[mask])
+        return self._last[1]
+
+    def metrics(self, filters):
+        """Return the key metrics row: total, P0/P1, negative, avg comments"""
+        filtered_df = self.filtered(filters)
+        return {
+            'total': len(filtered_df),
+            'high_priority': int(filtered_df['Priority'].isin(HIGH_PRIORITIES).sum()),
+            'negative': int((filtered_df['Sentiment'] == 'Negative').sum()),
+            'avg_comments': filtered_df['comments_count'].mean(),
+        }
+
+    def timeline_counts(self, filters, column, bucket='W'):
+        """Return issue counts per (time bucket, column value) as period/column/count"""
+        filtered_df = self.filtered(filters)
+        created = filtered_df['created_at']
+        if created.dt.tz is not None:
+            created = created.dt.tz_convert(None)
+        period = created.dt.to_period(bucket).dt.start_time
+        grouped = filtered_df.groupby([period.rename('period'), column], observed=True)
+        return grouped.size().reset_index(name='count')
+
+    def value_counts(self, filters, column, limit=None, exclude=None):
+        """Return a Series of counts per value of column, largest first"""
+        filtered_df = self.filtered(filters)
+        if exclude is not None:
+            filtered_df = filtered_df[filtered_df[column] != exclude]
+        counts = filtered_df[column].value_counts()
+        # Categorical columns report unused categories with zero counts
+        counts = counts[counts > 0]
+        return counts.head(limit) if limit else counts
+
+    def most_discussed(self, filters, n=10, columns=None):
+        """Return the n issues with the most comments"""
+        top = self.filtered(filters).nlargest(n, 'comments_count')
+        return top[columns] if columns else top
+
+    def issues_after(self, issue_number, columns):
+        """Return the given columns of issues numbered above issue_number (incremental consumers)"""
+        return self.df.loc[self.df['issue_number'] > issue_number, columns]
+
+    def fingerprint(self, issue_number, columns):
+        """Return (rows, checksum) of the given columns of issues numbered up to issue_number"""
+        rows = self.df.loc[self.df['issue_number'] <= issue_number, columns]
+        return len(rows), int(pd.util.hash_pandas_object(rows, index=False).sum())
+
+    def page(self, filters, columns, limit, offset=0):
+        """Return one page of matching rows (newest first), only the given columns that exist"""
+        filtered_df = self.filtered(filters)
+        ordered = filtered_df.sort_values(['created_at', 'issue_number'], ascending=False, kind='stable')
+        return ordered[[c for c in columns if c in filtered_df.columns]].iloc[offset:offset + limit]
+
+
+class DuckDBBackend:
+    """
+    Embedded DuckDB backend over a Parquet file or a DuckDB database
+
+    Filters and aggregations are pushed down as SQL, so only chart-sized
+    results are materialized in pandas and the source can exceed RAM.
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, source, table='issues'):
+        """
+        Args:
+            source: Path to a .parquet file or a .duckdb database
+            table: Table name holding the issues inside a .duckdb database
+        """
+        try:
+            import duckdb
+        except ImportError as e:
+            raise ImportError("DuckDB backend requires duckdb: pip install duckdb") from e
+
+        if not os.path.exists(source):
+            raise FileNotFoundError(source)
+
+        if source.endswith('.parquet'):
+            # Views can't take prepared parameters, so inline the path literal
+            self._con = duckdb.connect()
+            path = source.replace("'", "''")
+            self._con.execute(f"CREATE VIEW issues AS SELECT * FROM read_parquet('{path}')")
+            self._relation = 'issues'
+        else:
+            self._con = duckdb.connect(source, read_only=True)
+            self._relation = _quote(table)
+        self.columns = self._query(f"SELECT * FROM {self._relation} LIMIT 0").columns.tolist()
+
+    def _query(self, sql, params=None):
+        # One cursor per query: Streamlit serves sessions from several threads
+        return self._con.cursor().execute(sql, params or []).df()
+
+    def _where(self, filters):
+        clauses = ["CAST(created_at AS DATE) BETWEEN ? AND ?"]
+        params = [filters.start_date, filters.end_date]
+        for column, values in filters.column_filters():
+            placeholders = ', '.join('?' for _ in values)
+            clauses.append(f"{_quote(column)} IN ({placeholders})")
+            params.extend(values)
+        return ' AND '.join(clauses), params
+
+    def date_bounds(self):
+        row = self._query(f"SELECT min(created_at) AS lo, max(created_at) AS hi FROM {self._relation}")
+        return pd.Timestamp(row['lo'].iloc[0]), pd.Timestamp(row['hi'].iloc[0])
+
+    def distinct(self, column):
+        col = _quote(column)
+        result = self._query(
+            f"SELECT DISTINCT {col} AS v FROM {self._relation} WHERE {col} IS NOT NULL ORDER BY v"
+        )
+        return result['v'].tolist()
+
+    def filtered(self, filters):
+        where, params = self._where(filters)
+        return self._query(f"SELECT * FROM {self._relation} WHERE {where}", params)
+
+    def metrics(self, filters):
+        where, params = self._where(filters)
+        high = ', '.join(f"'{p}'" for p in HIGH_PRIORITIES)
+        row = self._query(f"""
+            SELECT count(*) AS total,
+                   count(*) FILTER (WHERE Priority IN ({high})) AS high_priority,
+                   count(*) FILTER (WHERE Sentiment = 'Negative') AS negative,
+                   avg(comments_count) AS avg_comments
+            FROM {self._relation} WHERE {where}
+        """, params).iloc[0]
+        return {
+            'total': int(row['total']),
+            'high_priority': int(row['high_priority']),
+            'negative': int(row['negative']),
+            'avg_comments': float('nan') if pd.isna(row['avg_comments']) else float(row['avg_comments']),
+        }
+
+    def timeline_counts(self, filters, column, bucket='W'):
+        where, params = self._where(filters)
+        col = _quote(column)
+        part = DATE_TRUNC_PARTS[bucket]
+        return self._query(f"""
+            SELECT date_trunc('{part}', created_at) AS period, {col}, count(*) AS count
+            FROM {self._relation}
+            WHERE {where} AND {col} IS NOT NULL
+            GROUP BY ALL ORDER BY period, {col}
+        """, params)
+
+    def value_counts(self, filters, column, limit=None, exclude=None):
+        where, params = self._where(filters)
+        col = _quote(column)
+        if exclude is not None:
+            where += f" AND {col} <> ?"
+            params.append(exclude)
+        sql = f"""
+            SELECT {col} AS value, count(*) AS count
+            FROM {self._relation}
+            WHERE {where} AND {col} IS NOT NULL
+            GROUP BY value ORDER BY count DESC, value
+        """
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        result = self._query(sql, params)
+        counts = pd.Series(result['count'].to_numpy(), index=result['value'].to_numpy(), name='count')
+        counts.index.name = column
+        return counts
+
+    def most_discussed(self, filters, n=10, columns=None):
+        where, params = self._where(filters)
+        select = ', '.join(_quote(c) for c in columns) if columns else '*'
+        return self._query(f"""
+            SELECT {select} FROM {self._relation}
+            WHERE {where}
+            ORDER BY comments_count DESC LIMIT {int(n)}
+        """, params)
+
+    def issues_after(self, issue_number, columns):
+        select = ', '.join(_quote(c) for c in columns)
+        return self._query(f"""
+            SELECT {select} FROM {self._relation}
+            WHERE issue_number > ? ORDER BY issue_number
+        """, [issue_number])
+
+    def fingerprint(self, issue_number, columns):
+        row = self._query(f"""
+            SELECT count(*) AS rows, sum(hash({', '.join(_quote(c) for c in columns)})) AS checksum
+            FROM {self._relation} WHERE issue_number <= ?
+        """, [issue_number]).iloc[0]
+        return int(row['rows']), int(row['checksum']) if pd.notna(row['checksum']) else 0
+
+    def page(self, filters, columns, limit, offset=0):
+        where, params = self._where(filters)
+        select = ', '.join(_quote(c) for c in columns if c in self.columns)
+        return self._query(f"""
+            SELECT {select} FROM {self._relation}
+            WHERE {where}
+            ORDER BY created_at DESC, issue_number DESC
+            LIMIT {int(limit)} OFFSET {int(offset)}
+        """, params)
+
+
+def _quote(identifier):
+    """Quote a SQL identifier (tracker columns include spaces, e.g. 'Prio Reasoning')"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def export_tracker(csv_file, output):
+    """
+    Convert the tracker CSV into a Parquet file or DuckDB database
+
+    Timestamps are stored as naive UTC so both backends agree on dates
+    and week boundaries.
+
+    Args:
+        csv_file: Path to the enriched tracker CSV
+        output: Target path ending in .parquet or .duckdb
+    """
+    df = load_tracker_csv(csv_file)
+    for col in ['created_at', 'updated_at']:
+        if df[col].dt.tz is not None:
+            df[col] = df[col].dt.tz_convert(None)
+
+    if output.endswith('.parquet'):
+        df.to_parquet(output, index=False)
+    else:
+        import duckdb
+        con = duckdb.connect(output)
+        con.register('tracker_df', df)
+        con.execute("CREATE OR REPLACE TABLE issues AS SELECT * FROM tracker_df")
+        con.close()
+
+    print(f"✓ Exported {len(df)} issues to {output}")
+
+
+if __name__ == "__main__":
+    # python query_backend.py issues.parquet  (or issues.duckdb)
+    if len(sys.argv) < 2:
+        print("Usage: python query_backend.py <output.parquet|output.duckdb> [tracker.csv]")
+        sys.exit(1)
+    export_tracker(sys.argv[2] if len(sys.argv) > 2 else TRACKER_FILE, sys.argv[1])
@@ -0,0 +1,107 @@
+"""
+Dashboard Render Profiler
+Per-section timings and payload sizes for app.py reruns, with a JSONL log
+"""
+
+import json
+import time
+from datetime import datetime
+
+import pandas as pd
+import plotly.graph_objects as go
+
+DEFAULT_LOG_FILE = 'dashboard_profile.jsonl'
+PHASES = ['data', 'chart', 'render']
+
+
+def payload_bytes(obj):
+    """
+    Approximate bytes sent to the browser for a chart or table
+
+    Args:
+        obj: Plotly figure, DataFrame, or bytes/str
+
+    Returns:
+        Size in bytes
+    """
+    if isinstance(obj, go.Figure):
+        return len(obj.to_json())
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, (bytes, str)):
+        return len(obj)
+    return 0
+
+
+class RenderProfiler:
+    """
+    Lap-style timer for one dashboard rerun
+
+    Call lap(section, phase) after each step; the time since the previous
+    lap is attributed to that (section, phase). When disabled every call
+    is a no-op, so the instrumentation can stay in app.py permanently.
+    """
+
+    def __init__(self, enabled=False, log_file=DEFAULT_LOG_FILE):
+        self.enabled = enabled
+        self.log_file = log_file
+        self.records = []
+        self._payloads = {}
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, section, phase):
+        """Record time since the previous lap under (section, phase)"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.records.append({
+            'section': section,
+            'phase': phase,
+            'ms': round((now - self._last) * 1000, 2),
+        })
+        self._last = now
+
+    def payload(self, section, obj):
+        """Add the payload size of a chart/table to a section (not counted in timings)"""
+        if not self.enabled:
+            return
+        started = time.perf_counter()
+        self._payloads[section] = self._payloads.get(section, 0) + payload_bytes(obj)
+        self._last += time.perf_counter() - started
+
+    def summary(self):
+        """
+        Return a per-section DataFrame with data/chart/render ms and payload KB
+        """
+        if not self.records:
+            return pd.DataFrame(columns=['section', 'total_ms', 'payload_kb'])
+        timings = pd.DataFrame(self.records).pivot_table(
+            index='section', columns='phase', values='ms', aggfunc='sum', fill_value=0, sort=False
+        ).reindex(columns=PHASES, fill_value=0)
+        timings['total_ms'] = timings.sum(axis=1)
+        timings = timings.round(2)
+        timings['payload_kb'] = [round(self._payloads.get(s, 0) / 1024, 1) for s in timings.index]
+        return timings.reset_index()
+
+    def total_ms(self):
+        return round((self._last - self._start) * 1000, 2)
+
+    def write_log(self, **context):
+        """
+        Append this rerun as one JSON line (timestamp, context, sections)
+
+        Args:
+            **context: Extra fields to record, e.g. backend name and row count
+        """
+        if not self.enabled or not self.log_file:
+            return
+        entry = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            **context,
+            'total_ms': self.total_ms(),
+            'sections': self.summary().to_dict(orient='records'),
+        }
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, default=str) + '\n')
@@ -0,0 +1,183 @@
+"""
+Shared Query Cache
+Process-wide LRU memoization of dashboard filter -> aggregate results
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+DEFAULT_BUDGET_MB = 256
+
+
+def dataset_version(path):
+    """
+    Return a cheap version token for a data file (size + mtime)
+
+    Args:
+        path: Path to the CSV/Parquet/DuckDB file backing the dashboard
+
+    Returns:
+        Tuple token, or None if the file does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+def estimate_bytes(value):
+    """Approximate in-memory size of a cached result"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+class SharedQueryCache:
+    """
+    Thread-safe LRU cache with a memory budget and hit-rate stats
+
+    Streamlit serves every session from the same process, so one instance
+    (held with st.cache_resource) lets all sessions share computed views.
+    Concurrent requests for the same key wait for a single computation.
+    Cached values are shared: callers must treat them as read-only.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_BUDGET_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._inflight = {}  # key -> lock held while the value is computed
+        self._lock = threading.Lock()
+
+    def _lookup(self, key):
+        # Caller holds self._lock
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[0]
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, computing it once on a miss
+
+        Args:
+            key: Hashable cache key
+            compute: Zero-argument callable producing the value
+
+        Returns:
+            The cached or freshly computed value
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+
+        try:
+            with key_lock:
+                with self._lock:
+                    # Another session may have finished computing it while we waited
+                    found, value = self._lookup(key)
+                    if found:
+                        return value
+                    self.misses += 1
+
+                value = compute()
+                self._store(key, value)
+        finally:
+            # Also on errors, so a failed compute doesn't pin the key lock
+            with self._lock:
+                self._inflight.pop(key, None)
+        return value
+
+    def _store(self, key, value):
+        size = estimate_bytes(value)
+        with self._lock:
+            if size > self.max_bytes:
+                return  # Larger than the whole budget: serve it, don't keep it
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Return a dict of entries, bytes, hits, misses, evictions and hit rate"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+class CachedBackend:
+    """
+    Wraps a query backend so its results go through a SharedQueryCache
+
+    Keys are (dataset version, method, normalized arguments), so a data
+    refresh naturally misses and old entries age out through LRU.
+    """
+
+    CACHED_METHODS = (
+        'date_bounds', 'distinct', 'filtered', 'metrics',
+        'timeline_counts', 'value_counts', 'most_discussed', 'page', 'issues_after',
+        'fingerprint',
+    )
+
+    def __init__(self, backend, cache, version):
+        self.backend = backend
+        self.cache = cache
+        self.version = version
+        self.name = backend.name
+
+    def __getattr__(self, method):
+        if method not in self.CACHED_METHODS:
+            return getattr(self.backend, method)
+        target = getattr(self.backend, method)
+
+        def cached(*args, **kwargs):
+            key = (self.version, self.name, method, _normalize(args), _normalize(kwargs))
+            return self.cache.get_or_compute(key, lambda: target(*args, **kwargs))
+
+        return cached
+
+
+def _normalize(value):
+    """Make call arguments hashable and order-independent where order doesn't matter"""
+    if hasattr(value, 'normalized'):
+        return value.normalized()
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    return value
@@ -0,0 +1,387 @@
+"""
+Similar Issues
+Persistent IVF index over LSA vectors of title + body for similar-issue
+lookup, kept in sync with its CSV incrementally
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from issue_schema import read_issues
+from near_duplicates import issue_text
+from text_vectors import SEED, LsaModel, minibatch_kmeans, nearest_center
+
+# Bump when the stored layout changes
+INDEX_VERSION = 2
+INDEX_SUFFIX = '.simindex.pkl'
+
+DEFAULT_K = 5
+NPROBE = 12             # Inverted lists scanned per query
+EXACT_BELOW = 5000      # Smaller indexes use a single list (exact search)
+TAIL_MAX = 2000         # Inserted vectors kept in the exactly-scanned tail before lists are rebuilt
+REFIT_SHARE = 0.25      # Refit the vectorizer once this share of issues arrived after fitting
+
+# Carried along so callers can reuse past triage decisions without a join
+META_COLUMNS = ['title', 'Priority', 'Category', 'L1_Tag', 'L2_Tag', 'html_url']
+
+
+def text_hashes(issues):
+    """64-bit hash of each issue's title + body (detects edited issues)"""
+    return pd.util.hash_pandas_object(issue_text(issues), index=False).to_numpy(dtype=np.uint64)
+
+
+def n_lists(n_issues):
+    """Inverted list count: ~sqrt(n), or 1 (exact search) for small indexes"""
+    return 1 if n_issues < EXACT_BELOW else int(np.sqrt(n_issues))
+
+
+class SimilarIssueIndex:
+    """
+    Inverted-file (IVF) index of unit-length issue vectors
+
+    Vectors are grouped by their nearest k-means centroid and stored
+    contiguously per group. A query ranks the centroids and scores only the
+    vectors of the NPROBE closest groups by cosine similarity. Inserted
+    issues go to a tail that every query scans exactly; once the tail
+    passes TAIL_MAX the groups are rebuilt around the existing centroids.
+    Each vector keeps the hash of the text it was embedded from, so a sync
+    against the CSV re-embeds only issues whose title or body changed.
+    """
+
+    def __init__(self, model, centroids, vectors, numbers, meta, fitted_count, source_hash=None, hashes=None):
+        """
+        Args:
+            model: Fitted LsaModel
+            centroids: (n_lists x dims) coarse centroids
+            vectors: (n x dims) unit-length vectors
+            numbers: Issue number per vector
+            meta: Dict of META_COLUMNS name -> array per vector (same order)
+            fitted_count: Issues the model was fitted on
+            source_hash: Digest of the CSV the index reflects
+            hashes: text_hashes() per vector (default: unknown, so sync re-embeds)
+        """
+        self.model = model
+        self.centroids = centroids.astype(np.float32)
+        self.fitted_count = fitted_count
+        self.source_hash = source_hash
+        self._vectors = vectors.astype(np.float32)
+        self._numbers = np.asarray(numbers, dtype=np.int64)
+        self._meta = dict(meta)
+        self._hashes = np.zeros(len(self._numbers), dtype=np.uint64) if hashes is None \
+            else np.asarray(hashes, dtype=np.uint64)
+        self._group()
+
+    def _group(self):
+        """Sort every vector into its inverted list; empties the tail"""
+        lists = nearest_center(self._vectors, self.centroids) if len(self.centroids) > 1 \
+            else np.zeros(len(self._vectors), dtype=np.int64)
+        order = np.argsort(lists, kind='stable')
+        self._vectors = self._vectors[order]
+        self._numbers = self._numbers[order]
+        self._hashes = self._hashes[order]
+        self._meta = {col: values[order] for col, values in self._meta.items()}
+        self._offsets = np.searchsorted(lists[order], np.arange(len(self.centroids) + 1))
+        self._grouped = len(self._vectors)
+        self._rows = {int(n): row for row, n in enumerate(self._numbers)}
+
+    def _keep(self, mask):
+        """Drop the rows where mask is False, keeping the inverted lists and tail in order"""
+        kept_before = np.concatenate([[0], np.cumsum(mask)])
+        self._offsets = kept_before[self._offsets]
+        self._grouped = int(kept_before[self._grouped])
+        self._vectors = self._vectors[mask]
+        self._numbers = self._numbers[mask]
+        self._hashes = self._hashes[mask]
+        self._meta = {col: values[mask] for col, values in self._meta.items()}
+        self._rows = {int(n): row for row, n in enumerate(self._numbers)}
+
+    @classmethod
+    def build(cls, issues, n_components=None, seed=SEED):
+        """
+        Fit the vectorizer and coarse centroids on issues and index them
+
+        Args:
+            issues: DataFrame with issue_number, title, body (META_COLUMNS kept if present)
+            n_components: SVD dimensions (default: text_vectors.N_COMPONENTS)
+            seed: Random seed
+
+        Returns:
+            SimilarIssueIndex
+        """
+        issues = issues.drop_duplicates('issue_number', keep='last')
+        options = {} if n_components is None else {'n_components': n_components}
+        model, vectors = LsaModel.fit(issue_text(issues), seed=seed, **options)
+        _, centroids = minibatch_kmeans(vectors, n_lists(len(issues)), seed=seed)
+        return cls(model, centroids, vectors, issues['issue_number'], _meta(issues), len(issues),
+                   hashes=text_hashes(issues))
+
+    def __len__(self):
+        return len(self._numbers)
+
+    @property
+    def issue_numbers(self):
+        return self._numbers
+
+    def __contains__(self, issue_number):
+        return int(issue_number) in self._rows
+
+    def add(self, issues):
+        """
+        Insert issues not yet in the index (already indexed numbers are skipped)
+
+        Args:
+            issues: DataFrame with issue_number, title, body
+
+        Returns:
+            Number of issues inserted
+        """
+        new = issues[~issues['issue_number'].astype(np.int64).isin(self._rows)]
+        new = new.drop_duplicates('issue_number', keep='last')
+        if not len(new):
+            return 0
+
+        start = len(self._numbers)
+        self._vectors = np.vstack([self._vectors, self.model.transform(issue_text(new))])
+        self._numbers = np.concatenate([self._numbers, new['issue_number'].to_numpy(dtype=np.int64)])
+        self._hashes = np.concatenate([self._hashes, text_hashes(new)])
+        self._meta = {col: np.concatenate([values, _meta(new).get(col, np.full(len(new), None, dtype=object))])
+                      for col, values in self._meta.items()}
+        for offset, number in enumerate(new['issue_number']):
+            self._rows[int(number)] = start + offset
+
+        if len(self._numbers) - self._grouped > TAIL_MAX:
+            self._group()
+        return len(new)
+
+    def sync(self, issues):
+        """
+        Make the index reflect issues (the full current CSV)
+
+        Metadata is refreshed for every issue, issues whose title or body
+        changed are re-embedded (moved to the tail), issues no longer
+        present are dropped and new ones are inserted.
+
+        Args:
+            issues: DataFrame with issue_number, title, body
+
+        Returns:
+            Dict of counts: added, updated, removed
+        """
+        issues = issues.drop_duplicates('issue_number', keep='last')
+        numbers = issues['issue_number'].to_numpy(dtype=np.int64)
+        hashes = text_hashes(issues)
+
+        position = pd.Index(numbers).get_indexer(self._numbers)
+        present = position >= 0
+        unchanged = present.copy()
+        unchanged[present] = hashes[position[present]] == self._hashes[present]
+        removed = int((~present).sum())
+        updated = int((present & ~unchanged).sum())
+        if not unchanged.all():
+            self._keep(unchanged)
+
+        # Current metadata for the issues kept as they were
+        if len(self._numbers):
+            rows = issues.iloc[pd.Index(numbers).get_indexer(self._numbers)]
+            self._meta = {col: rows[col].to_numpy(dtype=object) if col in rows.columns
+                          else np.full(len(rows), None, dtype=object)
+                          for col in self._meta}
+
+        inserted = self.add(issues)
+        return {'added': inserted - updated, 'updated': updated, 'removed': removed}
+
+    # ------------------------------------------------------------------
+    # queries
+    # ------------------------------------------------------------------
+
+    def search(self, vector, k=DEFAULT_K, nprobe=NPROBE, exclude=None):
+        """
+        Approximate top-k by cosine similarity
+
+        Args:
+            vector: Unit-length query vector
+            k: Results to return
+            nprobe: Inverted lists to scan
+            exclude: Issue number to leave out (the query issue itself)
+
+        Returns:
+            Tuple of (row indices, similarities), best first
+        """
+        if len(self.centroids) > 1:
+            probe = np.argpartition(-(self.centroids @ vector), min(nprobe, len(self.centroids)) - 1)[:nprobe]
+            rows = np.concatenate([np.arange(self._offsets[c], self._offsets[c + 1]) for c in probe] +
+                                  [np.arange(self._grouped, len(self._numbers))])
+        else:
+            rows = np.arange(len(self._numbers))
+
+        if exclude is not None and int(exclude) in self._rows:
+            rows = rows[rows != self._rows[int(exclude)]]
+        if not len(rows):
+            return rows, np.empty(0, dtype=np.float32)
+
+        scores = self._vectors[rows] @ vector
+        if len(rows) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return rows[top], scores[top]
+
+    def _results(self, rows, scores):
+        return pd.DataFrame({
+            'issue_number': self._numbers[rows],
+            'similarity': np.round(scores, 3),
+            **{col: values[rows] for col, values in self._meta.items()},
+        })
+
+    def similar(self, issue_number, k=DEFAULT_K, nprobe=NPROBE):
+        """
+        Most similar indexed issues to an indexed issue
+
+        Args:
+            issue_number: Issue in the index
+            k: Results to return
+            nprobe: Inverted lists to scan
+
+        Returns:
+            DataFrame of issue_number, similarity and META_COLUMNS, best first
+
+        Raises:
+            KeyError: If the issue is not in the index
+        """
+        row = self._rows[int(issue_number)]
+        return self._results(*self.search(self._vectors[row], k, nprobe, exclude=issue_number))
+
+    def similar_to_text(self, title, body='', k=DEFAULT_K, nprobe=NPROBE):
+        """Most similar indexed issues to an issue that is not indexed (e.g. a new one)"""
+        vector = self.model.transform([f"{title or ''} {body or ''}"])[0]
+        return self._results(*self.search(vector, k, nprobe))
+
+    # ------------------------------------------------------------------
+    # persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        payload = {
+            'version': INDEX_VERSION,
+            'source_hash': self.source_hash,
+            'model': self.model,
+            'centroids': self.centroids,
+            'vectors': self._vectors,
+            'numbers': self._numbers,
+            'meta': self._meta,
+            'hashes': self._hashes,
+            'fitted_count': self.fitted_count,
+        }
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def load(cls, path):
+        """Load a saved index; returns None if it is missing, unreadable or another version"""
+        try:
+            with open(path, 'rb') as f:
+                payload = pickle.load(f)
+        except (FileNotFoundError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        if not isinstance(payload, dict) or payload.get('version') != INDEX_VERSION:
+            return None
+        return cls(payload['model'], payload['centroids'], payload['vectors'], payload['numbers'],
+                   payload['meta'], payload['fitted_count'], payload['source_hash'], payload['hashes'])
+
+
+def _meta(issues):
+    """META_COLUMNS present in issues, as object arrays (cheap to index per query)"""
+    return {col: issues[col].to_numpy(dtype=object) for col in META_COLUMNS if col in issues.columns}
+
+
+# ============================================================================
+# ARTIFACT
+# ============================================================================
+
+def index_path(issues_path):
+    """Default index location: next to the CSV, e.g. issues.simindex.pkl"""
+    return os.path.splitext(issues_path)[0] + INDEX_SUFFIX
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_index(issues_path, path=None):
+    """
+    Load the similar-issue index for an issues CSV, updating it if stale
+
+    When the CSV changed since the index was saved, the index is synced to
+    it (the vectorizer is kept): metadata is refreshed, edited issues are
+    re-embedded, deleted ones dropped and new ones inserted. A full rebuild
+    happens when there is no usable index or when more than REFIT_SHARE of
+    the indexed issues arrived after the vectorizer was fitted.
+
+    Args:
+        issues_path: Raw, classified or tracker CSV
+        path: Index path (default: index_path(issues_path))
+
+    Returns:
+        SimilarIssueIndex
+    """
+    path = path or index_path(issues_path)
+    source_hash = file_digest(issues_path)
+    index = SimilarIssueIndex.load(path)
+    if index is not None and index.source_hash == source_hash:
+        return index
+
+    issues = read_issues(issues_path).dropna(subset=['issue_number'])
+    if index is not None:
+        index.sync(issues)
+        if len(index) > index.fitted_count * (1 + REFIT_SHARE):
+            index = None
+    if index is None:
+        index = SimilarIssueIndex.build(issues)
+
+    index.source_hash = source_hash
+    index.save(path)
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build/update the similar-issue index and query it')
+    parser.add_argument('input_file', help='Issues CSV (raw, classified or tracker)')
+    parser.add_argument('--index', help='Index path (default: next to the CSV)')
+    parser.add_argument('--issue', type=int, help='Show the issues most similar to this one')
+    parser.add_argument('-k', type=int, default=DEFAULT_K, help='Results per query (default: %(default)s)')
+    args = parser.parse_args()
+
+    try:
+        started = time.perf_counter()
+        index = load_index(args.input_file, args.index)
+    except FileNotFoundError:
+        print(f"✗ Error: File '{args.input_file}' not found")
+        sys.exit(1)
+
+    print(f"✓ Index ready in {time.perf_counter() - started:.1f}s: {len(index)} issues, "
+          f"{index.model.dims} dims, {len(index.centroids)} lists -> {args.index or index_path(args.input_file)}")
+
+    numbers = index.issue_numbers[np.random.default_rng(SEED).choice(len(index), min(200, len(index)), replace=False)]
+    started = time.perf_counter()
+    for number in numbers:
+        index.similar(number, args.k)
+    print(f"  Query time: {(time.perf_counter() - started) / len(numbers) * 1000:.2f} ms "
+          f"(mean over {len(numbers)} issues, k={args.k})")
+
+    if args.issue is not None:
+        print(f"\n  Most similar to #{args.issue}:")
+        for _, row in index.similar(args.issue, args.k).iterrows():
+            print(f"    #{row['issue_number']} ({row['similarity']:.2f}) {str(row['title'])[:70]}")
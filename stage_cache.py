@@ -0,0 +1,133 @@
+"""
+Stage Cache
+Skip pipeline stages whose inputs, parameters and code have not changed
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+
+CACHE_DIR = '.cache'
+MANIFEST_FILE = 'stages.json'
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_file(obj):
+    if isinstance(obj, str):
+        return obj
+    return inspect.getsourcefile(inspect.getmodule(obj) or obj)
+
+
+def code_digest(*objects):
+    """Hash of the source files defining the given functions/classes/modules (or script paths)"""
+    digest = hashlib.sha256()
+    for path in sorted({_source_file(obj) for obj in objects}):
+        digest.update(os.path.basename(path).encode('utf-8'))
+        digest.update(file_digest(path).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def stage_key(name, inputs=(), outputs=(), params=None, code=()):
+    """
+    Cache key of one stage run
+
+    Args:
+        name: Stage name
+        inputs: Input file paths (hashed by content)
+        outputs: Output file paths (hashed by name: another target is another run)
+        params: JSON-serializable parameters
+        code: Functions/classes/modules (or script paths) the stage depends on
+
+    Returns:
+        Hex digest
+    """
+    payload = {
+        'name': name,
+        'inputs': {os.path.abspath(path): file_digest(path) for path in inputs},
+        'outputs': [os.path.abspath(path) for path in outputs],
+        'params': params,
+        'code': code_digest(*code) if code else None,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class StageCache:
+    """
+    Manifest of completed stage runs (<cache_dir>/stages.json by default)
+
+    Each entry keeps the stage key, the digest of every output it wrote and
+    run info (wall time, row counts). A stage is fresh when its key matches
+    and every output still exists with the recorded content. Safe to share
+    between threads running independent stages.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, manifest=MANIFEST_FILE):
+        self.path = os.path.join(cache_dir, manifest)
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def entry(self, name):
+        """Recorded run of a stage, or None"""
+        with self._lock:
+            return self._read().get(name)
+
+    def fresh(self, name, key):
+        """Whether the recorded run of name has this key and untouched outputs"""
+        entry = self.entry(name)
+        if entry is None or entry.get('key') != key:
+            return False
+        return all(os.path.exists(path) and file_digest(path) == digest
+                   for path, digest in entry['outputs'].items())
+
+    def record(self, name, key, outputs, **info):
+        """Store a completed run (outputs must exist)"""
+        outputs = {path: file_digest(path) for path in outputs}
+        with self._lock:
+            manifest = self._read()
+            manifest[name] = {'key': key, 'outputs': outputs, 'finished': time.strftime('%Y-%m-%dT%H:%M:%S'), **info}
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path + '.tmp', 'w') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(self.path + '.tmp', self.path)
+
+    def run(self, name, build, inputs=(), outputs=(), params=None, code=(), rebuild=False):
+        """
+        Run build() unless the stage is fresh
+
+        Args:
+            name: Stage name
+            build: Callable writing the outputs; may return a dict of run
+                info (e.g. {'rows': n}) to record
+            inputs: Input file paths
+            outputs: Output file paths
+            params: JSON-serializable parameters
+            code: Functions/classes/modules (or script paths) the stage depends on
+            rebuild: Run even if fresh
+
+        Returns:
+            Tuple of (recorded entry, True if skipped)
+        """
+        key = stage_key(name, inputs, outputs, params, code)
+        if not rebuild and self.fresh(name, key):
+            return self.entry(name), True
+
+        started = time.perf_counter()
+        info = build() or {}
+        self.record(name, key, outputs, seconds=round(time.perf_counter() - started, 3), **info)
+        return self.entry(name), False
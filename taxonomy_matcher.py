@@ -0,0 +1,339 @@
+"""
+Taxonomy Matcher
+Compiles the L1/L2 taxonomy CSV and the label/pattern rules into a cached
+matcher artifact that loads in milliseconds and rebuilds when the CSV changes
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+
+import pandas as pd
+
+from issue_schema import parse_labels
+
+# Bump when the compiled table layout changes
+ARTIFACT_VERSION = 2
+ARTIFACT_SUFFIX = '.matcher.pkl'
+
+# ============================================================================
+# RULES
+# ============================================================================
+
+# GitHub label -> L1 code. Labels match exactly (case-insensitive); when an
+# issue carries several routed labels, the one listed first here wins
+LABEL_TO_L1 = {
+    'area:core': 'L1.1',
+    'area:api': 'L1.2',
+    'area:tui': 'L1.3',
+    'area:tools': 'L1.4',
+    'area:mcp': 'L1.5',
+    'area:ide': 'L1.6',
+    'area:model': 'L1.7',
+    'platform:macos': 'L1.8',
+    'platform:windows': 'L1.8',
+    'platform:linux': 'L1.8',
+    'perf:memory': 'L1.9',
+    'memory': 'L1.9',
+    'area:security': 'L1.10',
+}
+
+# Hand-tuned L2 phrases, scored above plain taxonomy keywords
+L2_SPECIFIC_PATTERNS = {
+    'L2.1.1': ['context', 'compact', 'token', 'window'],
+    'L2.1.2': ['session', 'conversation', 'history', 'resume'],
+    'L2.1.3': ['agent', 'loop', 'agentic', 'autonomous'],
+    'L2.1.4': ['crash', 'exit', 'hang', 'freeze', 'terminated'],
+    'L2.1.5': ['hook', 'sessionstart', 'precompact', 'userpromptsubmit', 'trigger', 'lifecycle'],
+    'L2.5.1': ['plugin', 'install', 'update', 'marketplace'],
+    'L2.5.2': ['mcp server', 'oauth', 'connection', 'discovery'],
+    'L2.5.3': ['mcp tool', 'tool call', 'tool result'],
+}
+
+
+def _digest(*parts):
+    return hashlib.sha256(json.dumps(parts, default=str).encode('utf-8')).hexdigest()
+
+
+def rules_digest():
+    """Hash of the hard-coded rules compiled into the artifact"""
+    return _digest(ARTIFACT_VERSION, LABEL_TO_L1, L2_SPECIFIC_PATTERNS)
+
+
+def file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# ============================================================================
+# COMPILATION
+# ============================================================================
+
+def compile_tables(taxonomy_df):
+    """
+    Flatten the taxonomy and rules into lookup tables
+
+    Every loop the matcher runs per issue becomes a single pass over a
+    pre-built list of (code, keyword) pairs, in the original order so
+    ties between equal scores resolve exactly as before.
+
+    Args:
+        taxonomy_df: Taxonomy DataFrame (L1_Code, L1_Category, L1_Description,
+            L2_Code, L2_Subcategory, L2_Description, Example_Keywords)
+
+    Returns:
+        Dict of plain Python tables (see TaxonomyMatcher)
+    """
+    taxonomy_lookup = {}
+    l1_code_to_name = {}
+    l2_code_to_name = {}
+
+    for row in taxonomy_df.to_dict('records'):
+        l1_code = row['L1_Code']
+        l2_code = row['L2_Code']
+
+        l1_code_to_name[l1_code] = row['L1_Category']
+        l2_code_to_name[l2_code] = row['L2_Subcategory']
+
+        if l1_code not in taxonomy_lookup:
+            taxonomy_lookup[l1_code] = {
+                'category': row['L1_Category'],
+                'description': row['L1_Description'],
+                'l2_options': []
+            }
+        taxonomy_lookup[l1_code]['l2_options'].append({
+            'code': l2_code,
+            'subcategory': row['L2_Subcategory'],
+            'description': row['L2_Description'],
+            'keywords': [k.strip() for k in str(row['Example_Keywords']).lower().split(',') if k.strip()]
+        })
+
+    l1_keywords = [
+        (l1_code, keyword)
+        for l1_code, info in taxonomy_lookup.items()
+        for option in info['l2_options']
+        for keyword in option['keywords']
+    ]
+    l2_keywords = {
+        l1_code: [(option['code'], keyword) for option in info['l2_options'] for keyword in option['keywords']]
+        for l1_code, info in taxonomy_lookup.items()
+    }
+    # Same prefix rule as before: L1.1 -> patterns whose code starts with "L2.1"
+    l2_patterns = {
+        l1_code: [(l2_code, pattern)
+                  for l2_code, patterns in L2_SPECIFIC_PATTERNS.items()
+                  if l2_code.startswith(l1_code.replace('L1', 'L2'))
+                  for pattern in patterns]
+        for l1_code in set(taxonomy_lookup) | set(LABEL_TO_L1.values())
+    }
+
+    return {
+        'taxonomy_lookup': taxonomy_lookup,
+        'l1_code_to_name': l1_code_to_name,
+        'l2_code_to_name': l2_code_to_name,
+        # label -> (precedence, L1 code); lower precedence wins
+        'label_routes': {label.lower(): (rank, l1_code) for rank, (label, l1_code) in enumerate(LABEL_TO_L1.items())},
+        'l1_keywords': l1_keywords,
+        'l2_keywords': l2_keywords,
+        'l2_patterns': l2_patterns,
+    }
+
+
+class TaxonomyMatcher:
+    """
+    L1/L2 matcher over pre-compiled taxonomy tables
+
+    Matching semantics are those of the original classify_issues.py
+    functions: GitHub labels first, then keyword scoring across all L1s,
+    then L2 scoring within the chosen L1.
+    """
+
+    def __init__(self, tables, source_hash=None):
+        self.source_hash = source_hash
+        self.taxonomy_lookup = tables['taxonomy_lookup']
+        self.l1_code_to_name = tables['l1_code_to_name']
+        self.l2_code_to_name = tables['l2_code_to_name']
+        self.label_routes = tables['label_routes']
+        self.l1_keywords = tables['l1_keywords']
+        self.l2_keywords = tables['l2_keywords']
+        self.l2_patterns = tables['l2_patterns']
+
+    def label_l1(self, labels):
+        """
+        Return the L1 code implied by the GitHub labels, or None
+
+        Args:
+            labels: Raw labels string, or a tuple from issue_schema.parse_labels
+        """
+        if not isinstance(labels, tuple):
+            labels = parse_labels(labels)
+        best = None
+        for label in labels:
+            route = self.label_routes.get(label)
+            if route is not None and (best is None or route < best):
+                best = route
+        return best[1] if best else None
+
+    def best_l2(self, l1_code, text):
+        """Find best L2 subcategory. Returns ('Other', 'Low', note) if no good match."""
+        text_lower = text.lower()
+        head = text[:200].lower()
+        l2_matches = {}
+
+        for l2_code, pattern in self.l2_patterns.get(l1_code, ()):
+            if pattern in text_lower:
+                l2_matches[l2_code] = l2_matches.get(l2_code, 0) + (3 if pattern in head else 1)
+
+        for l2_code, keyword in self.l2_keywords[l1_code]:
+            if keyword in text_lower:
+                l2_matches[l2_code] = l2_matches.get(l2_code, 0) + 1
+
+        if l2_matches:
+            best = max(l2_matches, key=l2_matches.get)
+            score = l2_matches[best]
+
+            if score < 2:
+                return 'Other', 'Low', f'Weak L2 match (score={score})'
+
+            confidence = 'High' if score >= 4 else 'Medium'
+            return best, confidence, ''
+
+        return 'Other', 'Low', 'No L2 match found'
+
+    def _result(self, l1_code, text):
+        best_l2, confidence, notes = self.best_l2(l1_code, text)
+        l1_category = self.l1_code_to_name.get(l1_code, 'Other')
+        l2_category = self.l2_code_to_name.get(best_l2, 'Other') if best_l2 != 'Other' else 'Other'
+        return l1_code, l1_category, best_l2, l2_category, confidence, notes
+
+    def match(self, title, body, labels):
+        """
+        Match an issue to L1 and L2 categories
+
+        Args:
+            title: Issue title
+            body: Issue body
+            labels: Raw labels string, or a tuple from issue_schema.parse_labels
+
+        Returns:
+            Tuple of (L1_Tag, L1_Category, L2_Tag, L2_Category, Confidence, Tagging_Notes)
+        """
+        text = str(title) + " " + str(body)
+
+        # PRIORITY 1: Use GitHub labels
+        l1_code = self.label_l1(labels)
+        if l1_code is not None:
+            return self._result(l1_code, text)
+
+        # PRIORITY 2: Keyword matching
+        text_lower = text.lower()
+        title_lower = str(title).lower()
+        l1_scores = {}
+        for l1_code, keyword in self.l1_keywords:
+            if keyword in text_lower:
+                l1_scores[l1_code] = l1_scores.get(l1_code, 0) + (2 if keyword in title_lower else 1)
+
+        if l1_scores:
+            best_l1 = max(l1_scores, key=l1_scores.get)
+            score = l1_scores[best_l1]
+
+            if score < 2:
+                return 'Other', 'Other', 'Other', 'Other', 'Low', f'Weak L1 match (score={score})'
+
+            return self._result(best_l1, text)
+
+        # PRIORITY 3: No match
+        return 'Other', 'Other', 'Other', 'Other', 'Low', 'No clear L1/L2 match'
+
+
+# ============================================================================
+# ARTIFACT
+# ============================================================================
+
+def artifact_path(taxonomy_path):
+    """Default artifact location: next to the CSV, e.g. data/taxonomy_l1_l2.matcher.pkl"""
+    return os.path.splitext(taxonomy_path)[0] + ARTIFACT_SUFFIX
+
+
+def build_artifact(taxonomy_path, output=None):
+    """
+    Compile a taxonomy CSV into a matcher artifact
+
+    Args:
+        taxonomy_path: Taxonomy CSV
+        output: Artifact path (default: artifact_path(taxonomy_path))
+
+    Returns:
+        Path of the written artifact
+    """
+    output = output or artifact_path(taxonomy_path)
+    payload = {
+        'version': ARTIFACT_VERSION,
+        'source_hash': file_digest(taxonomy_path),
+        'rules_hash': rules_digest(),
+        'tables': compile_tables(pd.read_csv(taxonomy_path)),
+    }
+    with open(output + '.tmp', 'wb') as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(output + '.tmp', output)
+    return output
+
+
+def load_matcher(taxonomy_path, artifact=None):
+    """
+    Load the compiled matcher for a taxonomy CSV, rebuilding it if stale
+
+    The artifact is rebuilt when it is missing, was written by another
+    artifact version, or the CSV's or rules' hash differs from the one
+    it was compiled from.
+
+    Args:
+        taxonomy_path: Taxonomy CSV
+        artifact: Artifact path (default: artifact_path(taxonomy_path))
+
+    Returns:
+        TaxonomyMatcher
+    """
+    artifact = artifact or artifact_path(taxonomy_path)
+    source_hash = file_digest(taxonomy_path)
+
+    payload = None
+    if os.path.exists(artifact):
+        try:
+            with open(artifact, 'rb') as f:
+                payload = pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, AttributeError):
+            payload = None
+
+    if not payload or payload.get('version') != ARTIFACT_VERSION or \
+            payload.get('source_hash') != source_hash or payload.get('rules_hash') != rules_digest():
+        build_artifact(taxonomy_path, artifact)
+        with open(artifact, 'rb') as f:
+            payload = pickle.load(f)
+
+    return TaxonomyMatcher(payload['tables'], source_hash=payload['source_hash'])
+
+
+if __name__ == "__main__":
+    # python taxonomy_matcher.py <taxonomy.csv> [artifact.pkl]
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python taxonomy_matcher.py <taxonomy.csv> [artifact.pkl]")
+        sys.exit(1)
+
+    taxonomy_file = sys.argv[1]
+    started = time.perf_counter()
+    path = build_artifact(taxonomy_file, sys.argv[2] if len(sys.argv) == 3 else None)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    matcher = load_matcher(taxonomy_file, path)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    print(f"✓ Compiled {taxonomy_file} -> {path} in {build_ms:.1f} ms")
+    print(f"  L1 categories: {len(matcher.taxonomy_lookup)}, "
+          f"L2 subcategories: {len(matcher.l2_code_to_name)}, "
+          f"keywords: {len(matcher.l1_keywords)}, label routes: {len(matcher.label_routes)}")
+    print(f"  Load time: {load_ms:.1f} ms")
@@ -0,0 +1,105 @@
+"""
+Pattern Scanner
+Matrices match per-pattern str.contains, and the default engine is no slower
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from pattern_scanner import COMBINE_MIN, MARK, PatternScanner, _has_pyarrow
+
+ENGINES = ['python'] + (['arrow'] if _has_pyarrow() else [])
+
+# Literal groups whose keywords overlap across groups, escaped punctuation and one real regex
+PATTERNS = {
+    'timeout': 'timeout|bca|ab',
+    'memory': 'out of memory|ca|abc',
+    'docs': r"b|e\.g\.|can't",
+    'misc': r'aaa|c\+\+|bab',
+    'api': r'error.*40[0-3]',
+}
+FRAGMENTS = ['timeout', 'bca', 'ab', 'out of memory', 'ca', 'abc', 'b', 'e.g.', "can't", 'aaa', 'c++', 'bab',
+             'a', 'c', ' ', 'X', 'A', 'B', 'E.G.', 'time', 'of memory', 'Error', '401', '\n', MARK]
+
+BENCH_PATTERNS = {
+    'API Error': r'api error|anthropic api|error.*400|error.*401|error.*429|error.*500',
+    'Connection': r'connection|timeout|network|dns|proxy',
+    'Crash/Exit': r'crash|exit code|process exited|terminated|killed',
+    'Memory': r'memory|out of memory|oom|heap',
+    'Performance': r'slow|lag|delay|hang|freeze|unresponsive',
+    'File/Path': r'file not found|path|directory|cannot read',
+    'MCP': r'mcp|model context protocol|server',
+    'Model': r'model|sonnet|opus|haiku',
+}
+
+
+def random_texts(n, seed=0):
+    rng = np.random.default_rng(seed)
+    texts = [''.join(rng.choice(FRAGMENTS, rng.integers(0, 15))) for _ in range(n)]
+    return texts + [None, np.nan, '']
+
+
+def str_contains(texts, patterns, ignore_case):
+    series = pd.Series(texts, dtype=object)
+    return np.column_stack([series.str.contains(pattern, case=not ignore_case, na=False).astype(bool)
+                            for pattern in patterns.values()])
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('ignore_case', [True, False])
+@pytest.mark.parametrize('names', [list(PATTERNS), ['timeout', 'api']], ids=['combined', 'single'])
+def test_matches_str_contains(engine, ignore_case, names):
+    patterns = {name: PATTERNS[name] for name in names}
+    texts = random_texts(3000)
+    scanner = PatternScanner(patterns, ignore_case=ignore_case, engine=engine)
+
+    hits = scanner.scan(texts)
+
+    assert list(hits.columns) == names
+    assert np.array_equal(hits.to_numpy(), str_contains(texts, patterns, ignore_case))
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_keywords_are_plain_substrings(engine):
+    scanner = PatternScanner.from_keywords({'tag': ['[bug]', 'e.g.'], 'other': ['bug']}, engine=engine)
+    hits = scanner.scan(pd.Series(['A [BUG] report', 'eXg', 'debug', None], index=[10, 11, 12, 13]))
+
+    assert hits.index.tolist() == [10, 11, 12, 13]
+    assert hits['tag'].tolist() == [True, False, False, False]
+    assert hits['other'].tolist() == [True, False, True, False]
+
+
+def test_auto_picks_arrow():
+    expected = 'arrow' if _has_pyarrow() else 'python'
+    assert PatternScanner(PATTERNS).engine == expected
+
+
+@pytest.mark.skipif(not _has_pyarrow(), reason='the default engine is the arrow one only with pyarrow')
+def test_default_no_slower_than_str_contains():
+    # Real issue bodies, repeated to 10k texts
+    bodies = pd.read_csv(ROOT / 'raw_issues_1000.csv', usecols=['body'])['body']
+    texts = pd.concat([bodies] * 10, ignore_index=True)
+    scanner = PatternScanner(BENCH_PATTERNS)
+    assert len(scanner._literal) >= COMBINE_MIN
+
+    def best_of(run, repeat=3):
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = run()
+            times.append(time.perf_counter() - started)
+        return min(times), result
+
+    baseline, expected = best_of(lambda: pd.DataFrame({name: texts.str.contains(pattern, case=False, na=False)
+                                                       for name, pattern in BENCH_PATTERNS.items()}))
+    scanned, hits = best_of(lambda: scanner.scan(texts))
+
+    assert np.array_equal(hits.to_numpy(), expected.to_numpy())
+    assert scanned <= baseline, f"default scan {scanned:.2f}s vs per-pattern str.contains {baseline:.2f}s"
@@ -0,0 +1,108 @@
+"""
+Similar Issues
+Syncing a saved index with an edited CSV
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from similar_issues import SimilarIssueIndex, index_path, load_index
+
+TOPICS = {
+    'terminal': 'terminal rendering flicker scroll cursor resize colors',
+    'mcp': 'mcp server connection tools config startup handshake',
+    'memory': 'memory leak heap usage grows process killed oom',
+    'auth': 'login token expired oauth browser session credentials',
+}
+
+
+def make_issues(per_topic=30, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for t, (topic, words) in enumerate(TOPICS.items()):
+        words = words.split()
+        for i in range(per_topic):
+            picked = rng.choice(words, 5, replace=False)
+            rows.append({
+                'issue_number': 1000 + t * per_topic + i,
+                'title': f"{topic} {' '.join(picked[:2])}",
+                'body': ' '.join(rng.choice(words, 30)),
+                'Priority': 'P2',
+                'Category': 'Bug',
+            })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'issues.csv'
+    make_issues().to_csv(path, index=False)
+    load_index(str(path))
+    return path
+
+
+def reload(path, issues):
+    issues.to_csv(path, index=False)
+    return load_index(str(path))
+
+
+def test_metadata_refreshed_without_reembedding(csv_path):
+    issues = pd.read_csv(csv_path)
+    before = SimilarIssueIndex.load(index_path(str(csv_path)))
+    issues.loc[issues['issue_number'] == 1001, 'Priority'] = 'P0'
+
+    index = reload(csv_path, issues)
+
+    result = index.similar(1000, k=len(index))
+    assert result.loc[result['issue_number'] == 1001, 'Priority'].item() == 'P0'
+    # Text unchanged: same vector, nothing moved to the tail
+    assert index._grouped == len(index)
+    assert np.array_equal(index._vectors[index._rows[1001]], before._vectors[before._rows[1001]])
+
+
+def test_edited_body_is_reembedded(csv_path):
+    issues = pd.read_csv(csv_path)
+    auth = issues[issues['issue_number'] == 1090].iloc[0]
+    edited = issues['issue_number'] == 1000
+    issues.loc[edited, ['title', 'body']] = [auth['title'], auth['body']]
+
+    index = reload(csv_path, issues)
+
+    top = index.similar(1000, k=1).iloc[0]
+    assert top['issue_number'] == 1090
+    assert top['similarity'] == pytest.approx(1.0, abs=1e-3)
+    assert len(index) == len(issues)
+
+
+def test_deleted_issues_are_dropped(csv_path):
+    issues = pd.read_csv(csv_path)
+    deleted = [1005, 1040, 1100]
+
+    index = reload(csv_path, issues[~issues['issue_number'].isin(deleted)])
+
+    assert len(index) == len(issues) - len(deleted)
+    for number in deleted:
+        assert number not in index
+    result = index.similar(1006, k=len(index))
+    assert not result['issue_number'].isin(deleted).any()
+    assert set(result['issue_number']) == set(index.issue_numbers) - {1006}
+
+
+def test_sync_counts(csv_path):
+    issues = pd.read_csv(csv_path)
+    index = SimilarIssueIndex.load(index_path(str(csv_path)))
+    issues.loc[issues['issue_number'] == 1010, 'body'] = 'memory leak heap'
+    issues = pd.concat([
+        issues[issues['issue_number'] != 1020],
+        pd.DataFrame([{'issue_number': 2000, 'title': 'mcp server', 'body': 'mcp tools config',
+                       'Priority': 'P1', 'Category': 'Bug'}]),
+    ])
+
+    assert index.sync(issues) == {'added': 1, 'updated': 1, 'removed': 1}
+    assert index.sync(issues) == {'added': 0, 'updated': 0, 'removed': 0}
+    assert index.similar(2000, k=1)['issue_number'].item() in set(range(1030, 1060))
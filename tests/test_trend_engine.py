@@ -0,0 +1,119 @@
+"""
+Trend Engine
+Syncing with a backend whose already-counted issues were edited or deleted
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from query_backend import DuckDBBackend, PandasBackend
+from shared_cache import CachedBackend, SharedQueryCache
+from trend_engine import TrendEngine
+
+BACKENDS = ['pandas']
+try:
+    import duckdb  # noqa: F401
+    BACKENDS.append('duckdb')
+except ImportError:
+    pass
+
+
+def make_issues(n=240):
+    created = pd.date_range('2025-09-01', periods=n, freq='6h', tz='UTC')
+    return pd.DataFrame({
+        'issue_number': range(1000, 1000 + n),
+        'created_at': created,
+        'L2_Tag': [('TUI', 'MCP', 'Auth')[i % 3] for i in range(n)],
+        'labels': [('bug', 'bug, area:tui', 'enhancement')[i % 3] for i in range(n)],
+    })
+
+
+class Snapshots:
+    """Versioned backends over successive copies of the issue table"""
+
+    def __init__(self, kind, tmp_path):
+        self.kind = kind
+        self.tmp_path = tmp_path
+        self.cache = SharedQueryCache()
+        self.version = 0
+
+    def __call__(self, issues):
+        self.version += 1
+        if self.kind == 'duckdb':
+            path = self.tmp_path / f'issues_{self.version}.parquet'
+            issues.to_parquet(path)
+            backend = DuckDBBackend(str(path))
+        else:
+            backend = PandasBackend(issues.copy())
+        return CachedBackend(backend, self.cache, self.version)
+
+
+@pytest.fixture(params=BACKENDS)
+def snapshot(request, tmp_path):
+    return Snapshots(request.param, tmp_path)
+
+
+def state(engine):
+    counts = {key: counts for key, counts in engine._counts.items() if any(counts.values())}
+    baselines = {key: (round(engine._mean[key], 9), round(engine._var[key], 9))
+                 for key in counts}
+    return engine.issues, engine.high_water, engine.first, engine.latest, counts, baselines
+
+
+def recounted(issues):
+    engine = TrendEngine()
+    engine.update(issues)
+    return engine
+
+
+def test_new_issues_are_counted_incrementally(snapshot, monkeypatch):
+    issues = make_issues()
+    engine = TrendEngine()
+    engine.sync(snapshot(issues.iloc[:200]))
+    resets = []
+    monkeypatch.setattr(engine, 'reset', lambda: resets.append(True))
+
+    assert engine.sync(snapshot(issues)) == 40
+
+    assert not resets
+    assert state(engine) == state(recounted(issues))
+
+
+def test_edited_l2_tag_moves_counts(snapshot):
+    issues = make_issues()
+    engine = TrendEngine()
+    engine.sync(snapshot(issues))
+    edited = issues['issue_number'] == 1238   # Newest week, counted as 'MCP'
+    assert issues.loc[edited, 'L2_Tag'].item() == 'MCP'
+    before = engine._counts[('L2_Tag', 'MCP')][engine.latest]
+
+    issues.loc[edited, 'L2_Tag'] = 'Install'
+    engine.sync(snapshot(issues))
+
+    assert engine._counts[('L2_Tag', 'MCP')][engine.latest] == before - 1
+    assert engine._counts[('L2_Tag', 'Install')] == {engine.latest: 1}
+    assert state(engine) == state(recounted(issues))
+
+
+def test_deleted_issues_are_uncounted(snapshot):
+    issues = make_issues()
+    engine = TrendEngine()
+    engine.sync(snapshot(issues))
+
+    kept = issues[~issues['issue_number'].isin([1003, 1100, 1239])]
+    engine.sync(snapshot(kept))
+
+    assert len(engine) == len(kept)
+    assert state(engine) == state(recounted(kept))
+
+
+def test_same_version_is_not_resynced(snapshot):
+    engine = TrendEngine()
+    backend = snapshot(make_issues())
+
+    assert engine.sync(backend) == 240
+    assert engine.sync(backend) == 0
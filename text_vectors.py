@@ -0,0 +1,294 @@
+"""
+Text Vectors
+TF-IDF and LSA (truncated SVD) vectors of issue text, and mini-batch
+k-means over them
+"""
+
+import re
+from array import array
+from collections import Counter
+
+import numpy as np
+
+SEED = 42
+
+# Vectorizer
+MAX_CHARS = 4000        # Characters of title + body vectorized per issue (bounds time and memory)
+MIN_DF = 3              # Terms in fewer issues are dropped
+MAX_DF = 0.5            # Terms in more than this share of issues are dropped
+MAX_FEATURES = 50000    # Vocabulary cap (most frequent terms kept)
+N_COMPONENTS = 100      # SVD dimensions
+
+# k-means
+BATCH_SIZE = 2048
+MAX_ITER = 200
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between both
+but by can could did do does doing down during each few for from further had has have having he her here hers
+him his how i if in into is it its itself just me more most my no nor not now of off on once only or other our
+out over own same she should so some such than that the their them then there these they this those through to
+too under until up very was we were what when where which while who whom why will with would you your yours
+also get gets got using use used via still even like one two may might must shall since per etc e g ie eg
+claude code issue bug feature request please thanks thank expected actual behavior steps reproduce version
+""".split())
+
+_TOKEN_RE = re.compile(r'[a-z][a-z0-9_\-]*[a-z0-9]')
+# Fenced blocks are mostly logs and stack traces; they drown out the description
+_CODE_BLOCK_RE = re.compile(r'```.*?(```|$)', re.DOTALL)
+# Issue-template leftovers: search links ("label%3Abug") and empty answers
+_BOILERPLATE_RE = re.compile(r'https?://\S+|_no response_', re.IGNORECASE)
+
+
+def _require_scipy():
+    try:
+        import scipy.sparse  # noqa: F401
+    except ImportError as e:
+        raise ImportError("TF-IDF vectors are sparse matrices, which requires scipy: pip install scipy") from e
+
+
+# ============================================================================
+# TF-IDF
+# ============================================================================
+
+def tokenize(text, max_chars=MAX_CHARS):
+    """Lowercase word tokens of one issue text (code blocks and stopwords removed)"""
+    text = _BOILERPLATE_RE.sub(' ', _CODE_BLOCK_RE.sub(' ', str(text)[:max_chars])).lower()
+    return [t for t in _TOKEN_RE.findall(text) if t not in STOPWORDS]
+
+
+def count_matrix(texts, vocabulary=None, max_chars=MAX_CHARS):
+    """
+    Term counts per text
+
+    Counts are collected into compact typed arrays in one pass, so memory is
+    proportional to the number of (text, distinct term) pairs.
+
+    Args:
+        texts: Issue texts
+        vocabulary: Dict of term -> column; unknown terms are skipped. If
+            None, a vocabulary is built from the texts
+        max_chars: Characters per text to tokenize
+
+    Returns:
+        Tuple of (CSR float32 matrix texts x terms, vocabulary)
+    """
+    _require_scipy()
+    from scipy import sparse
+
+    fixed = vocabulary is not None
+    vocabulary = vocabulary if fixed else {}
+    indptr, indices, counts = array('q', [0]), array('i'), array('f')
+    for text in texts:
+        for token, count in Counter(tokenize(text, max_chars)).items():
+            idx = vocabulary.get(token)
+            if idx is None:
+                if fixed:
+                    continue
+                idx = vocabulary[token] = len(vocabulary)
+            indices.append(idx)
+            counts.append(count)
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (np.frombuffer(counts, dtype=np.float32), np.frombuffer(indices, dtype=np.int32), np.frombuffer(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(vocabulary))
+    )
+    return matrix, vocabulary
+
+
+def weight_tfidf(counts, idf):
+    """Sublinear tf x idf with L2-normalized rows (computed on the CSR arrays directly)"""
+    matrix = counts.astype(np.float32, copy=True)
+    matrix.data = (1 + np.log(matrix.data)) * idf.astype(np.float32)[matrix.indices]
+    lengths = np.diff(matrix.indptr)
+    norms = np.sqrt(np.bincount(np.repeat(np.arange(matrix.shape[0]), lengths),
+                                weights=matrix.data ** 2, minlength=matrix.shape[0]))
+    norms[norms == 0] = 1
+    matrix.data /= np.repeat(norms, lengths).astype(np.float32)
+    return matrix
+
+
+def tfidf_matrix(texts, max_chars=MAX_CHARS, min_df=MIN_DF, max_df=MAX_DF, max_features=MAX_FEATURES):
+    """
+    Build the TF-IDF matrix (sublinear tf, smoothed idf, L2-normalized rows)
+
+    Args:
+        texts: Issue texts
+        max_chars: Characters per text to tokenize
+        min_df: Minimum issues per term
+        max_df: Maximum share of issues per term
+        max_features: Vocabulary cap
+
+    Returns:
+        Tuple of (CSR float32 matrix issues x terms, term array, idf array)
+    """
+    counts, vocabulary = count_matrix(texts, max_chars=max_chars)
+    n_issues = counts.shape[0]
+    terms = np.array(list(vocabulary), dtype=object)
+
+    df = np.bincount(counts.indices, minlength=len(terms))
+    keep = np.flatnonzero((df >= min_df) & (df <= max_df * n_issues))
+    if len(keep) > max_features:
+        keep = keep[np.argsort(-df[keep], kind='stable')[:max_features]]
+    keep = np.sort(keep)
+
+    idf = np.log((1 + n_issues) / (1 + df[keep])) + 1
+    return weight_tfidf(counts[:, keep], idf), terms[keep], idf
+
+
+# ============================================================================
+# LSA
+# ============================================================================
+
+def randomized_svd(matrix, n_components=N_COMPONENTS, oversample=10, n_iter=4, seed=SEED):
+    """
+    Truncated SVD by randomized range finding (Halko et al.)
+
+    Only dense blocks of size issues x (n_components + oversample) and
+    terms x (n_components + oversample) are ever materialized.
+
+    Returns:
+        Tuple of (issue coordinates U * S, components Vt)
+    """
+    n_components = max(1, min(n_components, min(matrix.shape) - 1))
+    rng = np.random.default_rng(seed)
+    basis = matrix @ rng.standard_normal((matrix.shape[1], n_components + oversample)).astype(np.float32)
+    for _ in range(n_iter):
+        basis, _ = np.linalg.qr(basis)
+        basis = matrix @ (matrix.T @ basis)
+    basis, _ = np.linalg.qr(basis)
+
+    small = np.asarray((matrix.T @ basis).T)
+    u, s, vt = np.linalg.svd(small, full_matrices=False)
+    return (basis @ u[:, :n_components]) * s[:n_components], vt[:n_components]
+
+
+def normalize(vectors):
+    """Rows scaled to unit length (zero rows stay zero), as float32"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return (vectors / norms).astype(np.float32)
+
+
+class LsaModel:
+    """
+    Fitted TF-IDF vocabulary and SVD projection
+
+    Embeds texts that were not part of the fit into the same space, so new
+    issues can be compared with the ones the model was built from.
+    """
+
+    def __init__(self, terms, idf, components, max_chars=MAX_CHARS):
+        self.terms = terms
+        self.idf = idf
+        self.components = components.astype(np.float32)
+        self.max_chars = max_chars
+        self._prepare()
+
+    def _prepare(self):
+        self.vocabulary = {term: idx for idx, term in enumerate(self.terms)}
+        # Contiguous terms x dims copy; sparse @ components.T would copy it on every call
+        self._projection = np.ascontiguousarray(self.components.T)
+
+    @classmethod
+    def fit(cls, texts, n_components=N_COMPONENTS, max_chars=MAX_CHARS, min_df=MIN_DF, max_df=MAX_DF,
+            max_features=MAX_FEATURES, seed=SEED):
+        """
+        Fit on a corpus
+
+        Returns:
+            Tuple of (model, unit-length vectors of the texts)
+        """
+        matrix, terms, idf = tfidf_matrix(texts, max_chars, min_df, max_df, max_features)
+        coordinates, components = randomized_svd(matrix, n_components, seed=seed)
+        return cls(terms, idf, components, max_chars), normalize(coordinates)
+
+    @property
+    def dims(self):
+        return self.components.shape[0]
+
+    def transform(self, texts):
+        """Unit-length vectors (len(texts) x dims); texts without known terms map to zero"""
+        counts, _ = count_matrix(texts, self.vocabulary, self.max_chars)
+        return normalize(np.asarray(weight_tfidf(counts, self.idf) @ self._projection))
+
+    def __getstate__(self):
+        # Derived lookups are rebuilt on load
+        return {key: value for key, value in self.__dict__.items() if key not in ('vocabulary', '_projection')}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._prepare()
+
+
+# ============================================================================
+# K-MEANS
+# ============================================================================
+
+def nearest_center(points, centers, block=50000):
+    """Index of the closest center per point (blocked to bound memory)"""
+    if not len(points):
+        return np.empty(0, dtype=np.int64)
+    center_norms = (centers ** 2).sum(axis=1)
+    return np.concatenate([
+        np.argmin(center_norms - 2 * points[start:start + block] @ centers.T, axis=1)
+        for start in range(0, len(points), block)
+    ])
+
+
+def _kmeans_plus_plus(points, k, rng):
+    centers = [points[rng.integers(len(points))]]
+    distances = ((points - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        total = distances.sum()
+        idx = rng.choice(len(points), p=distances / total) if total > 0 else rng.integers(len(points))
+        centers.append(points[idx])
+        distances = np.minimum(distances, ((points - points[idx]) ** 2).sum(axis=1))
+    return np.array(centers)
+
+
+def minibatch_kmeans(points, k, batch_size=BATCH_SIZE, max_iter=MAX_ITER, seed=SEED, tol=1e-4):
+    """
+    Mini-batch k-means (Sculley, 2010)
+
+    Each step assigns a random batch and moves every center to the running
+    mean of all points it has been assigned so far. Memory stays at
+    O(batch_size x dims) beyond the input.
+
+    Args:
+        points: Dense array (issues x dims)
+        k: Number of clusters (capped at the number of points)
+        batch_size: Points per step
+        max_iter: Maximum steps
+        seed: Random seed
+        tol: Stop when centers move less than this (mean squared shift)
+
+    Returns:
+        Tuple of (cluster label per point, centers)
+    """
+    k = max(1, min(k, len(points)))
+    rng = np.random.default_rng(seed)
+    sample = points[rng.choice(len(points), min(len(points), max(10 * k, batch_size)), replace=False)]
+    centers = _kmeans_plus_plus(sample, k, rng)
+    seen = np.zeros(k)
+
+    for _ in range(max_iter):
+        batch = points[rng.choice(len(points), min(batch_size, len(points)), replace=False)]
+        nearest = nearest_center(batch, centers)
+        batch_counts = np.bincount(nearest, minlength=k)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, nearest, batch)
+
+        hit = batch_counts > 0
+        seen[hit] += batch_counts[hit]
+        rate = (batch_counts[hit] / seen[hit])[:, None]
+        updated = centers.copy()
+        updated[hit] += rate * (sums[hit] / batch_counts[hit][:, None] - centers[hit])
+
+        shift = ((updated - centers) ** 2).sum(axis=1).mean()
+        centers = updated
+        if shift < tol:
+            break
+
+    return nearest_center(points, centers), centers
@@ -0,0 +1,214 @@
+"""
+Trend Engine
+Incremental weekly counts per theme (L2 tag, label) with EWMA burst
+scores for spotting emerging themes
+"""
+
+import math
+import sys
+import threading
+from collections import defaultdict
+
+import pandas as pd
+
+from issue_schema import label_sets, read_issues
+
+# Theme columns; 'labels' is split into single (normalized) labels
+DIMENSIONS = ('L2_Tag', 'labels')
+FREQ = 'W'
+ALPHA = 0.3          # EWMA weight of the newest closed period
+MIN_COUNT = 3        # Periods with fewer issues are never reported as bursts
+HISTORY = 12         # Periods of counts kept per theme (sparklines)
+
+
+class TrendEngine:
+    """
+    Rolling per-theme period counts and EWMA burst scores
+
+    Each theme keeps its recent per-period counts plus an exponentially
+    weighted mean and variance of its closed periods (every period before
+    the newest one, zero-count periods included). A period is folded into
+    the EWMA once, when a newer period appears, so an update costs
+    O(new issues + themes x newly closed periods) however long the history.
+    Issues are tracked by a high-water mark (the largest issue_number
+    counted), so callers only need to pass issues above it (see columns).
+    sync() also checks a fingerprint of the rows at or below the mark and
+    recounts from scratch when they were edited or deleted in place.
+
+    The burst score of a theme is the z-score of its count in the newest
+    period against that baseline; the variance is floored at the mean
+    (Poisson) so rare themes need several issues to score high. Issues that
+    arrive for an already-closed period still count, but no longer move
+    the baseline.
+    """
+
+    def __init__(self, dimensions=DIMENSIONS, freq=FREQ, alpha=ALPHA, history=HISTORY):
+        """
+        Args:
+            dimensions: Theme columns ('labels' is exploded into labels)
+            freq: Period size (pandas offset alias, e.g. 'W', 'D')
+            alpha: EWMA weight of the newest closed period
+            history: Periods of counts kept per theme
+        """
+        self.dimensions = tuple(dimensions)
+        self.freq = freq
+        self.alpha = alpha
+        self.history = history
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """Forget every counted issue (the next update starts from scratch)"""
+        with self._lock:
+            self.version = None
+            self.fingerprint = None  # Backend fingerprint of the counted rows (see sync)
+            self.high_water = 0   # Largest issue_number counted
+            self.issues = 0
+            self.first = None     # Oldest period seen
+            self.latest = None    # Newest period seen (the one scored)
+            self.folded = None    # Newest period folded into the EWMA state
+            self._counts = defaultdict(dict)   # (dimension, theme) -> {period: count}
+            self._mean = defaultdict(float)
+            self._var = defaultdict(float)
+
+    def __len__(self):
+        return self.issues
+
+    @property
+    def columns(self):
+        """Columns update() reads"""
+        return ['issue_number', 'created_at', *self.dimensions]
+
+    def sync(self, backend):
+        """
+        Bring the counts up to date with a query backend (see query_backend)
+
+        Issues above the high-water mark are counted incrementally; if the
+        rows at or below it no longer match the fingerprint taken at the last
+        sync (an issue was reclassified, re-triaged or deleted in place), the
+        engine is reset and recounts every issue.
+
+        Args:
+            backend: Query backend (or its shared cache wrapper) with version,
+                issues_after and fingerprint
+
+        Returns:
+            Number of issues counted
+        """
+        with self._lock:
+            if self.version == backend.version:
+                return 0
+            if backend.fingerprint(self.high_water, self.columns) != self.fingerprint:
+                self.reset()
+            counted = self.update(backend.issues_after(self.high_water, self.columns), version=backend.version)
+            self.fingerprint = backend.fingerprint(self.high_water, self.columns)
+            return counted
+
+    def update(self, issues, version=None):
+        """
+        Count the issues above the high-water mark and roll the baselines forward
+
+        Args:
+            issues: DataFrame with the columns in self.columns; only issues
+                with issue_number > self.high_water are counted, so passing
+                just those (e.g. backend.issues_after) keeps updates O(new issues)
+            version: Dataset version token to remember (see shared_cache.dataset_version)
+
+        Returns:
+            Number of new issues counted
+        """
+        with self._lock:
+            issues = issues.dropna(subset=['issue_number', 'created_at'])
+            new = issues[issues['issue_number'] > self.high_water].drop_duplicates('issue_number', keep='last')
+            self.version = version
+            if not len(new):
+                return 0
+            self.high_water = int(new['issue_number'].max())
+            self.issues += len(new)
+
+            created = pd.to_datetime(new['created_at'])
+            if created.dt.tz is not None:
+                created = created.dt.tz_convert(None)
+            periods = created.dt.to_period(self.freq)
+
+            for dimension in self.dimensions:
+                if dimension not in new.columns:
+                    continue
+                if dimension == 'labels':
+                    themes = pd.Series(label_sets(new['labels']), index=new.index).explode().dropna()
+                else:
+                    themes = new[dimension].dropna().astype(str)
+                pairs = pd.DataFrame({'period': periods.loc[themes.index].to_numpy(), 'theme': themes.to_numpy()})
+                for (period, theme), count in pairs.groupby(['period', 'theme']).size().items():
+                    counts = self._counts[(dimension, theme)]
+                    counts[period] = counts.get(period, 0) + int(count)
+
+            newest, oldest = periods.max(), periods.min()
+            self.latest = newest if self.latest is None else max(self.latest, newest)
+            self.first = oldest if self.first is None else min(self.first, oldest)
+            self._fold()
+            return len(new)
+
+    def _fold(self):
+        """Fold every closed period not yet in the EWMA state, oldest first"""
+        start = self.first if self.folded is None else self.folded + 1
+        closed = pd.period_range(start, self.latest, freq=self.freq)[:-1]
+        for period in closed:
+            for key, counts in self._counts.items():
+                diff = counts.get(period, 0) - self._mean[key]
+                increment = self.alpha * diff
+                self._mean[key] += increment
+                self._var[key] = (1 - self.alpha) * (self._var[key] + diff * increment)
+            self.folded = period
+
+        # Keep only the sparkline window of raw counts
+        cutoff = self.latest - self.history
+        for counts in self._counts.values():
+            for period in [p for p in counts if p <= cutoff]:
+                del counts[period]
+
+    def emerging(self, top=10, dimension=None, min_count=MIN_COUNT):
+        """
+        Themes with the highest burst score in the newest period
+
+        Args:
+            top: Rows to return
+            dimension: Only this theme column (default: all)
+            min_count: Minimum issues in the newest period
+
+        Returns:
+            DataFrame of dimension, theme, period (start date), count,
+            expected (EWMA mean), z and trend (counts of the last HISTORY
+            periods, oldest first), highest z first
+        """
+        columns = ['dimension', 'theme', 'period', 'count', 'expected', 'z', 'trend']
+        if self.latest is None:
+            return pd.DataFrame(columns=columns)
+
+        window = pd.period_range(self.latest - (self.history - 1), self.latest, freq=self.freq)
+        rows = []
+        with self._lock:
+            for (dim, theme), counts in self._counts.items():
+                count = counts.get(self.latest, 0)
+                if count < min_count or (dimension is not None and dim != dimension):
+                    continue
+                mean = self._mean[(dim, theme)]
+                z = (count - mean) / math.sqrt(max(self._var[(dim, theme)], mean, 1.0))
+                rows.append((dim, theme, self.latest.start_time, count, round(mean, 2), round(z, 2),
+                             [counts.get(p, 0) for p in window]))
+
+        result = pd.DataFrame(rows, columns=columns)
+        return result.sort_values(['z', 'count'], ascending=False, kind='stable').head(top).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    # python trend_engine.py <issues.csv> [top]
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python trend_engine.py <issues.csv> [top]")
+        sys.exit(1)
+
+    engine = TrendEngine()
+    engine.update(read_issues(sys.argv[1]))
+    print(f"✓ {len(engine)} issues, periods {engine.first} .. {engine.latest}")
+    for row in engine.emerging(int(sys.argv[2]) if len(sys.argv) == 3 else 10).itertuples():
+        print(f"  z={row.z:6.2f}  {row.count:4} (expected {row.expected:6.2f})  {row.dimension:12} {row.theme}")
@@ -4,184 +4,432 @@ Checks the enriched CSV for completeness and quality issues
 """
 
 import pandas as pd
+import argparse
+import glob
+import hashlib
+import json
+import os
 import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
-def validate_enriched_data(filename="enriched_issues.csv"):
+from issue_schema import (
+    ENUMS, REQUIRED_COLUMNS, header_row, missing_columns
+)
+
+# Enriched columns (from AI processing); base columns come from the schema
+ENRICHED_COLUMNS = REQUIRED_COLUMNS['enriched']
+
+# Enum columns checked against the shared schema
+VALID_VALUES = {col: ENUMS[col] for col in ['Category', 'Priority', 'Sentiment']}
+
+# Summary length histogram bucket edges (characters)
+SUMMARY_LENGTH_BINS = [0, 20, 50, 100, 200, float('inf')]
+SUMMARY_TOO_SHORT = 20
+SUMMARY_TOO_LONG = 200
+
+LENGTH_LABELS = [f"{int(lo)}-{int(hi) - 1}" if hi != float('inf') else f"{int(lo)}+"
+                 for lo, hi in zip(SUMMARY_LENGTH_BINS[:-1], SUMMARY_LENGTH_BINS[1:])]
+
+CHUNK_SIZE = 50_000
+
+# Sidecar index of per-row results, keyed by row content hash
+CACHE_DIR = '.cache'
+INDEX_VERSION = 1
+MISSING = '<missing>'
+
+
+def index_path(filename, cache_dir=CACHE_DIR):
+    """Return the default sidecar index path for a dataset file"""
+    stem = os.path.basename(filename).rsplit('.', 1)[0].replace(' ', '_')
+    tag = hashlib.sha1(os.path.abspath(filename).encode('utf-8')).hexdigest()[:8]
+    return os.path.join(cache_dir, f"{stem}-{tag}.validation.pkl")
+
+
+def _rules_signature():
+    # Any change to the checks invalidates stored per-row results
+    return (INDEX_VERSION, ENRICHED_COLUMNS, repr(VALID_VALUES),
+            SUMMARY_LENGTH_BINS, SUMMARY_TOO_SHORT, SUMMARY_TOO_LONG)
+
+
+def _load_index(path):
     """
-    Validate the enriched issues CSV for quality and completeness
-    
-    Args:
-        filename: Path to enriched CSV file
+    Load a sidecar index, or return an empty one
+
+    The index holds per-row results keyed by content hash ('facts'), how
+    often each hash occurs in the file ('counts'), the running aggregates
+    ('state') and the byte length + digest of the file it describes.
     """
-    
-    print(f"\n{'='*60}")
-    print(f"DATA QUALITY VALIDATION REPORT")
-    print(f"{'='*60}\n")
-    
-    try:
-        df = pd.read_csv(filename)
-        print(f"✓ File loaded successfully: {filename}")
-        print(f"  Total rows: {len(df)}")
-        print(f"  Total columns: {len(df.columns)}")
-    except FileNotFoundError:
-        print(f"✗ Error: File '{filename}' not found")
+    if path and os.path.exists(path):
+        try:
+            index = pd.read_pickle(path)
+            if index.get('rules') == _rules_signature():
+                return index
+        except Exception:
+            pass  # Unreadable or foreign index: rebuild from scratch
+    return {
+        'facts': pd.DataFrame(index=pd.Index([], dtype='uint64')),
+        'counts': pd.Series(dtype='int64'),
+        'state': _empty_state(),
+        'source': None,
+    }
+
+
+def _save_index(path, index):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    pd.to_pickle({'rules': _rules_signature(), **index}, path)
+
+
+def _hash_bytes(filename, start, end, digest):
+    """Feed bytes [start, end) of a file into digest; return the last byte read"""
+    last = b''
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(remaining, 1 << 20))
+            if not block:
+                break
+            digest.update(block)
+            last = block[-1:]
+            remaining -= len(block)
+    return last
+
+
+def _appended_offset(filename, source):
+    """
+    Check whether the file only grew since the index was written
+
+    Returns:
+        Tuple of (byte offset where new rows start, sha256 of the bytes
+        before it), or (None, None) if the whole file has to be re-read
+    """
+    if not source or os.path.getsize(filename) < source['bytes']:
+        return None, None
+    digest = hashlib.sha256()
+    last = _hash_bytes(filename, 0, source['bytes'], digest)
+    if digest.hexdigest() != source['digest'] or last not in (b'', b'\n'):
+        return None, None
+    return source['bytes'], digest
+
+
+def _empty_state():
+    return {
+        'nulls': Counter(),
+        'enums': {col: Counter() for col in VALID_VALUES},
+        'length_total': 0,
+        'length_rows': 0,
+        'too_short': 0,
+        'too_long': 0,
+        'length_hist': Counter(),
+        'issue_numbers': Counter(),
+    }
+
+
+def _row_facts(rows):
+    """
+    Validate rows and return their per-row results
+
+    Everything the report needs from a row is derived here, so a row whose
+    content hash was seen before never has to be checked again.
+    """
+    facts = pd.DataFrame({'issue_number': rows['issue_number']}, index=rows.index)
+    for col in ENRICHED_COLUMNS:
+        facts[f'null_{col}'] = rows[col].isnull()
+    for col in VALID_VALUES:
+        facts[col] = rows[col].astype(str).where(rows[col].notna(), MISSING)
+    facts['summary_length'] = rows['Summary'].astype(str).str.len()
+    return facts
+
+
+def _accumulate(state, facts, weights):
+    """
+    Add weighted per-row results into the running aggregates
+
+    weights holds how many times each row occurs; negative weights remove
+    rows that disappeared since the last run.
+    """
+    if facts.empty:
         return
-    except Exception as e:
-        print(f"✗ Error loading file: {str(e)}")
+    for col in ENRICHED_COLUMNS:
+        state['nulls'][col] += int(weights[facts[f'null_{col}']].sum())
+    for col in VALID_VALUES:
+        state['enums'][col].update(weights.groupby(facts[col]).sum().to_dict())
+
+    lengths = facts['summary_length']
+    measured = lengths.notna()
+    state['length_total'] += int((lengths[measured] * weights[measured]).sum())
+    state['length_rows'] += int(weights[measured].sum())
+    state['too_short'] += int(weights[lengths < SUMMARY_TOO_SHORT].sum())
+    state['too_long'] += int(weights[lengths > SUMMARY_TOO_LONG].sum())
+    binned = pd.cut(lengths, SUMMARY_LENGTH_BINS, right=False, labels=LENGTH_LABELS)
+    state['length_hist'].update(weights.groupby(binned, observed=True).sum().to_dict())
+
+    state['issue_numbers'].update(weights.groupby(facts['issue_number']).sum().to_dict())
+
+
+def _read_rows(filename, header, columns, offset, chunksize):
+    """Yield chunks of the validated columns, starting at a byte offset if given"""
+    usecols = ['issue_number'] + ENRICHED_COLUMNS
+    dtype = {col: 'category' for col in VALID_VALUES}
+    if offset is None:
+        yield from pd.read_csv(filename, header=header, chunksize=chunksize, usecols=usecols, dtype=dtype)
+        return
+    if offset == os.path.getsize(filename):
         return
-    
+    with open(filename, 'rb') as f:
+        f.seek(offset)
+        yield from pd.read_csv(f, header=None, names=columns, chunksize=chunksize,
+                               usecols=usecols, dtype=dtype)
+
+
+def scan_enriched_data(filename, chunksize=CHUNK_SIZE, index_file=None, rebuild=False):
+    """
+    Compute every validation check in a single streaming pass
+
+    The file is read in chunks and each row is reduced to a 64-bit content
+    hash. Only rows whose hash is not in the sidecar index (new or edited
+    rows) are validated; the running aggregates, including the per-issue
+    counts behind the duplicate check, are then adjusted by the rows that
+    appeared or disappeared since the last run. If the file only had rows
+    appended (its old bytes are unchanged), just the new tail is parsed.
+
+    Args:
+        filename: Path to enriched CSV file
+        chunksize: Rows per chunk
+        index_file: Sidecar index of per-row results to reuse and update
+            (None validates every row and keeps nothing)
+        rebuild: Ignore the existing index and re-validate every row
+
+    Returns:
+        Machine-readable report dict (see validate_enriched_data)
+    """
+    started = time.perf_counter()
+    header = header_row(filename)
+    columns = pd.read_csv(filename, header=header, nrows=0).columns.tolist()
+
+    report = {
+        'file': filename,
+        'rows': None,
+        'columns': len(columns),
+        'schema': {
+            'missing_base': missing_columns(columns, 'raw'),
+            'missing_enriched': missing_columns(columns, 'enriched'),
+        },
+    }
+    if report['schema']['missing_enriched'] or report['schema']['missing_base']:
+        report['issues'] = [label for label, missing in [
+            ("Missing base columns", report['schema']['missing_base']),
+            ("Missing enriched columns", report['schema']['missing_enriched']),
+        ] if missing]
+        report['status'] = 'needs_attention'
+        report['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+        return report
+
+    index = _load_index(None if rebuild else index_file)
+    old_facts, old_counts, state = index['facts'], index['counts'], index['state']
+    known = old_facts.index
+    new_facts = []
+    counts = Counter()
+
+    # Append-only change: the rows already indexed are byte-identical, so
+    # only the tail is parsed and the old counts carry over unchanged
+    offset, digest = _appended_offset(filename, index['source'])
+    if offset is not None:
+        counts.update(old_counts.to_dict())
+
+    for chunk in _read_rows(filename, header, columns, offset, chunksize):
+        hashes = pd.util.hash_pandas_object(chunk.astype(object), index=False)
+        counts.update(hashes.value_counts().to_dict())
+
+        # Validate only rows whose content hasn't been seen before
+        unseen = ~hashes.isin(known) & ~hashes.duplicated()
+        if unseen.any():
+            facts = _row_facts(chunk[unseen.to_numpy()])
+            facts.index = pd.Index(hashes[unseen].to_numpy(), dtype='uint64')
+            new_facts.append(facts)
+            known = known.append(facts.index)
+
+    all_facts = pd.concat([old_facts] + new_facts) if new_facts else old_facts
+    counts = pd.Series(counts, dtype='int64').reindex(all_facts.index, fill_value=0)
+    delta = counts.sub(old_counts.reindex(all_facts.index, fill_value=0))
+    delta = delta[delta != 0]
+    _accumulate(state, all_facts.loc[delta.index], delta)
+
+    validated = int(sum(counts.reindex(f.index).sum() for f in new_facts))
+    report['rows'] = int(counts.sum())
+    if index_file:
+        live = counts > 0
+        size = os.path.getsize(filename)
+        if digest is None:
+            digest, offset = hashlib.sha256(), 0
+        _hash_bytes(filename, offset, size, digest)
+        _save_index(index_file, {
+            'facts': all_facts[live],
+            'counts': counts[live],
+            'state': state,
+            'source': {'bytes': size, 'digest': digest.hexdigest()},
+        })
+        report['incremental'] = {
+            'index': index_file,
+            'validated_rows': validated,
+            'reused_rows': report['rows'] - validated,
+        }
+
+    report['completeness'] = {col: int(state['nulls'][col]) for col in ENRICHED_COLUMNS}
+    report['enums'] = {}
+    for col, counter in state['enums'].items():
+        counts_by_value = {str(k): int(v) for k, v in counter.items() if v}
+        report['enums'][col] = {
+            'valid': VALID_VALUES[col],
+            'counts': counts_by_value,
+            'invalid': sorted(k for k in counts_by_value if k not in VALID_VALUES[col] and k != MISSING),
+        }
+    report['summary_length'] = {
+        'mean': state['length_total'] / state['length_rows'] if state['length_rows'] else 0.0,
+        'too_short': state['too_short'],
+        'too_long': state['too_long'],
+        'histogram': {label: int(state['length_hist'][label]) for label in LENGTH_LABELS},
+    }
+    duplicate_counts = {n: c for n, c in state['issue_numbers'].items() if c > 1}
+    report['duplicates'] = {
+        'rows': int(sum(duplicate_counts.values())),
+        'issue_numbers': sorted(int(n) for n in duplicate_counts),
+    }
+
+    issues = []
+    if report['schema']['missing_enriched']:
+        issues.append("Missing enriched columns")
+    for col, label in [('Category', 'category'), ('Priority', 'priority'), ('Sentiment', 'sentiment')]:
+        if report['enums'][col]['invalid']:
+            issues.append(f"Invalid {label} values")
+    if duplicate_counts:
+        issues.append("Duplicate issue numbers")
+    report['issues'] = issues
+    report['status'] = 'excellent' if not issues else 'needs_attention'
+    report['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def print_report(report):
+    """Print a validation report in the console format"""
+    rows = report['rows']
+
+    def pct(count):
+        return (count / rows) * 100 if rows else 0.0
+
     print(f"\n{'='*60}")
     print("SCHEMA VALIDATION")
     print(f"{'='*60}\n")
-    
-    # Check for required base columns
-    base_columns = [
-        'issue_number', 'title', 'body_preview', 'html_url',
-        'created_at', 'comments_count'
-    ]
-    
-    enriched_columns = ['Category', 'Priority', 'Summary', 'Sentiment']
-    
-    missing_base = [col for col in base_columns if col not in df.columns]
-    missing_enriched = [col for col in enriched_columns if col not in df.columns]
-    
+
+    missing_base = report['schema']['missing_base']
+    missing_enriched = report['schema']['missing_enriched']
+
     if missing_base:
         print(f"⚠ Missing base columns: {', '.join(missing_base)}")
     else:
         print("✓ All base columns present")
-    
+
     if missing_enriched:
         print(f"✗ Missing enriched columns: {', '.join(missing_enriched)}")
         print("  → Did you complete AI processing with the Golden Prompt?")
     else:
         print("✓ All enriched columns present")
-    
+
     if missing_base or missing_enriched:
         print("\n⚠ Validation cannot continue with missing columns")
         return
-    
+
     # Data completeness check
     print(f"\n{'='*60}")
     print("COMPLETENESS CHECK")
     print(f"{'='*60}\n")
-    
-    for col in enriched_columns:
-        null_count = df[col].isnull().sum()
-        null_pct = (null_count / len(df)) * 100
-        
+
+    for col, null_count in report['completeness'].items():
         if null_count == 0:
             print(f"✓ {col}: No missing values")
         else:
-            print(f"⚠ {col}: {null_count} missing ({null_pct:.1f}%)")
-    
+            print(f"⚠ {col}: {null_count} missing ({pct(null_count):.1f}%)")
+
     # Category validation
     print(f"\n{'='*60}")
     print("CATEGORY VALIDATION")
     print(f"{'='*60}\n")
-    
-    valid_categories = [
-        'Bug', 'Feature Request', 'Documentation', 
-        'UX/UI', 'Performance', 'Installation/Setup', 'Integration'
-    ]
-    
-    actual_categories = df['Category'].unique()
-    invalid_categories = [cat for cat in actual_categories if cat not in valid_categories]
-    
-    print(f"Found {len(actual_categories)} unique categories:")
-    for cat in sorted(actual_categories):
-        count = len(df[df['Category'] == cat])
-        pct = (count / len(df)) * 100
-        marker = "✓" if cat in valid_categories else "⚠"
-        print(f"  {marker} {cat}: {count} issues ({pct:.1f}%)")
-    
-    if invalid_categories:
-        print(f"\n⚠ Invalid categories found: {', '.join(invalid_categories)}")
-        print("  → Expected categories: " + ', '.join(valid_categories))
-    
+
+    categories = report['enums']['Category']
+    print(f"Found {len(categories['counts'])} unique categories:")
+    for cat in sorted(categories['counts']):
+        count = categories['counts'][cat]
+        marker = "✓" if cat in categories['valid'] else "⚠"
+        print(f"  {marker} {cat}: {count} issues ({pct(count):.1f}%)")
+
+    if categories['invalid']:
+        print(f"\n⚠ Invalid categories found: {', '.join(categories['invalid'])}")
+        print("  → Expected categories: " + ', '.join(categories['valid']))
+
     # Priority validation
     print(f"\n{'='*60}")
     print("PRIORITY VALIDATION")
     print(f"{'='*60}\n")
-    
-    valid_priorities = ['High', 'Medium', 'Low']
-    actual_priorities = df['Priority'].unique()
-    invalid_priorities = [pri for pri in actual_priorities if pri not in valid_priorities]
-    
-    for priority in valid_priorities:
-        count = len(df[df['Priority'] == priority])
-        pct = (count / len(df)) * 100
-        print(f"  ✓ {priority}: {count} issues ({pct:.1f}%)")
-    
-    if invalid_priorities:
-        print(f"\n⚠ Invalid priorities found: {', '.join(invalid_priorities)}")
-    
+
+    priorities = report['enums']['Priority']
+    for priority in priorities['valid']:
+        count = priorities['counts'].get(priority, 0)
+        print(f"  ✓ {priority}: {count} issues ({pct(count):.1f}%)")
+
+    if priorities['invalid']:
+        print(f"\n⚠ Invalid priorities found: {', '.join(priorities['invalid'])}")
+
     # Sentiment validation
     print(f"\n{'='*60}")
     print("SENTIMENT VALIDATION")
     print(f"{'='*60}\n")
-    
-    valid_sentiments = ['Positive', 'Neutral', 'Frustrated']
-    actual_sentiments = df['Sentiment'].unique()
-    invalid_sentiments = [sent for sent in actual_sentiments if sent not in valid_sentiments]
-    
-    for sentiment in valid_sentiments:
-        count = len(df[df['Sentiment'] == sentiment])
-        pct = (count / len(df)) * 100
-        emoji = {'Positive': '😊', 'Neutral': '😐', 'Frustrated': '😤'}[sentiment]
-        print(f"  {emoji} {sentiment}: {count} issues ({pct:.1f}%)")
-    
-    if invalid_sentiments:
-        print(f"\n⚠ Invalid sentiments found: {', '.join(invalid_sentiments)}")
-    
+
+    sentiments = report['enums']['Sentiment']
+    for sentiment in sentiments['valid']:
+        count = sentiments['counts'].get(sentiment, 0)
+        emoji = {'Positive': '😊', 'Neutral': '😐', 'Negative': '😤'}.get(sentiment, '•')
+        print(f"  {emoji} {sentiment}: {count} issues ({pct(count):.1f}%)")
+
+    if sentiments['invalid']:
+        print(f"\n⚠ Invalid sentiments found: {', '.join(sentiments['invalid'])}")
+
     # Summary length check
     print(f"\n{'='*60}")
     print("SUMMARY QUALITY CHECK")
     print(f"{'='*60}\n")
-    
-    df['summary_length'] = df['Summary'].astype(str).str.len()
-    avg_length = df['summary_length'].mean()
-    too_short = len(df[df['summary_length'] < 20])
-    too_long = len(df[df['summary_length'] > 200])
-    
-    print(f"  Average summary length: {avg_length:.0f} characters")
-    if too_short > 0:
-        print(f"  ⚠ {too_short} summaries are very short (<20 chars)")
-    if too_long > 0:
-        print(f"  ⚠ {too_long} summaries are very long (>200 chars)")
-    if too_short == 0 and too_long == 0:
+
+    summary = report['summary_length']
+    print(f"  Average summary length: {summary['mean']:.0f} characters")
+    if summary['too_short'] > 0:
+        print(f"  ⚠ {summary['too_short']} summaries are very short (<{SUMMARY_TOO_SHORT} chars)")
+    if summary['too_long'] > 0:
+        print(f"  ⚠ {summary['too_long']} summaries are very long (>{SUMMARY_TOO_LONG} chars)")
+    if summary['too_short'] == 0 and summary['too_long'] == 0:
         print(f"  ✓ All summaries are reasonable length")
-    
+    print("  Length histogram:")
+    for bucket, count in summary['histogram'].items():
+        print(f"    {bucket:>8} chars: {count}")
+
     # Duplicate check
     print(f"\n{'='*60}")
     print("DUPLICATE CHECK")
     print(f"{'='*60}\n")
-    
-    duplicates = df[df.duplicated(subset=['issue_number'], keep=False)]
-    if len(duplicates) > 0:
-        print(f"⚠ Found {len(duplicates)} duplicate issue numbers")
-        print(f"  Duplicated issues: {duplicates['issue_number'].unique()}")
+
+    duplicates = report['duplicates']
+    if duplicates['rows'] > 0:
+        print(f"⚠ Found {duplicates['rows']} duplicate issue numbers")
+        print(f"  Duplicated issues: {duplicates['issue_numbers']}")
     else:
         print("✓ No duplicate issue numbers found")
-    
+
     # Final summary
     print(f"\n{'='*60}")
     print("VALIDATION SUMMARY")
     print(f"{'='*60}\n")
-    
-    issues = []
-    
-    if missing_enriched:
-        issues.append("Missing enriched columns")
-    if invalid_categories:
-        issues.append("Invalid category values")
-    if invalid_priorities:
-        issues.append("Invalid priority values")
-    if invalid_sentiments:
-        issues.append("Invalid sentiment values")
-    if len(duplicates) > 0:
-        issues.append("Duplicate issue numbers")
-    
-    if not issues:
+
+    if not report['issues']:
         print("✅ DATA QUALITY: EXCELLENT")
         print("\nYour enriched dataset is ready for:")
         print("  • Submitting as the Categorized Issue Tracker deliverable")
@@ -190,15 +438,212 @@ def validate_enriched_data(filename="enriched_issues.csv"):
     else:
         print("⚠️ DATA QUALITY: NEEDS ATTENTION")
         print("\nIssues found:")
-        for issue in issues:
+        for issue in report['issues']:
             print(f"  • {issue}")
         print("\nRecommendation: Fix these issues before proceeding")
-    
+
+    print(f"\n  Validated in {report['elapsed_seconds']:.2f}s")
+    print(f"\n{'='*60}\n")
+
+
+def validate_enriched_data(filename="enriched_issues.csv", report_file=None, chunksize=CHUNK_SIZE,
+                           rebuild=False):
+    """
+    Validate the enriched issues CSV for quality and completeness
+
+    Args:
+        filename: Path to enriched CSV file
+        report_file: Optional path to write the JSON report to
+        chunksize: Rows per streamed chunk
+        rebuild: Re-validate every row instead of reusing the sidecar index
+
+    Returns:
+        Report dict with schema, completeness, enums, summary_length,
+        duplicates, issues and status (None if the file can't be read)
+    """
+
+    print(f"\n{'='*60}")
+    print(f"DATA QUALITY VALIDATION REPORT")
+    print(f"{'='*60}\n")
+
+    try:
+        report = scan_enriched_data(filename, chunksize=chunksize,
+                                    index_file=index_path(filename), rebuild=rebuild)
+        print(f"✓ File loaded successfully: {filename}")
+        if report['rows'] is None:
+            print("  Total rows: not scanned (schema check failed)")
+        else:
+            print(f"  Total rows: {report['rows']}")
+            incremental = report['incremental']
+            print(f"  Validated rows: {incremental['validated_rows']} new/changed, "
+                  f"{incremental['reused_rows']} reused from {incremental['index']}")
+        print(f"  Total columns: {report['columns']}")
+    except FileNotFoundError:
+        print(f"✗ Error: File '{filename}' not found")
+        return
+    except Exception as e:
+        print(f"✗ Error loading file: {str(e)}")
+        return
+
+    print_report(report)
+
+    if report_file:
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ JSON report saved to: {report_file}")
+
+    return report
+
+def expand_inputs(patterns):
+    """
+    Expand file paths, directories (all *.csv inside) and glob patterns
+
+    Args:
+        patterns: List of paths/globs from the command line
+
+    Returns:
+        Sorted, de-duplicated list of file paths
+    """
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.update(glob.glob(os.path.join(pattern, '*.csv')))
+        elif glob.has_magic(pattern):
+            paths.update(glob.glob(pattern))
+        else:
+            paths.add(pattern)
+    return sorted(paths)
+
+
+def _scan_file(filename, chunksize, rebuild=False):
+    """Process-pool worker: never raises, so one bad file can't sink the batch"""
+    started = time.perf_counter()
+    try:
+        return scan_enriched_data(filename, chunksize=chunksize,
+                                  index_file=index_path(filename), rebuild=rebuild)
+    except Exception as e:
+        return {
+            'file': filename,
+            'status': 'error',
+            'error': f"{type(e).__name__}: {e}",
+            'issues': ["Could not read file"],
+            'elapsed_seconds': round(time.perf_counter() - started, 3),
+        }
+
+
+def validate_batch(filenames, workers=None, chunksize=CHUNK_SIZE, rebuild=False):
+    """
+    Validate many files in a process pool and aggregate the reports
+
+    Args:
+        filenames: Files to validate
+        workers: Pool size (default: one per CPU, capped at the file count)
+        chunksize: Rows per streamed chunk
+        rebuild: Re-validate every row instead of reusing sidecar indexes
+
+    Returns:
+        Aggregate dict with per-file reports, totals and wall time
+    """
+    started = time.perf_counter()
+    workers = min(workers or os.cpu_count() or 1, len(filenames)) or 1
+
+    if workers == 1:
+        reports = [_scan_file(f, chunksize, rebuild) for f in filenames]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            reports = list(pool.map(_scan_file, filenames, [chunksize] * len(filenames),
+                                    [rebuild] * len(filenames)))
+
+    return {
+        'files': reports,
+        'totals': {
+            'files': len(reports),
+            'rows': sum(r.get('rows') or 0 for r in reports),
+            'excellent': sum(1 for r in reports if r['status'] == 'excellent'),
+            'needs_attention': sum(1 for r in reports if r['status'] == 'needs_attention'),
+            'errors': sum(1 for r in reports if r['status'] == 'error'),
+        },
+        'workers': workers,
+        'elapsed_seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def batch_markdown(aggregate):
+    """Render a batch aggregate as a Markdown report"""
+    totals = aggregate['totals']
+    lines = [
+        "# Data Quality Validation — Batch Report",
+        "",
+        f"- **Files**: {totals['files']} ({totals['excellent']} excellent, "
+        f"{totals['needs_attention']} need attention, {totals['errors']} errors)",
+        f"- **Rows**: {totals['rows']}",
+        f"- **Wall time**: {aggregate['elapsed_seconds']:.2f}s on {aggregate['workers']} workers",
+        "",
+        "| File | Rows | Status | Time (s) | Issues |",
+        "|------|-----:|--------|---------:|--------|",
+    ]
+    for report in aggregate['files']:
+        issues = report.get('error') or ', '.join(report.get('issues', [])) or '—'
+        rows = report.get('rows')
+        lines.append(
+            f"| {report['file']} | {rows if rows is not None else '—'} | {report['status']} "
+            f"| {report['elapsed_seconds']:.2f} | {issues} |"
+        )
+    return '\n'.join(lines) + '\n'
+
+
+def print_batch_summary(aggregate):
+    """Print a one-line-per-file console summary of a batch"""
+    print(f"\n{'='*60}")
+    print("BATCH VALIDATION SUMMARY")
+    print(f"{'='*60}\n")
+
+    markers = {'excellent': '✓', 'needs_attention': '⚠', 'error': '✗'}
+    for report in aggregate['files']:
+        rows = report.get('rows')
+        rows_text = f"{rows:>8} rows" if rows is not None else f"{'—':>8} rows"
+        issues = report.get('error') or ', '.join(report.get('issues', []))
+        print(f"  {markers[report['status']]} {report['file']}: {rows_text}, "
+              f"{report['elapsed_seconds']:.2f}s{'  → ' + issues if issues else ''}")
+
+    totals = aggregate['totals']
+    print(f"\n  Files: {totals['files']}  |  Excellent: {totals['excellent']}  |  "
+          f"Needs attention: {totals['needs_attention']}  |  Errors: {totals['errors']}")
+    print(f"  Rows: {totals['rows']}  |  Wall time: {aggregate['elapsed_seconds']:.2f}s "
+          f"on {aggregate['workers']} workers")
     print(f"\n{'='*60}\n")
 
+
 if __name__ == "__main__":
-    filename = "enriched_issues.csv"
-    if len(sys.argv) > 1:
-        filename = sys.argv[1]
-    
-    validate_enriched_data(filename)
+    parser = argparse.ArgumentParser(description='Validate enriched issues CSVs')
+    parser.add_argument('inputs', nargs='*', default=['enriched_issues.csv'],
+                        help='CSV file(s), directories or glob patterns (several files = batch mode)')
+    parser.add_argument('--json', dest='report_file', help='Also write a machine-readable JSON report')
+    parser.add_argument('--markdown', dest='markdown_file', help='Batch mode: also write a Markdown report')
+    parser.add_argument('--workers', type=int, help='Batch mode: worker processes (default: CPU count)')
+    parser.add_argument('--chunksize', type=int, default=CHUNK_SIZE, help='Rows per streamed chunk')
+    parser.add_argument('--full', action='store_true',
+                        help=f'Re-validate every row instead of reusing the sidecar index in {CACHE_DIR}/')
+    args = parser.parse_args()
+
+    filenames = expand_inputs(args.inputs)
+    single = len(filenames) == 1 and not os.path.isdir(args.inputs[0]) and not glob.has_magic(args.inputs[0])
+
+    if single:
+        validate_enriched_data(filenames[0], report_file=args.report_file, chunksize=args.chunksize,
+                               rebuild=args.full)
+    elif not filenames:
+        print(f"✗ Error: no files match {', '.join(args.inputs)}")
+        sys.exit(1)
+    else:
+        aggregate = validate_batch(filenames, workers=args.workers, chunksize=args.chunksize,
+                                   rebuild=args.full)
+        print_batch_summary(aggregate)
+        if args.report_file:
+            with open(args.report_file, 'w') as f:
+                json.dump(aggregate, f, indent=2)
+            print(f"✓ JSON report saved to: {args.report_file}")
+        if args.markdown_file:
+            with open(args.markdown_file, 'w') as f:
+                f.write(batch_markdown(aggregate))
+            print(f"✓ Markdown report saved to: {args.markdown_file}")